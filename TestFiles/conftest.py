@@ -1,11 +1,53 @@
 import pytest
 import os
+import signal
+import threading
+import time
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from pages.base_page import WAIT_STATS, fail_fast, is_required_timeout, set_wait_deadline
+from pages.qa_jobs_page import QAJobsPage
+from utils.artifacts import ARTIFACTS
+from utils.blocking import (PROFILES, BlockingProfile, ResourceSizes, drain_performance_log,
+                            enable_performance_log, network_stats)
+from utils.checkpoint import CheckpointStore
+from utils.driver_cache import resolve_chromedriver
+from utils.impact import IMPACT
+from utils.locators import LOCATORS
+from utils.replay import ArchiveRecorder, ReplayArchive, ReplayProxy, archive_parts, pod_address
+from utils.results import ResultsRecorder
+from utils.session_pool import SessionPool
+from utils.sharding import duration_estimates, get_shard, shard_endpoints, split_shard
+from utils.timeouts import HISTORY_FILE, TIMEOUTS
+from utils.tracing import TRACER
+
+# Resource blocking of this process (set in pytest_configure) and per-test network stats
+BLOCKING = BlockingProfile("off")
+RESOURCE_SIZES = None
+NETWORK_STATS = {}
+# Whether browsers keep the performance log: only for blocking stats, --network-stats or recording
+PERFORMANCE_LOG = False
+NETWORK_PROPERTIES = ("requests", "bytes", "blocked_requests", "bytes_saved")
+
+# Setup + call + teardown duration of tests run in this process, None once a phase failed or skipped
+TEST_DURATIONS = {}
+# Hard wall-clock limit of a test, on top of its wait deadline
+DEADLINE_GRACE = 30
+
+# Duration-based xdist scheduler of the controller process, and the summed duration of all test phases
+SCHEDULER = None
+TEST_TIME = 0.0
+
+# Record/replay of browser traffic: ArchiveRecorder (--record-archive) or ReplayProxy (--replay-archive)
+ARCHIVE = None
+# --replay-archive directory; loaded only by the process that starts a browser (not the xdist controller)
+REPLAY_DIRECTORY = None
+REPLAY_LOCK = threading.Lock()  # the session pool may start browsers from several threads
+ARCHIVE_SUMMARIES = []
 
 
 def find_chromedriver_executable(base_path):
@@ -39,13 +81,282 @@ def find_chromedriver_executable(base_path):
     return None
 
 
-@pytest.fixture(scope="function")
-def driver():
-    """Setup Chrome WebDriver - supports both local and remote (Kubernetes) execution"""
+def get_chrome_node_endpoints():
+    """Return the Chrome Node endpoints published by deploy.py that this shard may use"""
+    endpoints = os.getenv('CHROME_NODE_ENDPOINTS', '')
+    endpoints = [endpoint.strip() for endpoint in endpoints.split(',') if endpoint.strip()]
+    return shard_endpoints(endpoints, *get_shard())
+
+
+def get_chrome_node_url(worker_id=None):
+    """Return the Selenium endpoint this process (or xdist worker `worker_id`) uses, or None for local runs
+
+    With pytest-xdist every worker (gw0, gw1, ...) is pinned to its own Chrome Node
+    so that parallel workers never queue on the same browser.
+    """
+    endpoints = get_chrome_node_endpoints()
+    if worker_id is None:
+        worker_id = os.getenv('PYTEST_XDIST_WORKER', '')
+    if endpoints and worker_id.startswith('gw'):
+        return endpoints[int(worker_id[2:]) % len(endpoints)]
+    return os.getenv('CHROME_NODE_SERVICE') or (endpoints[0] if endpoints else None)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """Plan `--dist load` runs by historical test durations (see utils/scheduling.py)"""
+    global SCHEDULER
+    if config.getoption("dist") != "load" or config.getoption("--xdist-scheduling"):
+        return None
+    from utils.scheduling import DurationScheduling
+    SCHEDULER = DurationScheduling(config, log, history=TIMEOUTS.samples.get("tests", {}))
+    return SCHEDULER
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    """`-n auto` starts one worker per ready Chrome Node"""
+    endpoints = get_chrome_node_endpoints()
+    if endpoints:
+        return len(endpoints)
+    if os.getenv('CHROME_NODE_SERVICE'):
+        return 1
+    return None
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("webdriver session pool")
+    group.addoption(
+        "--fresh-sessions",
+        action="store_true",
+        default=os.getenv('FRESH_SESSIONS', '') == '1',
+        help="Start a new browser for every test instead of using the session pool "
+             "(isolation debugging, env: FRESH_SESSIONS=1)",
+    )
+    group.addoption(
+        "--pool-size",
+        type=int,
+        default=int(os.getenv('DRIVER_POOL_SIZE', '1')),
+        help="Warm WebDriver sessions kept per worker (env: DRIVER_POOL_SIZE, default: 1)",
+    )
+    group.addoption(
+        "--session-max-uses",
+        type=int,
+        default=int(os.getenv('DRIVER_MAX_USES', '20')),
+        help="Recycle a pooled session after this many tests (env: DRIVER_MAX_USES, default: 20)",
+    )
+
+    group = parser.getgroup("scheduling")
+    group.addoption(
+        "--xdist-scheduling",
+        action="store_true",
+        default=os.getenv('XDIST_SCHEDULING', '') == '1',
+        help="Use xdist's own load scheduling instead of planning workers by the test duration "
+             "history (env: XDIST_SCHEDULING=1)",
+    )
+
+    group = parser.getgroup("waits")
+    group.addoption(
+        "--wait-budget",
+        type=float,
+        default=float(os.getenv('WAIT_BUDGET', '120')),
+        help="Global deadline in seconds for all page-object waits of one test, used until the test "
+             "has timeout history (env: WAIT_BUDGET, default: 120)",
+    )
+    group.addoption(
+        "--timeout-history",
+        default=os.getenv('TIMEOUT_HISTORY', HISTORY_FILE),
+        help="Durations of successful waits and passed tests that timeouts are derived from "
+             f"(env: TIMEOUT_HISTORY, default: {HISTORY_FILE})",
+    )
+    group.addoption(
+        "--timeout-factor",
+        type=float,
+        default=float(os.getenv('TIMEOUT_FACTOR', '3')),
+        help="Safety factor applied to the p99 of the history (env: TIMEOUT_FACTOR, default: 3)",
+    )
+    group.addoption(
+        "--fixed-timeouts",
+        action="store_true",
+        default=os.getenv('FIXED_TIMEOUTS', '') == '1',
+        help="Use the hardcoded timeouts and --wait-budget, ignore the history (env: FIXED_TIMEOUTS=1)",
+    )
+
+    group = parser.getgroup("resource blocking")
+    group.addoption(
+        "--blocking-profile",
+        choices=sorted(PROFILES),
+        default=os.getenv('BLOCKING_PROFILE', 'default'),
+        help="Requests the browser drops: 'default' (images, fonts, media, third-party hosts), "
+             "'third-party' or 'off' (env: BLOCKING_PROFILE, default: default)",
+    )
+    group.addoption(
+        "--block-hosts",
+        default=os.getenv('BLOCK_HOSTS', ''),
+        help="Extra comma-separated hosts to block (env: BLOCK_HOSTS)",
+    )
+    group.addoption(
+        "--network-stats",
+        action="store_true",
+        default=os.getenv('NETWORK_STATS', '') == '1',
+        help="Record requests and bytes loaded per test from Chrome's performance log; always on "
+             "while a blocking profile is active (env: NETWORK_STATS=1)",
+    )
+
+    group = parser.getgroup("record / replay")
+    group.addoption(
+        "--record-archive",
+        default=os.getenv('RECORD_ARCHIVE'),
+        help="Record every response the browser receives into this directory (env: RECORD_ARCHIVE)",
+    )
+    group.addoption(
+        "--replay-archive",
+        default=os.getenv('REPLAY_ARCHIVE'),
+        help="Serve the browser from a recorded archive directory through a local proxy, "
+             "no live site needed (env: REPLAY_ARCHIVE)",
+    )
+
+    group = parser.getgroup("tracing")
+    group.addoption(
+        "--trace-actions",
+        action="store_true",
+        default=os.getenv('TRACE', '') == '1',
+        help="Time every page object action and print the slowest ones at the end (env: TRACE=1)",
+    )
+    group.addoption(
+        "--trace-file",
+        default=os.getenv('TRACE_FILE'),
+        help="Write the action spans as a Chrome trace (chrome://tracing, ui.perfetto.dev); "
+             "implies --trace-actions (env: TRACE_FILE)",
+    )
+    group.addoption(
+        "--trace-top",
+        type=int,
+        default=int(os.getenv('TRACE_TOP', '15')),
+        help="Rows in the slowest actions summary (env: TRACE_TOP, default: 15)",
+    )
+
+    group = parser.getgroup("results")
+    group.addoption(
+        "--record-impact",
+        action="store_true",
+        default=os.getenv('RECORD_IMPACT', '') == '1',
+        help="Record the page object classes/modules each test uses, for impact selection (env: RECORD_IMPACT=1)",
+    )
+    group.addoption(
+        "--results-stream",
+        action="store_true",
+        default=os.getenv('RESULTS_STREAM', '') == '1',
+        help="Print a JSON result record to stdout as each test finishes (env: RESULTS_STREAM=1)",
+    )
+    group.addoption(
+        "--results-file",
+        default=os.getenv('RESULTS_FILE'),
+        help="Append JSON Lines result records to this file (env: RESULTS_FILE)",
+    )
+    group.addoption(
+        "--failure-artifacts",
+        default=os.getenv('FAILURE_ARTIFACTS'),
+        help="Save a screenshot, the page source and the browser console of every failed test "
+             "into this directory (env: FAILURE_ARTIFACTS)",
+    )
+
+
+def pytest_configure(config):
+    global BLOCKING, RESOURCE_SIZES, PERFORMANCE_LOG
+    config.addinivalue_line("markers", "full_render: load every resource (no request blocking) for this test")
+    hosts = [host.strip() for host in config.getoption("--block-hosts").split(",") if host.strip()]
+    BLOCKING = BlockingProfile(config.getoption("--blocking-profile"), extra_hosts=hosts)
+    RESOURCE_SIZES = ResourceSizes()
+    TIMEOUTS.configure(config.getoption("--timeout-history"), config.getoption("--timeout-factor"),
+                       enabled=not config.getoption("--fixed-timeouts"))
+    configure_archive(config)
+    PERFORMANCE_LOG = (BLOCKING.enabled or config.getoption("--network-stats")
+                       or isinstance(ARCHIVE, ArchiveRecorder))
+    if config.getoption("--trace-actions") or config.getoption("--trace-file"):
+        TRACER.start(os.getenv('PYTEST_XDIST_WORKER', 'main'))
+    IMPACT.enabled = config.getoption("--record-impact")
+    ARTIFACTS.directory = config.getoption("--failure-artifacts")
+
+    # Results are recorded once, in the controller process (not in xdist workers)
+    if hasattr(config, "workerinput"):
+        return
+    stream = config.getoption("--results-stream")
+    path = config.getoption("--results-file")
+    if stream or path:
+        session_records = (
+            lambda: TIMEOUTS.has_new() and {"event": "timeout_samples", "samples": TIMEOUTS.new},
+            lambda: IMPACT.tests and {"event": "impact_map", "tests": IMPACT.export()},
+            ARTIFACTS.record,
+        )
+        config.pluginmanager.register(ResultsRecorder(config, stream=stream, path=path,
+                                                      session_records=session_records),
+                                      "testops-results")
+
+
+def configure_archive(config):
+    """Set up recording or replay of browser traffic for this process"""
+    global ARCHIVE, REPLAY_DIRECTORY
+    record, replay = config.getoption("--record-archive"), config.getoption("--replay-archive")
+    if record and replay:
+        raise pytest.UsageError("--record-archive and --replay-archive cannot be used together")
+    if record:
+        # One part file per process, a replay loads every part of the directory
+        ARCHIVE = ArchiveRecorder(record, os.getenv('PYTEST_XDIST_WORKER', 'main'))
+    elif replay:
+        # Fail early on a wrong directory; the archive is loaded and the proxy started
+        # with the first browser session of the process (see create_driver)
+        try:
+            archive_parts(replay)
+        except FileNotFoundError as e:
+            raise pytest.UsageError(str(e))
+        REPLAY_DIRECTORY = replay
+
+
+def replay_proxy():
+    """Proxy serving the replay archive, loaded and started once per process"""
+    global ARCHIVE
+    with REPLAY_LOCK:
+        if ARCHIVE is None:
+            # A remote Chrome Node reaches the proxy through this pod's address
+            host = pod_address() if get_chrome_node_url() else "127.0.0.1"
+            ARCHIVE = ReplayProxy(ReplayArchive(REPLAY_DIRECTORY), advertise_host=host)
+            print(f"[REPLAY] Serving recorded responses through proxy {ARCHIVE.address}")
+    return ARCHIVE
+
+
+def pytest_collection_modifyitems(config, items):
+    """Keep only the requested tests (TEST_IDS, set by deploy.py) and this shard's tests
+
+    TEST_IDS holds node ids (reruns) or test file paths (impact selection), one per line.
+    """
+    test_ids = {test_id for test_id in os.getenv('TEST_IDS', '').splitlines() if test_id.strip()}
+    if test_ids:
+        requested = [item for item in items
+                     if item.nodeid in test_ids or item.nodeid.split("::")[0] in test_ids]
+        if len(requested) < len(items):
+            config.hook.pytest_deselected(items=[item for item in items if item not in requested])
+            items[:] = requested
+
+    index, count = get_shard()
+    if count <= 1:
+        return
+    estimates = duration_estimates([item.nodeid for item in items], TIMEOUTS.samples.get("tests", {}))
+    selected, deselected = split_shard(items, index, count, estimates)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+def create_driver(full_render=False):
+    """Start a Chrome WebDriver - supports both local and remote (Kubernetes) execution
+
+    full_render=True leaves out the session-wide blocking content settings.
+    """
     chrome_options = Options()
 
     # Kubernetes ortamında mı çalışıyoruz?
-    chrome_node_service = os.getenv('CHROME_NODE_SERVICE')
+    chrome_node_service = get_chrome_node_url()
 
     # Headless mod için gerekli ayarlar
     if chrome_node_service:
@@ -65,6 +376,12 @@ def driver():
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option('useAutomationExtension', False)
+    if PERFORMANCE_LOG:
+        enable_performance_log(chrome_options)
+    BLOCKING.configure_options(chrome_options, content_settings=not full_render)
+    ARTIFACTS.configure_options(chrome_options)
+    if REPLAY_DIRECTORY:
+        replay_proxy().configure_options(chrome_options)
 
     if chrome_node_service:
         # Kubernetes ortamında - Remote WebDriver kullan
@@ -76,11 +393,10 @@ def driver():
     else:
         # Lokal ortamda - Local WebDriver kullan
         print("Running tests locally with ChromeDriver")
-        # Get ChromeDriver path from webdriver-manager
-        driver_path = ChromeDriverManager().install()
-
-        # Find the actual executable
-        chromedriver_executable = find_chromedriver_executable(driver_path)
+        # ChromeDriver path: cached per Chrome version, webdriver-manager only on a cache miss
+        chromedriver_executable = resolve_chromedriver(
+            lambda: find_chromedriver_executable(ChromeDriverManager().install())
+        )
 
         if chromedriver_executable:
             service = Service(chromedriver_executable)
@@ -90,9 +406,82 @@ def driver():
 
         driver = webdriver.Chrome(service=service, options=chrome_options)
 
+    return driver
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request):
+    """Per-worker pool of reusable WebDriver sessions (None with --fresh-sessions)"""
+    config = request.config
+    if config.getoption("--fresh-sessions"):
+        yield None
+        return
+
+    pool = SessionPool(
+        create_driver,
+        size=config.getoption("--pool-size"),
+        max_uses=config.getoption("--session-max-uses"),
+    )
+    pool.start()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="function")
+def driver(request, driver_pool):
+    """WebDriver for one test - pooled session, or a fresh browser with --fresh-sessions"""
+    # Attach the executing node to the test report (used by the structured results)
+    request.node.user_properties.append(("node", get_chrome_node_url() or "local"))
+    request.node.user_properties.append(("worker", os.getenv('PYTEST_XDIST_WORKER', 'main')))
+
+    full_render = request.node.get_closest_marker("full_render") is not None
+    # Pooled sessions carry the blocking content settings, a full_render test gets its own browser
+    fresh = driver_pool is None or (full_render and bool(BLOCKING.content_settings))
+    if fresh:
+        driver = create_driver(full_render=full_render)
+    else:
+        driver = driver_pool.acquire()
+
+    # Start the test with an empty performance log and the blocking rules it asked for
+    if PERFORMANCE_LOG:
+        drain_performance_log(driver)
+    BLOCKING.apply(driver, enabled=not full_render)
+    started = time.time()
     yield driver
+    if setup_or_call_failed(request.node):
+        # Only failed tests pay for reading the browser state
+        ARTIFACTS.capture(driver, request.node.nodeid, started)
+    if PERFORMANCE_LOG:
+        entries = drain_performance_log(driver)
+        if isinstance(ARCHIVE, ArchiveRecorder):
+            ARCHIVE.record(driver, entries)
+        stats = network_stats(entries, RESOURCE_SIZES)
+        for name in NETWORK_PROPERTIES:
+            request.node.user_properties.append((name, stats[name]))
+
+    if fresh:
+        driver.quit()
+    else:
+        driver_pool.release(driver)
+
 
-    driver.quit()
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Keep each phase's report on the item (rep_setup, rep_call) for fixture teardowns
+
+    A required lookup's timeout that failed the setup or call also cuts the
+    wait budget of the teardowns still to come (see pages.base_page.fail_fast).
+    """
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+    if report.when in ("setup", "call") and call.excinfo is not None and is_required_timeout(call.excinfo.value):
+        fail_fast()
+
+
+def setup_or_call_failed(item):
+    """Setup or call phase of `item` failed (asked from fixture teardown)"""
+    return any(getattr(getattr(item, f"rep_{when}", None), "failed", False) for when in ("setup", "call"))
 
 
 @pytest.fixture
@@ -100,3 +489,181 @@ def wait(driver):
     """WebDriverWait fixture"""
     return WebDriverWait(driver, 10)
 
+
+@pytest.fixture(scope="session")
+def checkpoints(driver_pool):
+    """Per-worker store of prepared page states (checkpoint tabs in pooled sessions)"""
+    return CheckpointStore(driver_pool, on_new_tab=BLOCKING.apply)
+
+
+@pytest.fixture
+def filtered_qa_jobs_page(driver, wait, checkpoints):
+    """QA jobs page filtered by Istanbul, Turkiye and Quality Assurance, built once per session"""
+    page = QAJobsPage(driver, wait)
+    with checkpoints.use(driver, "qa_jobs:Istanbul, Turkiye:Quality Assurance",
+                         build=lambda: page.open_filtered_jobs("Istanbul, Turkiye", "Quality Assurance"),
+                         fingerprint=page.get_filter_fingerprint):
+        yield page
+
+
+@pytest.fixture(autouse=True)
+def trace_test(request):
+    """Span of the whole test; its slowest action goes into the test's results record"""
+    if not TRACER.enabled:
+        yield
+        return
+    with TRACER.test_span(request.node.nodeid) as slowest:
+        yield
+    if slowest():
+        action, target, seconds = slowest()
+        request.node.user_properties.append(("slowest_action", f"{action} {target} {seconds:.2f}s"))
+
+
+@pytest.fixture(autouse=True)
+def record_impact(request):
+    """File the page object classes/modules used by this test under its node id"""
+    IMPACT.start_test(request.node.nodeid)
+    yield
+    IMPACT.finish_test()
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+def _deadline_exceeded(signum, frame):
+    raise DeadlineExceeded("test exceeded its wall-clock deadline")
+
+
+@pytest.fixture(autouse=True)
+def wait_deadline(request):
+    """Give every test a deadline: p99 of its passed runs times the factor, else --wait-budget
+
+    All condition waits stop at the deadline; DEADLINE_GRACE later the test is
+    interrupted even if it is stuck outside a wait (SIGALRM, main thread only).
+    """
+    deadline = TIMEOUTS.test_deadline(request.node.nodeid, request.config.getoption("--wait-budget"))
+    set_wait_deadline(deadline)
+    alarm = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+    if alarm:
+        previous = signal.signal(signal.SIGALRM, _deadline_exceeded)
+        signal.setitimer(signal.ITIMER_REAL, deadline + DEADLINE_GRACE)
+    try:
+        yield
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+        set_wait_deadline(None)
+
+
+def pytest_runtest_logreport(report):
+    """Collect the network stats of every finished test (in the xdist controller too)"""
+    global TEST_TIME
+    TEST_TIME += report.duration
+    if getattr(report, "node", None) is None:
+        # Report of a test this process ran (xdist sets .node on reports forwarded to the controller)
+        if report.nodeid not in TEST_DURATIONS or report.when == "setup":
+            TEST_DURATIONS[report.nodeid] = 0.0
+        if report.passed and TEST_DURATIONS[report.nodeid] is not None:
+            TEST_DURATIONS[report.nodeid] += report.duration
+        else:
+            TEST_DURATIONS[report.nodeid] = None
+        if report.when == "teardown":
+            duration = TEST_DURATIONS.pop(report.nodeid)
+            if duration is not None:
+                TIMEOUTS.record("tests", report.nodeid, duration)
+
+    if report.when == "teardown":
+        stats = {name: value for name, value in report.user_properties if name in NETWORK_PROPERTIES}
+        if stats:
+            NETWORK_STATS[report.nodeid] = stats
+
+
+def pytest_sessionfinish(session):
+    if RESOURCE_SIZES is not None:
+        RESOURCE_SIZES.save()
+    LOCATORS.save()
+    if isinstance(ARCHIVE, ArchiveRecorder):
+        ARCHIVE.save()
+    if isinstance(ARCHIVE, (ArchiveRecorder, ReplayProxy)):
+        ARCHIVE_SUMMARIES.append(f"{os.getenv('PYTEST_XDIST_WORKER', 'main')}: {ARCHIVE.summary()}")
+    # xdist worker: hand the wait statistics to the controller process
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["wait_stats"] = {site: list(stats) for site, stats in WAIT_STATS.items()}
+        workeroutput["archive_summaries"] = ARCHIVE_SUMMARIES
+        workeroutput["timeout_samples"] = TIMEOUTS.new
+        if TRACER.enabled:
+            workeroutput["trace"] = TRACER.export()
+        if IMPACT.enabled:
+            workeroutput["impact"] = IMPACT.export()
+    else:
+        # The controller (or a run without xdist) writes the timeout history once
+        TIMEOUTS.save()
+        if TRACER.enabled and session.config.getoption("--trace-file"):
+            TRACER.write(session.config.getoption("--trace-file"))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Merge the wait statistics (and record/replay summary) of a finished xdist worker"""
+    # The worker's Chrome Node is idle from now on: deploy.py --node-count auto releases it
+    results = node.config.pluginmanager.get_plugin("testops-results")
+    endpoint = get_chrome_node_url(node.gateway.id)
+    if results is not None and endpoint:
+        results.emit({"event": "node_idle", "node": endpoint, "worker": node.gateway.id})
+    workeroutput = getattr(node, "workeroutput", {})
+    for site, (calls, seconds) in workeroutput.get("wait_stats", {}).items():
+        WAIT_STATS[site][0] += calls
+        WAIT_STATS[site][1] += seconds
+    ARCHIVE_SUMMARIES.extend(workeroutput.get("archive_summaries", []))
+    TIMEOUTS.add(workeroutput.get("timeout_samples", {}))
+    if "trace" in workeroutput:
+        TRACER.merge(*workeroutput["trace"])
+    IMPACT.merge(workeroutput.get("impact", {}))
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Report waits per call site, the slowest traced actions and what request blocking saved"""
+    if SCHEDULER is not None and SCHEDULER.summary_lines(TEST_TIME):
+        terminalreporter.section("scheduling")
+        for line in SCHEDULER.summary_lines(TEST_TIME):
+            terminalreporter.write_line(line)
+    if ARCHIVE_SUMMARIES:
+        terminalreporter.section("record / replay")
+        for line in ARCHIVE_SUMMARIES:
+            terminalreporter.write_line(line)
+    if NETWORK_STATS and BLOCKING.enabled:
+        terminalreporter.section(f"request blocking ({BLOCKING.name} profile)")
+        totals = dict.fromkeys(NETWORK_PROPERTIES, 0)
+        for nodeid, stats in NETWORK_STATS.items():
+            terminalreporter.write_line(
+                f"{stats['blocked_requests']:5d} blocked {stats['bytes_saved'] / 1024:9.1f} KiB saved   "
+                f"{stats['requests']:5d} loaded {stats['bytes'] / 1024:9.1f} KiB   {nodeid}"
+            )
+            for name in NETWORK_PROPERTIES:
+                totals[name] += stats.get(name, 0)
+        terminalreporter.write_line(
+            f"{totals['blocked_requests']:5d} blocked {totals['bytes_saved'] / 1024:9.1f} KiB saved   "
+            f"{totals['requests']:5d} loaded {totals['bytes'] / 1024:9.1f} KiB   total "
+            f"(saved bytes are estimated from sizes seen unblocked)"
+        )
+    if TRACER.enabled and TRACER.stats:
+        terminalreporter.section(f"slowest actions (top {terminalreporter.config.getoption('--trace-top')})")
+        for action, target, calls, seconds, longest, failures in TRACER.slowest(
+                terminalreporter.config.getoption("--trace-top")):
+            terminalreporter.write_line(
+                f"{seconds:9.2f}s {calls:5d}x  max {longest:6.2f}s  {failures:3d} failed  {action} {target}"
+            )
+        trace_file = terminalreporter.config.getoption("--trace-file")
+        if trace_file:
+            terminalreporter.write_line(f"trace written to {trace_file}")
+    if not WAIT_STATS:
+        return
+    terminalreporter.section("wait time per call site")
+    total = 0.0
+    for site, (calls, seconds) in sorted(WAIT_STATS.items(), key=lambda item: -item[1][1]):
+        terminalreporter.write_line(f"{seconds:9.2f}s {calls:5d}x  {site}")
+        total += seconds
+    terminalreporter.write_line(f"{total:9.2f}s total")
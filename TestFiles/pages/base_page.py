@@ -1,55 +1,274 @@
-from selenium.webdriver.support.ui import WebDriverWait
+import sys
+import threading
+import time
+from collections import defaultdict
+
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+from utils.impact import IMPACT
+from utils.locators import LOCATORS, Locator
+from utils.timeouts import TIMEOUTS
+from utils.tracing import TRACER, describe
+
+
+# Time spent in condition waits per call site: {"QAJobsPage.filter_by_location:select2_options": [calls, seconds]}
+WAIT_STATS = defaultdict(lambda: [0, 0.0])
+
+# Once a required element is missing the test has failed: later waits only get this long
+FAILURE_GRACE = 2.0
+
+# Deadline shared by every wait of the test running in this thread (set by conftest per test)
+_test_state = threading.local()
+
+
+def set_wait_deadline(seconds):
+    """Limit the total time all waits of the current test may block (None = no limit)"""
+    _test_state.deadline = time.monotonic() + seconds if seconds else None
+
+
+def wait_deadline():
+    """Monotonic deadline of the current test's waits, or None"""
+    return getattr(_test_state, "deadline", None)
+
+
+def is_required_timeout(error):
+    """A required lookup (find_element, click, ...) timed out and nothing handled it"""
+    return isinstance(error, TimeoutException) and getattr(error, "required", False)
+
+
+def fail_fast():
+    """Shorten the current test's deadline after a required lookup's timeout reached the test
+
+    Called by conftest when the timeout leaves the test's setup or call;
+    page objects handle some of these timeouts themselves (e.g.
+    get_job_cards returns [] without a jobs list), those do not count.
+    """
+    deadline = wait_deadline()
+    grace = time.monotonic() + FAILURE_GRACE
+    _test_state.deadline = grace if deadline is None else min(deadline, grace)
+
+
+# Installs, once per document, observers for DOM mutations, finished resources and a starting navigation.
+# Resources are observed rather than read from performance.getEntriesByType: that buffer stops at 250 entries.
+OBSERVERS_SCRIPT = """
+if (window.__testopsLastMutation === undefined) {
+    window.__testopsLastMutation = performance.now();
+    new MutationObserver(function () { window.__testopsLastMutation = performance.now(); })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    window.__testopsLastResource = performance.getEntriesByType('resource').reduce(function (last, entry) {
+        return Math.max(last, entry.responseEnd);
+    }, 0);
+    new PerformanceObserver(function (list) {
+        list.getEntries().forEach(function (entry) {
+            window.__testopsLastResource = Math.max(window.__testopsLastResource, entry.responseEnd);
+        });
+    }).observe({type: 'resource'});
+    window.__testopsNavigating = false;
+    window.addEventListener('beforeunload', function () { window.__testopsNavigating = true; });
+}
+"""
+
+# ms since the last DOM mutation
+DOM_QUIET_SCRIPT = OBSERVERS_SCRIPT + """
+return performance.now() - window.__testopsLastMutation;
+"""
+
+# True when the document is loaded, no navigation or jQuery AJAX is in flight and no resource finished recently
+NETWORK_IDLE_SCRIPT = OBSERVERS_SCRIPT + """
+var quietMs = arguments[0];
+if (document.readyState !== 'complete' || window.__testopsNavigating) return false;
+if (window.jQuery && window.jQuery.active > 0) return false;
+return performance.now() - window.__testopsLastResource >= quietMs;
+"""
+
+# Network idle and no DOM mutation for the same quiet period
+PAGE_SETTLED_SCRIPT = NETWORK_IDLE_SCRIPT.replace(
+    "return performance.now() - window.__testopsLastResource >= quietMs;",
+    "return performance.now() - Math.max(window.__testopsLastResource, window.__testopsLastMutation) >= quietMs;"
+)
 
 
 class BasePage:
     """Base page class with common methods"""
-    
+
+    # Condition polling starts fast and backs off exponentially
+    POLL_INTERVAL = 0.05
+    MAX_POLL_INTERVAL = 0.5
+
     def __init__(self, driver, wait):
         self.driver = driver
         self.wait = wait
-    
+        IMPACT.touch_page(self)
+
     def open(self, url):
         """Navigate to URL"""
-        self.driver.get(url)
-    
+        with TRACER.span("open", url):
+            self.driver.get(url)
+
+    def wait_until(self, condition, timeout=10, site=None, message="condition not met"):
+        """Poll condition(driver) with backoff until it returns a truthy value
+
+        The wait ends at `timeout` or at the test's global deadline, whichever
+        comes first, and its duration is recorded in WAIT_STATS under `site`.
+        `timeout` is the default: once the site has history, p99 of its
+        successful waits times the safety factor is used instead.
+        """
+        site = site or self._call_site("wait")
+        with TRACER.span("wait", site):
+            return self._poll(condition, timeout, site, message)
+
+    def _poll(self, condition, timeout, site, message, required=False):
+        """wait_until's polling loop; locator helpers call it inside their own span
+
+        A `required` wait that times out is marked on its TimeoutException; if
+        that reaches the test, the test's remaining wait budget ends after
+        FAILURE_GRACE instead of letting every later lookup time out too.
+        """
+        start = time.monotonic()
+        end = start + TIMEOUTS.wait_timeout(site, timeout)
+        deadline = wait_deadline()
+        if deadline is not None:
+            end = min(end, deadline)
+        interval = self.POLL_INTERVAL
+        try:
+            while True:
+                try:
+                    value = condition(self.driver)
+                    if value:
+                        TIMEOUTS.record("sites", site, time.monotonic() - start)
+                        return value
+                except (NoSuchElementException, StaleElementReferenceException):
+                    pass
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    error = TimeoutException(f"{site}: {message} after {time.monotonic() - start:.1f}s")
+                    error.required = required
+                    raise error
+                time.sleep(min(interval, remaining))
+                interval = min(interval * 2, self.MAX_POLL_INTERVAL)
+        finally:
+            stats = WAIT_STATS[site]
+            stats[0] += 1
+            stats[1] += time.monotonic() - start
+
+    def _call_site(self, kind):
+        """Name the page object method that requested a wait, e.g. 'QAJobsPage.filter_by_location:dom_stable'"""
+        frame = sys._getframe(1)
+        while frame is not None and frame.f_code.co_filename == __file__:
+            frame = frame.f_back
+        method = frame.f_code.co_name if frame is not None else "?"
+        return f"{type(self).__name__}.{method}:{kind}"
+
+    def wait_for_page_load(self, timeout=10):
+        """Wait until document.readyState is complete"""
+        return self.wait_until(
+            lambda d: d.execute_script("return document.readyState") == "complete",
+            timeout, self._call_site("page_load"), "page did not finish loading"
+        )
+
+    def wait_for_dom_stable(self, quiet=0.3, timeout=10):
+        """Wait until the DOM has not mutated for `quiet` seconds"""
+        return self.wait_until(
+            lambda d: d.execute_script(DOM_QUIET_SCRIPT) >= quiet * 1000,
+            timeout, self._call_site("dom_stable"), "DOM kept changing"
+        )
+
+    def wait_for_network_idle(self, quiet=0.5, timeout=10):
+        """Wait until the page is loaded and no request has finished for `quiet` seconds"""
+        return self.wait_until(
+            lambda d: d.execute_script(NETWORK_IDLE_SCRIPT, quiet * 1000),
+            timeout, self._call_site("network_idle"), "network did not become idle"
+        )
+
+    def watch_activity(self):
+        """Start observing the page before an action, so wait_for_change sees a navigation it starts"""
+        self.driver.execute_script(OBSERVERS_SCRIPT)
+
+    def wait_for_change(self, changed, quiet=0.5, timeout=10, site=None, message="page neither changed nor settled"):
+        """Wait until `changed(driver)` holds (True) or the page settles without it (False)
+
+        Settled means loaded, no navigation or AJAX in flight, and no resource
+        or DOM mutation for `quiet` seconds (counted from the start of the wait
+        at the earliest): the action needed no re-render. An action that does
+        nothing visible thus costs `quiet`, not the whole timeout. Call
+        watch_activity() before the action.
+        """
+        start = time.monotonic()
+
+        def changed_or_settled(d):
+            if changed(d):
+                return "changed"
+            if time.monotonic() - start >= quiet and d.execute_script(PAGE_SETTLED_SCRIPT, quiet * 1000):
+                return "settled"
+            return None
+
+        site = site or self._call_site("change")
+        return self.wait_until(changed_or_settled, timeout, site, message) == "changed"
+
+    def wait_for_url_change(self, previous_url, timeout=10):
+        """Wait until the current URL differs from `previous_url`"""
+        return self.wait_until(
+            lambda d: d.current_url != previous_url,
+            timeout, self._call_site("url_change"), f"URL stayed at {previous_url}"
+        )
+
+    @staticmethod
+    def located(locator, clickable=False):
+        """Wait condition for a (By, value) tuple or a registry Locator (probes its alternatives)"""
+        if isinstance(locator, Locator):
+            return lambda d: LOCATORS.probe(d, locator, clickable)
+        return EC.element_to_be_clickable(locator) if clickable else EC.presence_of_element_located(locator)
+
     def find_element(self, locator, timeout=10):
         """Find element with wait"""
-        return WebDriverWait(self.driver, timeout).until(
-            EC.presence_of_element_located(locator)
-        )
-    
+        with TRACER.span("find_element", describe(locator)):
+            return self._poll(
+                self.located(locator),
+                timeout, self._call_site("find"), f"element {locator} not found", required=True
+            )
+
     def find_elements(self, locator, timeout=10):
         """Find elements with wait"""
-        WebDriverWait(self.driver, timeout).until(
-            EC.presence_of_element_located(locator)
-        )
-        return self.driver.find_elements(*locator)
-    
+        with TRACER.span("find_elements", describe(locator)):
+            self._poll(
+                self.located(locator),
+                timeout, self._call_site("find"), f"element {locator} not found", required=True
+            )
+            if isinstance(locator, Locator):
+                return LOCATORS.find_all(self.driver, locator)
+            return self.driver.find_elements(*locator)
+
     def click(self, locator, timeout=10):
         """Click element with wait"""
-        element = WebDriverWait(self.driver, timeout).until(
-            EC.element_to_be_clickable(locator)
-        )
-        element.click()
-    
+        with TRACER.span("click", describe(locator)):
+            element = self._poll(
+                self.located(locator, clickable=True),
+                timeout, self._call_site("clickable"), f"element {locator} not clickable", required=True
+            )
+            element.click()
+
     def is_element_present(self, locator, timeout=10):
         """Check if element is present"""
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located(locator)
-            )
+            with TRACER.span("is_element_present", describe(locator)):
+                self._poll(
+                    self.located(locator),
+                    timeout, self._call_site("present"), f"element {locator} not found"
+                )
             return True
         except:
             return False
-    
+
     def get_text(self, locator, timeout=10):
         """Get text from element"""
         element = self.find_element(locator, timeout)
         return element.text
-    
+
     def get_current_url(self):
         """Get current URL"""
         return self.driver.current_url
-
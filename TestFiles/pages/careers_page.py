@@ -1,14 +1,30 @@
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
+from utils.locators import Locator
 
 
 class CareersPage(BasePage):
     """Careers Page Object"""
     
-    # XPaths
-    LOCATION_XPATH = (By.XPATH, "//*[@id='career-our-location']/div/div/div/div[1]/h3")
-    TEAMS_XPATH = (By.XPATH, "//*[@id='career-find-our-calling']/div/div/div[1]/h3")
-    LIFE_AT_INSIDER_XPATH = (By.XPATH, "/html/body/div[2]/section[4]/div/div/div/div[1]/div/h2")
+    # Locators: alternatives in order of robustness, the old (absolute) XPath last
+    LOCATION_BLOCK = Locator(
+        "CareersPage.location_block",
+        (By.CSS_SELECTOR, "#career-our-location h3"),
+        (By.ID, "career-our-location"),
+        (By.XPATH, "//*[@id='career-our-location']/div/div/div/div[1]/h3"),
+    )
+    TEAMS_BLOCK = Locator(
+        "CareersPage.teams_block",
+        (By.CSS_SELECTOR, "#career-find-our-calling h3"),
+        (By.ID, "career-find-our-calling"),
+        (By.XPATH, "//*[@id='career-find-our-calling']/div/div/div[1]/h3"),
+    )
+    LIFE_AT_INSIDER_BLOCK = Locator(
+        "CareersPage.life_at_insider_block",
+        (By.XPATH, "//h2[contains(normalize-space(), 'Life at Insider')]"),
+        (By.XPATH, "//section[.//h2[contains(., 'Life at Insider')]]//h2"),
+        (By.XPATH, "/html/body/div[2]/section[4]/div/div/div/div[1]/div/h2"),
+    )
     
     def __init__(self, driver, wait):
         super().__init__(driver, wait)
@@ -20,13 +36,13 @@ class CareersPage(BasePage):
     
     def is_location_block_present(self):
         """Check if Locations block is present"""
-        return self.is_element_present(self.LOCATION_XPATH)
+        return self.is_element_present(self.LOCATION_BLOCK)
     
     def is_teams_block_present(self):
         """Check if Teams block is present"""
-        return self.is_element_present(self.TEAMS_XPATH)
+        return self.is_element_present(self.TEAMS_BLOCK)
     
     def is_life_at_insider_block_present(self):
         """Check if Life at Insider block is present"""
-        return self.is_element_present(self.LIFE_AT_INSIDER_XPATH)
+        return self.is_element_present(self.LIFE_AT_INSIDER_BLOCK)
 
@@ -1,13 +1,25 @@
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
+from utils.locators import Locator
+from utils.tracing import TRACER, describe
 
 
 class HomePage(BasePage):
     """Home Page Object"""
     
-    # XPaths
-    COMPANY_XPATH = (By.XPATH, "/html/body/nav/div[2]/div/ul[1]/li[6]/a")
-    CAREERS_XPATH = (By.XPATH, "//*[@id='navbarNavDropdown']/ul[1]/li[6]/div/div[2]/a[2]")
+    # Locators: alternatives in order of robustness, the old absolute XPath last
+    COMPANY_MENU = Locator(
+        "HomePage.company_menu",
+        (By.XPATH, "//*[@id='navbarNavDropdown']//a[normalize-space()='Company']"),
+        (By.XPATH, "//nav//a[normalize-space()='Company']"),
+        (By.XPATH, "/html/body/nav/div[2]/div/ul[1]/li[6]/a"),
+    )
+    CAREERS_LINK = Locator(
+        "HomePage.careers_link",
+        (By.CSS_SELECTOR, "#navbarNavDropdown a[href$='/careers/']"),
+        (By.XPATH, "//*[@id='navbarNavDropdown']//a[normalize-space()='Careers']"),
+        (By.XPATH, "//*[@id='navbarNavDropdown']/ul[1]/li[6]/div/div[2]/a[2]"),
+    )
     
     def __init__(self, driver, wait):
         super().__init__(driver, wait)
@@ -24,10 +36,11 @@ class HomePage(BasePage):
     def hover_company_menu(self):
         """Hover over Company menu"""
         from selenium.webdriver.common.action_chains import ActionChains
-        company_element = self.find_element(self.COMPANY_XPATH)
-        ActionChains(self.driver).move_to_element(company_element).perform()
+        company_element = self.find_element(self.COMPANY_MENU)
+        with TRACER.span("hover", describe(self.COMPANY_MENU)):
+            ActionChains(self.driver).move_to_element(company_element).perform()
     
     def click_careers(self):
         """Click Careers link"""
-        self.click(self.CAREERS_XPATH)
+        self.click(self.CAREERS_LINK)
 
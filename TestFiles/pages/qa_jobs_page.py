@@ -1,20 +1,56 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 from pages.base_page import BasePage
-from selenium.webdriver.support.ui import Select, WebDriverWait
+from utils.locators import Locator
+from utils.tracing import TRACER, describe
+from selenium.webdriver.support.ui import Select
 from selenium.webdriver.support import expected_conditions as EC
-import time
+from selenium.common.exceptions import TimeoutException
+from collections import namedtuple
+
+
+# One job card of the jobs list, read in a single script execution
+JobCard = namedtuple("JobCard", ["element", "position", "department", "location", "view_role_href"])
+
+# Reads every card under #jobs-list (same structure as JOBS_LIST_XPATH and the JOB_*_XPATH children)
+JOB_CARDS_SCRIPT = """
+var cards = document.querySelectorAll('#jobs-list > div > div');
+return Array.prototype.map.call(cards, function (card) {
+    function text(selector) {
+        var el = card.querySelector(selector);
+        return el ? el.innerText.trim() : '';
+    }
+    var link = card.querySelector(':scope > a');
+    return [card, text(':scope > p'), text(':scope > span'), text(':scope > div'), link ? link.href : ''];
+});
+"""
+
+# Visible text of the selected location and department options ('' while a select is missing)
+SELECTED_FILTERS_JS = """
+function selectedText(id) {
+    var select = document.getElementById(id);
+    return select && select.selectedIndex >= 0 ? select.options[select.selectedIndex].text.trim() : '';
+}
+var filters = [selectedText('filter-by-location'), selectedText('filter-by-department')];
+"""
 
 
 class QAJobsPage(BasePage):
     """QA Jobs Page Object"""
     
-    # XPaths
-    SEE_ALL_QA_JOBS_BUTTON_XPATH = (By.XPATH, "//*[@id='page-head']/div/div/div[1]/div/div/a")
+    # Locators: alternatives in order of robustness, the old absolute XPath last
+    SEE_ALL_QA_JOBS_BUTTON = Locator(
+        "QAJobsPage.see_all_qa_jobs",
+        (By.XPATH, "//a[contains(normalize-space(), 'See all QA jobs')]"),
+        (By.CSS_SELECTOR, "#page-head a[href*='open-positions']"),
+        (By.XPATH, "//*[@id='page-head']/div/div/div[1]/div/div/a"),
+    )
     
     # Location dropdown (JavaScript dropdown)
     LOCATION_DROPDOWN_XPATH = (By.XPATH, "//*[@id='select2-filter-by-location-container']/span")
     LOCATION_OPTION_XPATH = (By.XPATH, "//li[contains(@class, 'select2-results__option') and contains(text(), '{}')]")
+    LOCATION_DROPDOWN_SELECTION_XPATH = (By.XPATH, "//span[contains(@class, 'select2-selection')]")
+    LOCATION_RENDERED_XPATH = (By.XPATH, "//span[contains(@class, 'select2-selection__rendered')]")
+    LOCATION_SELECT_OPTIONS_XPATH = (By.XPATH, "//select[@id='filter-by-location']/option")
     
     # These XPaths will be created randomly as requested, user will fix them later
     DEPARTMENT_FILTER_XPATH = (By.XPATH, "//select[@id='filter-by-department']")
@@ -32,10 +68,48 @@ class QAJobsPage(BasePage):
         """Open QA jobs page"""
         self.open(self.url)
     
+    def open_filtered_jobs(self, location="Istanbul, Turkiye", department="Quality Assurance"):
+        """Open the QA jobs list filtered by location and department
+
+        The filter steps only log their errors, so the selected values are
+        checked here: a page whose filters did not apply must not become a
+        checkpoint that later tests reuse.
+        """
+        self.open_qa_jobs_page()
+        self.click_see_all_qa_jobs()
+        self.filter_by_location(location)
+        self.filter_by_department(department)
+        if not self.are_filters_applied(location, department):
+            raise RuntimeError(f"Filters not applied: selected {self.get_selected_filters()}, "
+                               f"expected ({location!r}, {department!r})")
+
+    def get_selected_filters(self):
+        """(location, department) currently selected in the filter dropdowns"""
+        return tuple(self.driver.execute_script(SELECTED_FILTERS_JS + "return filters;"))
+
+    def are_filters_applied(self, location="Istanbul, Turkiye", department="Quality Assurance"):
+        """Check the dropdowns hold the requested location and department"""
+        selected_location, selected_department = self.get_selected_filters()
+        return location in selected_location and department in selected_department
+
+    def get_filter_fingerprint(self):
+        """URL, selected filters and rendered jobs list; changes when a test mutates the page"""
+        return self.driver.execute_script(
+            SELECTED_FILTERS_JS
+            + "var list = document.getElementById('jobs-list');"
+            "return [window.location.href].concat(filters,"
+            "        [list ? list.children.length + ':' + list.innerHTML.length : '']).join('|');"
+        )
+
     def click_see_all_qa_jobs(self):
         """Click See all QA jobs button"""
-        self.click(self.SEE_ALL_QA_JOBS_BUTTON_XPATH)
-        time.sleep(2)  # Wait for page to load
+        previous_url = self.get_current_url()
+        self.watch_activity()
+        self.click(self.SEE_ALL_QA_JOBS_BUTTON)
+        # Buton aynı sayfada listeyi açmış olabilir: URL değişmeden sayfa durulursa beklenmez
+        self.wait_for_change(lambda d: d.current_url != previous_url,
+                             site=self._call_site("url_change"), message=f"URL stayed at {previous_url}")
+        self.wait_for_network_idle()
     
   
 
@@ -43,26 +117,32 @@ class QAJobsPage(BasePage):
         """Filter jobs by location using Select2 dropdown"""
 
         try:
-            # Dropdown alanını bekle ve tıkla
-            dropdown = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, "//span[contains(@class, 'select2-selection')]"))
+            # Lokasyon seçenekleri AJAX ile dolana kadar bekle (select2 ancak o zaman seçilebilir)
+            self.wait_until(
+                lambda d: len(d.find_elements(*self.LOCATION_SELECT_OPTIONS_XPATH)) > 1,
+                timeout=20, site=self._call_site("location_options_loaded"),
+                message="location options were not loaded"
             )
-            time.sleep(12)  # Wait 3 seconds before clicking
-            dropdown.click()
-
-            # Dropdown açıldıktan sonra klavye tuşları ile seçim yap
-            time.sleep(1)  # Dropdown'ın açılması için kısa bekleme
-            # 12 kez aşağı ok tuşuna bas
-            for _ in range(12):
-                dropdown.send_keys(Keys.ARROW_DOWN)
-                time.sleep(0.1)  # Her tuş basımı arasında kısa bekleme
-            # Enter tuşuna basarak seçimi onayla
-            dropdown.send_keys(Keys.ENTER)
-
-            # Filtre uygulandığında sonuçların yüklenmesini beklemek isterseniz kısa bir bekleme ekleyebilirsiniz
-            WebDriverWait(self.driver, 5).until(
-                lambda d: location in d.find_element(By.XPATH, "//span[contains(@class, 'select2-selection__rendered')]").text
+            jobs_before = self.get_jobs_list_signature()
+            self.watch_activity()
+
+            # Dropdown alanını bekle ve tıkla
+            self.click(self.LOCATION_DROPDOWN_SELECTION_XPATH)
+
+            # Select2 seçenekleri render edilince istenen lokasyonu seç
+            option_locator = (By.XPATH, self.LOCATION_OPTION_XPATH[1].format(location))
+            self.wait_until(
+                EC.element_to_be_clickable(option_locator),
+                site=self._call_site("select2_options"),
+                message=f"select2 option '{location}' not rendered"
+            ).click()
+
+            self.wait_until(
+                lambda d: location in d.find_element(*self.LOCATION_RENDERED_XPATH).text,
+                timeout=5, site=self._call_site("location_selected"),
+                message=f"location '{location}' not selected"
             )
+            self.wait_for_jobs_list_refresh(jobs_before)
 
         except Exception as e:
             print(f"[ERROR] Location filter operation failed: {e}")
@@ -74,39 +154,78 @@ class QAJobsPage(BasePage):
         try:
             department_filter = self.find_element(self.DEPARTMENT_FILTER_XPATH)
             select = Select(department_filter)
-            select.select_by_visible_text(department)
-            time.sleep(2)  # Wait for filter to apply
+            jobs_before = self.get_jobs_list_signature()
+            self.watch_activity()
+            with TRACER.span("select", describe(self.DEPARTMENT_FILTER_XPATH)):
+                select.select_by_visible_text(department)
+            self.wait_for_jobs_list_refresh(jobs_before)
         except Exception as e:
             print(f"Department filter not found or error: {e}")
     
+    def get_job_cards(self):
+        """Get every job card as a JobCard record with one round trip to the browser"""
+        try:
+            self.find_element(self.JOBS_LIST_XPATH)
+        except TimeoutException:
+            return []
+        with TRACER.span("script", "JOB_CARDS_SCRIPT"):
+            return [JobCard(*card) for card in self.driver.execute_script(JOB_CARDS_SCRIPT)]
+
     def get_jobs_list(self):
-        """Get list of job elements"""
+        """Get list of jobs (JobCard records, usable with the get_job_* getters)"""
         try:
-            return self.find_elements(self.JOBS_LIST_XPATH)
+            return self.get_job_cards()
         except:
             return []
     
+    def get_jobs_list_signature(self):
+        """Cheap fingerprint of the rendered jobs list, used to detect re-renders"""
+        return self.driver.execute_script(
+            "var list = document.getElementById('jobs-list');"
+            "return list ? list.children.length + ':' + list.innerHTML.length : '';"
+        )
+
+    def wait_for_jobs_list_refresh(self, previous_signature, timeout=10):
+        """Wait for the jobs list to re-render after a filter change and then settle
+
+        A filter that keeps the same result set re-renders nothing: once the
+        filter's request is done and the DOM is quiet the wait ends there.
+        """
+        refreshed = self.wait_for_change(
+            lambda d: self.get_jobs_list_signature() != previous_signature,
+            timeout=timeout, site=self._call_site("jobs_list_changed"),
+            message="jobs list neither re-rendered nor settled"
+        )
+        if refreshed:
+            self.wait_for_dom_stable(timeout=timeout)
+
     def is_jobs_list_present(self):
         """Check if jobs list is present"""
         jobs = self.get_jobs_list()
         return len(jobs) > 0
     
     def get_job_position(self, job_element):
-        """Get job position text from job element"""
+        """Get job position text from a JobCard (or a raw job element)"""
+        if isinstance(job_element, JobCard):
+            return job_element.position
         try:
             return job_element.find_element(*self.JOB_POSITION_XPATH).text
         except:
             return ""
     
     def get_job_department(self, job_element):
-        """Get job department text from job element"""
+        """Get job department text from a JobCard (or a raw job element)"""
+        if isinstance(job_element, JobCard):
+            return job_element.department
         try:
             return job_element.find_element(*self.JOB_DEPARTMENT_XPATH).text
         except:
             return ""
     
     def get_job_location(self, job_element):
-        """Get job location text from job element"""
+        """Get job location text from a JobCard (or a raw job element)"""
+        if isinstance(job_element, JobCard):
+            return job_element.location
         try:
             return job_element.find_element(*self.JOB_LOCATION_XPATH).text
         except:
@@ -119,25 +238,27 @@ class QAJobsPage(BasePage):
             current_windows = self.driver.window_handles
             main_window = self.driver.current_window_handle
             
-            # View Role butonunu bul
-            view_role_button = job_element.find_element(*self.VIEW_ROLE_BUTTON_XPATH)
-            
             # JavaScript ile click yap (bazen normal click yeni pencereyi açmaz)
-            self.driver.execute_script("arguments[0].click();", view_role_button)
+            with TRACER.span("click", describe(self.VIEW_ROLE_BUTTON_XPATH)):
+                if isinstance(job_element, JobCard):
+                    # Kartın kendi View Role linki, ayrı bir find_element çağrısı olmadan
+                    self.driver.execute_script("arguments[0].querySelector(':scope > a').click();", job_element.element)
+                else:
+                    view_role_button = job_element.find_element(*self.VIEW_ROLE_BUTTON_XPATH)
+                    self.driver.execute_script("arguments[0].click();", view_role_button)
             
             # Yeni pencere açılmasını bekle
-            WebDriverWait(self.driver, 10).until(
-                lambda d: len(d.window_handles) > len(current_windows)
+            self.wait_until(
+                lambda d: len(d.window_handles) > len(current_windows),
+                site=self._call_site("new_window"), message="View Role did not open a new window"
             )
             
             # Yeni pencereye geç
             new_windows = [w for w in self.driver.window_handles if w not in current_windows]
             if new_windows:
                 self.driver.switch_to.window(new_windows[0])
-                time.sleep(2)  # Yeni sayfanın yüklenmesini bekle
-            else:
-                # Yeni pencere açılmadıysa, mevcut pencerede redirect olmuş olabilir
-                time.sleep(2)
+            # Yeni pencere açılmadıysa, mevcut pencerede redirect olmuş olabilir
+            self.wait_for_page_load()
                 
         except Exception as e:
             print(f"View Role button not found or error: {e}")
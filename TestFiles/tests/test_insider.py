@@ -1,6 +1,5 @@
 from pages.home_page import HomePage
 from pages.careers_page import CareersPage
-from pages.qa_jobs_page import QAJobsPage
 
 
 class TestInsider:
@@ -29,36 +28,20 @@ class TestInsider:
         assert careers_page.is_teams_block_present(), "Teams block is not present"
         assert careers_page.is_life_at_insider_block_present(), "Life at Insider block is not present"
     
-    def test_3_qa_jobs_filtering(self, driver, wait):
+    def test_3_qa_jobs_filtering(self, filtered_qa_jobs_page):
         """Test 3: Go to QA jobs page, click See all QA jobs, filter by Location and Department"""
-        qa_jobs_page = QAJobsPage(driver, wait)
-        qa_jobs_page.open_qa_jobs_page()
+        qa_jobs_page = filtered_qa_jobs_page
         
-        # Click See all QA jobs button
-        qa_jobs_page.click_see_all_qa_jobs()
-        
-        # Filter by Location - Istanbul, Turkey
-        qa_jobs_page.filter_by_location("Istanbul, Turkiye")
-        
-        # Filter by Department - Quality Assurance
-        qa_jobs_page.filter_by_department("Quality Assurance")
+        # Check the filters are selected (the filtered page may come from an earlier test)
+        assert qa_jobs_page.are_filters_applied("Istanbul, Turkiye", "Quality Assurance"), \
+            f"Filters are not applied: {qa_jobs_page.get_selected_filters()}"
         
         # Check presence of jobs list
         assert qa_jobs_page.is_jobs_list_present(), "Jobs list is not present"
     
-    def test_4_job_details_verification(self, driver, wait):
+    def test_4_job_details_verification(self, filtered_qa_jobs_page):
         """Test 4: Check that all jobs contain Quality Assurance in Position and Department, Istanbul, Turkiye in Location"""
-        qa_jobs_page = QAJobsPage(driver, wait)
-        qa_jobs_page.open_qa_jobs_page()
-        
-        # Click See all QA jobs button
-        qa_jobs_page.click_see_all_qa_jobs()
-        
-        # Filter by Location - Istanbul, Turkiye
-        qa_jobs_page.filter_by_location("Istanbul, Turkiye")
-        
-        # Filter by Department - Quality Assurance
-        qa_jobs_page.filter_by_department("Quality Assurance")
+        qa_jobs_page = filtered_qa_jobs_page
         
         # Get jobs list
         jobs = qa_jobs_page.get_jobs_list()
@@ -75,19 +58,9 @@ class TestInsider:
             assert "Quality Assurance" in department, f"Department '{department}' does not contain 'Quality Assurance'"
             assert "Istanbul, Turkiye" in location, f"Location '{location}' does not contain 'Istanbul, Turkiye'"
     
-    def test_5_view_role_redirect(self, driver, wait):
+    def test_5_view_role_redirect(self, filtered_qa_jobs_page):
         """Test 5: Click View Role button and check redirect to Lever Application form page"""
-        qa_jobs_page = QAJobsPage(driver, wait)
-        qa_jobs_page.open_qa_jobs_page()
-        
-        # Click See all QA jobs button
-        qa_jobs_page.click_see_all_qa_jobs()
-        
-        # Filter by Location - Istanbul, Turkiye
-        qa_jobs_page.filter_by_location("Istanbul, Turkiye")
-        
-        # Filter by Department - Quality Assurance
-        qa_jobs_page.filter_by_department("Quality Assurance")
+        qa_jobs_page = filtered_qa_jobs_page
         
         # Get jobs list
         jobs = qa_jobs_page.get_jobs_list()
@@ -0,0 +1,121 @@
+import gzip
+import json
+import os
+import re
+import threading
+import time
+
+# A failing test's artifacts: the screenshot is already compressed (PNG), text is gzipped
+SCREENSHOT = "screenshot.png"
+PAGE_SOURCE = "page.html.gz"
+CONSOLE_LOG = "console.json.gz"
+
+# Total time the capture steps of one test may take; a step still running then is abandoned
+CAPTURE_BUDGET = 10.0
+
+
+def artifact_dir_name(nodeid):
+    """Filesystem-safe directory name of a test, e.g. tests-test_insider.py-TestInsider-test_1"""
+    return re.sub(r"[^A-Za-z0-9_.-]+", "-", nodeid.replace("::", "-")).strip("-")[:200]
+
+
+class FailureArtifacts:
+    """Screenshot, page source and browser console of failed tests
+
+    Nothing is read from the browser for a passing test: the driver fixture
+    only calls capture() when the test's setup or call phase failed. Console
+    messages are kept by Chrome (goog:loggingPrefs browser=ALL) and only those
+    logged after the test started are written, so pooled sessions do not need
+    their log drained between tests. Each test gets its own directory under
+    `directory`, which deploy.py pulls out of the pod as one archive.
+    """
+
+    def __init__(self, directory=None, limit=50):
+        self.directory = directory
+        self.limit = limit  # per process, so a run where everything fails stays cheap
+        self.captured = 0
+
+    @property
+    def enabled(self):
+        return bool(self.directory)
+
+    def configure_options(self, options):
+        """Keep the browser console log (next to the performance log, when that is kept)"""
+        if not self.enabled:
+            return
+        prefs = dict(options.to_capabilities().get("goog:loggingPrefs", {}))
+        prefs["browser"] = "ALL"
+        options.set_capability("goog:loggingPrefs", prefs)
+
+    def capture(self, driver, nodeid, started):
+        """Write the artifacts of failed test `nodeid`; `started` is its start time (time.time())
+
+        Every step is best effort: a browser that no longer answers must not
+        turn the failure into a teardown error. Each read runs in a daemon
+        thread bounded by what is left of CAPTURE_BUDGET; once one does not
+        come back the browser is considered stuck and the rest are skipped.
+        """
+        if not self.enabled or self.captured >= self.limit:
+            return None
+        self.captured += 1
+        path = os.path.join(self.directory, artifact_dir_name(nodeid))
+        os.makedirs(path, exist_ok=True)
+        deadline = time.monotonic() + CAPTURE_BUDGET
+        steps = (
+            (SCREENSHOT, lambda: driver.get_screenshot_as_png()),
+            (PAGE_SOURCE, lambda: gzip.compress(driver.page_source.encode())),
+            (CONSOLE_LOG, lambda: gzip.compress(json.dumps(self.console(driver, started), indent=1).encode())),
+        )
+        for name, read in steps:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                data = self.bounded(read, remaining)
+            except TimeoutError:
+                break
+            except Exception:
+                continue
+            with open(os.path.join(path, name), "wb") as f:
+                f.write(data)
+        return path
+
+    @staticmethod
+    def bounded(read, timeout):
+        """Result of read(), raising TimeoutError if it takes longer than `timeout` seconds"""
+        outcome = {}
+
+        def run():
+            try:
+                outcome["data"] = read()
+            except Exception as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=run, name="failure-artifact", daemon=True)
+        thread.start()
+        thread.join(timeout)
+        if thread.is_alive():
+            raise TimeoutError(f"no answer from the browser in {timeout:.1f}s")
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["data"]
+
+    @staticmethod
+    def console(driver, started):
+        since = started * 1000
+        return [entry for entry in driver.get_log("browser") if entry.get("timestamp", since) >= since]
+
+    def record(self):
+        """Record for deploy.py once the session is over: files and bytes waiting to be pulled, or None"""
+        if not self.enabled or not os.path.isdir(self.directory):
+            return None
+        files = size = 0
+        for root, _, names in os.walk(self.directory):
+            files += len(names)
+            size += sum(os.path.getsize(os.path.join(root, name)) for name in names)
+        if not files:
+            return None
+        return {"event": "artifacts", "dir": self.directory, "files": files, "bytes": size}
+
+
+ARTIFACTS = FailureArtifacts()
@@ -0,0 +1,178 @@
+import json
+import os
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+from utils.cdp import execute_cdp
+
+# Resource types are matched by URL pattern (Network.setBlockedURLs wildcards)
+RESOURCE_PATTERNS = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.ico"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.ogg", "*.mp3", "*.m3u8"],
+}
+
+# Third-party hosts nothing in the suite asserts on (analytics, ads, chat, video embeds)
+THIRD_PARTY_HOSTS = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googleadservices.com",
+    "facebook.net", "connect.facebook.net", "hotjar.com", "clarity.ms", "linkedin.com", "licdn.com",
+    "hubspot.com", "hs-scripts.com", "hs-analytics.net", "hsforms.net", "intercom.io", "intercomcdn.com",
+    "drift.com", "driftt.com", "youtube.com", "ytimg.com", "vimeo.com", "vimeocdn.com",
+]
+
+PROFILES = {
+    "off": {"types": [], "hosts": []},
+    "third-party": {"types": [], "hosts": THIRD_PARTY_HOSTS},
+    "default": {"types": ["image", "font", "media"], "hosts": THIRD_PARTY_HOSTS},
+}
+
+# Chrome prefs of a blocking session: no permission prompts, no autoplaying video
+BLOCKING_PREFS = {
+    "profile.default_content_setting_values.notifications": 2,
+    "profile.default_content_setting_values.geolocation": 2,
+    "profile.default_content_setting_values.media_stream": 2,
+}
+# Resource types Chrome can drop by content setting, whatever their URL looks like (fonts and
+# media have no content setting and are blocked by URL pattern only)
+CONTENT_SETTING_PREFS = {
+    "image": "profile.managed_default_content_settings.images",
+}
+BLOCKING_ARGUMENTS = ["--autoplay-policy=user-gesture-required"]
+
+SIZES_FILE = os.path.join(
+    os.getenv('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'testops', 'resource-sizes.json'
+)
+
+
+class BlockingProfile:
+    """Request blocking rules applied to a browser tab through CDP
+
+    Patterns are set per tab with Network.setBlockedURLs, so a pooled session
+    can be switched off for a single test (full_render marker) and back on.
+    Content settings (images) are session-wide and also catch URLs without a
+    file extension; a full_render test therefore gets a session without them.
+    """
+
+    def __init__(self, name="default", extra_hosts=()):
+        if name not in PROFILES:
+            raise ValueError(f"Unknown blocking profile '{name}', choose from {', '.join(PROFILES)}")
+        profile = PROFILES[name]
+        self.name = name
+        self.patterns = [pattern for kind in profile["types"] for pattern in RESOURCE_PATTERNS[kind]]
+        self.content_settings = {CONTENT_SETTING_PREFS[kind]: 2 for kind in profile["types"]
+                                 if kind in CONTENT_SETTING_PREFS}
+        for host in list(profile["hosts"]) + list(extra_hosts):
+            self.patterns += [f"*://{host}/*", f"*://*.{host}/*"]
+
+    @property
+    def enabled(self):
+        return bool(self.patterns)
+
+    def configure_options(self, options, content_settings=True):
+        """Chrome prefs and flags for a new session (content_settings=False for a full_render session)"""
+        if self.enabled:
+            prefs = dict(BLOCKING_PREFS)
+            if content_settings:
+                prefs.update(self.content_settings)
+            options.add_experimental_option("prefs", prefs)
+            for argument in BLOCKING_ARGUMENTS:
+                options.add_argument(argument)
+
+    def apply(self, driver, enabled=True):
+        """Turn blocking on (or off) for the current tab"""
+        try:
+            execute_cdp(driver, "Network.enable")
+            execute_cdp(driver, "Network.setBlockedURLs", {"urls": self.patterns if enabled else []})
+        except WebDriverException as e:
+            print(f"[BLOCKING] Could not set blocked URLs: {e.__class__.__name__}")
+
+
+class ResourceSizes:
+    """Transfer sizes of resources seen unblocked, used to estimate what blocking saved"""
+
+    def __init__(self, path=SIZES_FILE):
+        self.path = path
+        try:
+            with open(path) as f:
+                self.sizes = json.load(f)
+        except (OSError, ValueError):
+            self.sizes = {}
+        self.changed = False
+
+    @staticmethod
+    def key(url):
+        parts = urlsplit(url)
+        return f"{parts.netloc}{parts.path}"
+
+    def record(self, url, size):
+        key = self.key(url)
+        if size and self.sizes.get(key) != size:
+            self.sizes[key] = size
+            self.changed = True
+
+    def estimate(self, url):
+        return self.sizes.get(self.key(url))
+
+    def save(self):
+        if not self.changed:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.sizes, f)
+            os.replace(tmp, self.path)
+            self.changed = False
+        except OSError:
+            pass
+
+
+def enable_performance_log(options):
+    """Have Chrome keep the performance (network) log, next to any other log types already asked for"""
+    prefs = dict(options.to_capabilities().get("goog:loggingPrefs", {}))
+    prefs["performance"] = "ALL"
+    options.set_capability("goog:loggingPrefs", prefs)
+
+
+def drain_performance_log(driver):
+    """Read (and thereby clear) the browser's performance log, [] if unavailable"""
+    try:
+        return driver.get_log("performance")
+    except Exception:
+        return []
+
+
+def network_stats(entries, sizes):
+    """Summarize one test's network activity from performance log entries
+
+    Returns requests loaded, bytes transferred, requests blocked and the bytes
+    those blocked requests would have cost (as far as their size is known).
+    """
+    urls = {}
+    transferred = 0
+    blocked = []
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        method, params = message.get("method"), message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            urls[params.get("requestId")] = params.get("request", {}).get("url", "")
+        elif method == "Network.loadingFinished":
+            size = int(params.get("encodedDataLength") or 0)
+            transferred += size
+            url = urls.get(params.get("requestId"))
+            if url:
+                sizes.record(url, size)
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            blocked.append(urls.get(params.get("requestId"), ""))
+
+    known = [sizes.estimate(url) for url in blocked]
+    return {
+        "requests": len(urls) - len(blocked),
+        "bytes": transferred,
+        "blocked_requests": len(blocked),
+        "bytes_saved": sum(size for size in known if size),
+    }
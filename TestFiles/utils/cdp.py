@@ -0,0 +1,7 @@
+def execute_cdp(driver, cmd, params=None):
+    """Run a Chrome DevTools Protocol command on a local or remote Chrome session"""
+    if hasattr(driver, "execute_cdp_cmd"):
+        return driver.execute_cdp_cmd(cmd, params or {})
+    # webdriver.Remote with ChromeOptions uses ChromeRemoteConnection, which
+    # knows the goog/cdp/execute endpoint of the Selenium Grid node
+    return driver.execute("executeCdpCommand", {"cmd": cmd, "params": params or {}})["value"]
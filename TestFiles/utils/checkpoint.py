@@ -0,0 +1,95 @@
+from contextlib import contextmanager
+
+from selenium.common.exceptions import WebDriverException
+
+
+class CheckpointStore:
+    """Browser tabs holding a prepared page state, reused by later tests of one worker
+
+    The first test that needs a state builds it in a new tab of its pooled
+    session; the pool keeps that tab open across resets and later tests on the
+    same session switch to it instead of repeating the setup. After every test
+    the tab is checked again: if its fingerprint changed, it was closed or the
+    test opened new windows from it, the checkpoint is dropped and rebuilt on
+    next use. Without a pool (--fresh-sessions) the state is built every time.
+    """
+
+    def __init__(self, pool=None, on_new_tab=None):
+        self.pool = pool
+        self.on_new_tab = on_new_tab  # e.g. per-tab request blocking
+        self.tabs = {}  # (driver, name) -> (window handle, fingerprint)
+
+    @contextmanager
+    def use(self, driver, name, build, fingerprint):
+        """Run the body in a tab holding state `name`, built by `build()` if needed"""
+        if self.pool is None:
+            build()
+            yield
+            return
+
+        # Forget checkpoints of sessions the pool has already quit
+        self.tabs = {key: entry for key, entry in self.tabs.items() if key[0] in self.pool.protected}
+
+        main_window = driver.current_window_handle
+        key = (driver, name)
+        entry = self.tabs.get(key)
+        if entry and entry[0] not in self.pool.protected.get(driver, ()):
+            # The pool recycled this session or dropped the tab
+            entry = None
+
+        if entry is None:
+            driver.switch_to.new_window("tab")
+            tab = driver.current_window_handle
+            if self.on_new_tab:
+                self.on_new_tab(driver)
+            try:
+                build()
+            except Exception:
+                # A half-built state is never stored: close its tab and fail the test's setup
+                self._close_tab(driver, tab, main_window)
+                raise
+            entry = (driver.current_window_handle, fingerprint())
+            self.tabs[key] = entry
+            self.pool.protect(driver, entry[0])
+        else:
+            driver.switch_to.window(entry[0])
+            print(f"[CHECKPOINT] Reusing '{name}'")
+
+        windows_before = set(driver.window_handles)
+        try:
+            yield
+        finally:
+            if not self._still_valid(driver, entry, windows_before, fingerprint):
+                print(f"[CHECKPOINT] '{name}' was modified by the test, rebuilding on next use")
+                self._drop(driver, key)
+            try:
+                driver.switch_to.window(main_window)
+            except WebDriverException:
+                pass
+
+    def _still_valid(self, driver, entry, windows_before, fingerprint):
+        handle, expected = entry
+        try:
+            handles = set(driver.window_handles)
+            if handle not in handles or handles - windows_before:
+                return False
+            driver.switch_to.window(handle)
+            return fingerprint() == expected
+        except WebDriverException:
+            return False
+
+    def _drop(self, driver, key):
+        handle, _ = self.tabs.pop(key)
+        self.pool.unprotect(driver, handle)
+        self._close_tab(driver, handle)
+
+    @staticmethod
+    def _close_tab(driver, handle, switch_to=None):
+        try:
+            if handle in driver.window_handles and len(driver.window_handles) > 1:
+                driver.switch_to.window(handle)
+                driver.close()
+            if switch_to:
+                driver.switch_to.window(switch_to)
+        except WebDriverException:
+            pass
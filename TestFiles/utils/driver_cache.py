@@ -0,0 +1,67 @@
+import json
+import os
+import stat
+
+from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
+
+CACHE_FILE = os.path.join(
+    os.getenv('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'testops', 'chromedriver.json'
+)
+
+# Resolved once per pytest process (each xdist worker resolves on its own)
+_resolved = {}
+
+
+def _cache_key():
+    """Installed Chrome version + platform, e.g. 'linux64-120.0.6099.109'"""
+    os_manager = OperationSystemManager()
+    version = os_manager.get_browser_version_from_os(ChromeType.GOOGLE) or 'unknown'
+    return f"{os_manager.get_os_type()}-{version}"
+
+
+def _is_executable(path):
+    """Cheap validation of a cached path: a single stat call, no directory walk"""
+    try:
+        mode = os.stat(path).st_mode
+    except OSError:
+        return False
+    return stat.S_ISREG(mode) and bool(mode & stat.S_IXUSR)
+
+
+def _load_cache():
+    try:
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _store_cache(key, path):
+    cache = _load_cache()
+    cache[key] = path
+    os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+    # Parallel workers may resolve at the same time, so write atomically
+    tmp_file = f"{CACHE_FILE}.{os.getpid()}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_file, CACHE_FILE)
+
+
+def resolve_chromedriver(resolver):
+    """Return the chromedriver executable path for the installed Chrome
+
+    `resolver` does the expensive work (download + directory search) and is only
+    called when neither this process nor the on-disk cache knows a valid path.
+    """
+    if 'path' in _resolved:
+        return _resolved['path']
+
+    key = _cache_key()
+    path = _load_cache().get(key)
+    if not path or not _is_executable(path):
+        path = resolver()
+        if path:
+            _store_cache(key, path)
+
+    _resolved['path'] = path
+    return path
@@ -0,0 +1,56 @@
+import os
+import sys
+
+# Paths in the map are relative to the suite root (the directory of conftest.py)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES_DIR = os.path.join(ROOT, "pages")
+
+
+class ImpactRecorder:
+    """Records which page object modules and classes each test touches
+
+    BasePage reports every page object it constructs; the recorder files its
+    module and classes under the running test. The resulting map
+    ({nodeid: {"modules": [...], "classes": [...]}}) is handed to deploy.py,
+    which selects tests impacted by a git diff down to the changed classes.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.current = None
+        self.tests = {}
+
+    def start_test(self, nodeid):
+        if not self.enabled:
+            return
+        module = nodeid.split("::")[0]
+        self.current = {"modules": {module}, "classes": set()}
+        self.tests[nodeid] = self.current
+
+    def finish_test(self):
+        self.current = None
+
+    def touch_page(self, page):
+        """A page object was constructed: record its module and classes (up to BasePage)"""
+        if self.current is None:
+            return
+        for cls in type(page).__mro__:
+            path = getattr(sys.modules.get(cls.__module__), "__file__", None)
+            if not path or not os.path.abspath(path).startswith(PAGES_DIR + os.sep):
+                continue
+            self.current["modules"].add(os.path.relpath(os.path.abspath(path), ROOT).replace(os.sep, "/"))
+            self.current["classes"].add(f"{cls.__module__}.{cls.__qualname__}")
+
+    def merge(self, tests):
+        """Map recorded by an xdist worker"""
+        self.tests.update(tests)
+
+    def export(self):
+        """JSON-ready map of the tests recorded in this process"""
+        return {
+            nodeid: {kind: sorted(values) for kind, values in entry.items()}
+            for nodeid, entry in self.tests.items()
+        }
+
+
+IMPACT = ImpactRecorder()
@@ -0,0 +1,118 @@
+import json
+import os
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+CACHE_FILE = os.path.join(
+    os.getenv('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'testops', 'locators.json'
+)
+
+
+class Locator:
+    """One logical element with ordered alternative (By, value) strategies
+
+    Declare the most robust strategy first (id, CSS, text) and keep the old
+    absolute XPath last as a fallback. The registry reorders them at run time.
+    """
+
+    def __init__(self, name, *alternatives):
+        self.name = name
+        self.alternatives = list(alternatives)
+
+    def __str__(self):
+        return self.name
+
+    def __repr__(self):
+        return f"Locator({self.name!r})"
+
+
+def strategy_key(alternative):
+    return f"{alternative[0]}={alternative[1]}"
+
+
+class LocatorRegistry:
+    """Remembers which strategy of each Locator last matched, and how fast
+
+    Every poll of a wait probes all alternatives once (find_elements never
+    blocks), so a stale strategy costs one round trip instead of a whole
+    timeout. The last winner is tried first, the others by their last probe
+    time; the state is kept in ~/.cache/testops/locators.json across runs.
+    """
+
+    def __init__(self, path=CACHE_FILE):
+        self.path = path
+        self.entries = self._load()  # name -> {"winner": key, "seconds": {key: seconds}}
+        self.changed = set()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def order(self, locator):
+        """Alternatives in the order they should be probed"""
+        entry = self.entries.get(locator.name, {})
+        winner, seconds = entry.get("winner"), entry.get("seconds", {})
+        declared = {strategy_key(alt): i for i, alt in enumerate(locator.alternatives)}
+        return sorted(
+            locator.alternatives,
+            key=lambda alt: (strategy_key(alt) != winner, seconds.get(strategy_key(alt), float("inf")),
+                             declared[strategy_key(alt)]),
+        )
+
+    def probe(self, driver, locator, clickable=False):
+        """First matching element across the alternatives, or False (usable as a wait condition)"""
+        for alternative in self.order(locator):
+            start = time.perf_counter()
+            try:
+                elements = driver.find_elements(*alternative)
+                element = elements[0] if elements else None
+                if element is not None and clickable and not (element.is_displayed() and element.is_enabled()):
+                    element = None
+            except WebDriverException:  # e.g. stale element between find and is_displayed
+                element = None
+            if element is not None:
+                self.succeeded(locator, alternative, time.perf_counter() - start)
+                return element
+        return False
+
+    def find_all(self, driver, locator):
+        """All elements matched by the first alternative that matches any"""
+        for alternative in self.order(locator):
+            elements = driver.find_elements(*alternative)
+            if elements:
+                return elements
+        return []
+
+    def succeeded(self, locator, alternative, seconds):
+        key = strategy_key(alternative)
+        entry = self.entries.setdefault(locator.name, {"winner": None, "seconds": {}})
+        if entry["winner"] != key:
+            if entry["winner"] is not None:
+                print(f"[LOCATOR] {locator.name} now resolves via {key}")
+            entry["winner"] = key
+        entry["seconds"][key] = round(seconds, 4)
+        self.changed.add(locator.name)
+
+    def save(self):
+        """Write the entries this process changed, on top of what other workers saved"""
+        if not self.changed:
+            return
+        try:
+            merged = self._load()
+            for name in self.changed:
+                merged[name] = self.entries[name]
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(merged, f, indent=2)
+            os.replace(tmp, self.path)
+            self.changed.clear()
+        except OSError:
+            pass
+
+
+LOCATORS = LocatorRegistry()
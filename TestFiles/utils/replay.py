@@ -0,0 +1,244 @@
+import base64
+import glob
+import gzip
+import json
+import os
+import socket
+import ssl
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+from utils.cdp import execute_cdp
+
+CERT_DIR = os.path.join(os.getenv('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'testops')
+
+# Headers that describe the original transfer, not the (decoded) body we serve
+SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive",
+                   "alt-svc", "strict-transport-security"}
+
+
+def _messages(entries):
+    for entry in entries:
+        try:
+            yield json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+
+
+def _without_query(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+class ArchiveRecorder:
+    """Capture the HTTP responses a browser fetched into a gzipped JSON Lines archive
+
+    Responses are taken from the performance log of each test and their bodies
+    fetched with Network.getResponseBody before the pooled session is reset.
+    Every pytest process (xdist worker) writes its own part file; a replay
+    loads all parts of the directory. The first response per method + URL wins,
+    so recording again into the same directory only adds what was missing.
+    """
+
+    def __init__(self, directory, name):
+        self.path = os.path.join(directory, f"{name}.jsonl.gz")
+        self.entries = {}
+        self.missed = 0
+        if os.path.exists(self.path):
+            with gzip.open(self.path, "rt") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self.entries[(entry["method"], entry["url"])] = entry
+        self.loaded = len(self.entries)
+
+    def record(self, driver, log_entries):
+        requests, responses, finished = {}, {}, []
+        for message in _messages(log_entries):
+            method, params = message.get("method"), message.get("params", {})
+            request_id = params.get("requestId")
+            if method == "Network.requestWillBeSent":
+                request = params.get("request", {})
+                redirect = params.get("redirectResponse")
+                if redirect and request_id in requests:
+                    # Redirect hop: stored without a body, the Location header is enough
+                    self._store(requests[request_id], redirect, b"")
+                requests[request_id] = (request.get("method", "GET"), request.get("url", ""))
+            elif method == "Network.responseReceived":
+                responses[request_id] = params.get("response", {})
+            elif method == "Network.loadingFinished":
+                finished.append(request_id)
+
+        for request_id in finished:
+            key = requests.get(request_id)
+            if key is None or request_id not in responses or key in self.entries:
+                continue
+            if not key[1].startswith(("http://", "https://")):
+                continue
+            try:
+                result = execute_cdp(driver, "Network.getResponseBody", {"requestId": request_id})
+            except WebDriverException:
+                # Body already evicted from the browser's buffer (e.g. after a navigation)
+                self.missed += 1
+                continue
+            body = result.get("body", "")
+            body = base64.b64decode(body) if result.get("base64Encoded") else body.encode("utf-8")
+            self._store(key, responses[request_id], body)
+
+    def _store(self, key, response, body):
+        if key in self.entries:
+            return
+        method, url = key
+        self.entries[key] = {
+            "method": method,
+            "url": url,
+            "status": response.get("status", 200),
+            "headers": response.get("headers", {}),
+            "body": base64.b64encode(body).decode("ascii"),
+        }
+
+    def save(self):
+        if not self.entries:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with gzip.open(self.path, "wt") as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def summary(self):
+        return (f"recorded {len(self.entries) - self.loaded} new responses to {self.path} "
+                f"({len(self.entries)} total, {self.missed} bodies no longer available)")
+
+
+def archive_parts(directory):
+    """Part files of a recorded archive directory (raises FileNotFoundError if there are none)"""
+    paths = sorted(glob.glob(os.path.join(directory, "*.jsonl.gz")))
+    if not paths:
+        raise FileNotFoundError(f"No recorded archive (*.jsonl.gz) in {directory}")
+    return paths
+
+
+class ReplayArchive:
+    """Recorded responses looked up by method + URL (falling back to the URL without query)"""
+
+    def __init__(self, directory):
+        self.exact = {}
+        self.loose = {}
+        for path in archive_parts(directory):
+            with gzip.open(path, "rt") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self.exact.setdefault((entry["method"], entry["url"]), entry)
+                    self.loose.setdefault((entry["method"], _without_query(entry["url"])), entry)
+
+    def lookup(self, method, url):
+        return self.exact.get((method, url)) or self.loose.get((method, _without_query(url)))
+
+
+def ensure_certificate(directory=CERT_DIR):
+    """Self-signed certificate for TLS interception, created once with the openssl CLI
+
+    The browser is started with --ignore-certificate-errors in replay mode, so a
+    single certificate serves every host.
+    """
+    cert = os.path.join(directory, "replay-cert.pem")
+    key = os.path.join(directory, "replay-key.pem")
+    if not (os.path.exists(cert) and os.path.exists(key)):
+        os.makedirs(directory, exist_ok=True)
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "3650",
+             "-subj", "/CN=testops-replay", "-keyout", key, "-out", cert],
+            check=True, capture_output=True,
+        )
+    return cert, key
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    tunnel = None  # "host:port" after CONNECT
+
+    def log_message(self, *args):
+        pass
+
+    def do_CONNECT(self):
+        # Terminate TLS ourselves and keep reading requests inside the tunnel
+        self.send_response(200, "Connection Established")
+        self.end_headers()
+        self.wfile.flush()
+        self.connection = self.server.ssl_context.wrap_socket(self.connection, server_side=True)
+        self.rfile = self.connection.makefile("rb")
+        self.wfile = self.connection.makefile("wb")
+        self.tunnel = self.path
+        self.close_connection = False
+
+    def serve(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        if self.tunnel:
+            host, _, port = self.tunnel.partition(":")
+            netloc = host if port in ("", "443") else self.tunnel
+            url = f"https://{netloc}{self.path}"
+        else:
+            url = self.path  # plain HTTP proxy request with an absolute URL
+
+        entry = self.server.archive.lookup(self.command, url)
+        self.server.count("served" if entry else "missed")
+        if entry is None:
+            body = f"not in replay archive: {self.command} {url}".encode()
+            self.send_response(404)
+            self.send_header("Content-Type", "text/plain")
+        else:
+            body = base64.b64decode(entry["body"])
+            self.send_response(entry["status"])
+            for name, value in entry["headers"].items():
+                if name.lower() not in SKIPPED_HEADERS:
+                    for line in str(value).split("\n"):
+                        self.send_header(name, line)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = do_HEAD = serve
+
+
+class ReplayProxy(ThreadingHTTPServer):
+    """HTTP(S) proxy that answers every browser request from a ReplayArchive"""
+
+    daemon_threads = True
+
+    def __init__(self, archive, advertise_host="127.0.0.1"):
+        super().__init__(("0.0.0.0", 0), ReplayHandler)
+        self.archive = archive
+        self.advertise_host = advertise_host
+        cert, key = ensure_certificate()
+        self.ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.ssl_context.load_cert_chain(cert, key)
+        self.stats = {"served": 0, "missed": 0}
+        self.lock = threading.Lock()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def address(self):
+        return f"{self.advertise_host}:{self.server_address[1]}"
+
+    def count(self, outcome):
+        with self.lock:
+            self.stats[outcome] += 1
+
+    def configure_options(self, options):
+        """Route a new browser session through this proxy"""
+        options.add_argument(f"--proxy-server=http://{self.address}")
+        options.add_argument("--ignore-certificate-errors")
+
+    def summary(self):
+        return f"replayed {self.stats['served']} responses, {self.stats['missed']} not in archive"
+
+
+def pod_address():
+    """Address a remote Chrome Node can use to reach this process (REPLAY_PROXY_HOST overrides)"""
+    return os.getenv("REPLAY_PROXY_HOST") or socket.gethostbyname(socket.gethostname())
@@ -0,0 +1,77 @@
+import json
+import time
+
+# user_properties copied into the record (set by the driver fixture)
+RECORDED_PROPERTIES = ("node", "worker", "requests", "bytes", "blocked_requests", "bytes_saved", "slowest_action")
+
+# Result lines on the controller's stdout start with this prefix so that
+# deploy.py can pick them out of the log stream without parsing pytest output
+RESULT_PREFIX = "##testops-result "
+
+
+class ResultsRecorder:
+    """Pytest plugin that emits one JSON record per finished test
+
+    Records are written as soon as a test's teardown is reported, to stdout
+    (prefixed with RESULT_PREFIX) and/or to a JSON Lines file. With xdist the
+    plugin runs in the controller process only and sees every worker's reports.
+    """
+
+    def __init__(self, config, stream=True, path=None, session_records=()):
+        self.config = config
+        # Callables returning extra records for deploy.py (or None), emitted before session_finish
+        self.session_records = session_records
+        self.stream = stream
+        self.file = open(path, "a") if path else None
+        self.pending = {}
+        self.start = time.time()
+
+    def emit(self, record):
+        line = json.dumps(record, separators=(",", ":"))
+        # The terminal reporter may be registered after this plugin, so look it up on use
+        terminal = self.config.pluginmanager.get_plugin("terminalreporter")
+        if self.stream and terminal is not None:
+            terminal.write_line(RESULT_PREFIX + line)
+        if self.file:
+            self.file.write(line + "\n")
+            self.file.flush()
+
+    def pytest_runtest_logreport(self, report):
+        record = self.pending.setdefault(report.nodeid, {
+            "event": "test",
+            "test": report.nodeid,
+            "outcome": "passed",
+            "duration": 0.0,
+            "node": None,
+            "worker": None,
+            "message": None,
+        })
+        record["duration"] += report.duration
+        for name, value in report.user_properties:
+            if name in RECORDED_PROPERTIES:
+                record[name] = value
+
+        if report.failed:
+            record["outcome"] = "failed" if report.when == "call" else "error"
+            crash = getattr(report.longrepr, "reprcrash", None)
+            message = getattr(crash, "message", None) or str(report.longrepr).strip().splitlines()[-1:]
+            record["message"] = (message if isinstance(message, str) else "".join(message))[:500]
+        elif report.skipped and record["outcome"] == "passed":
+            record["outcome"] = "skipped"
+
+        if report.when == "teardown":
+            record["duration"] = round(record["duration"], 3)
+            self.emit(self.pending.pop(report.nodeid))
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        for make_record in self.session_records:
+            record = make_record()
+            if record:
+                self.emit(record)
+        self.emit({
+            "event": "session_finish",
+            "exitstatus": int(exitstatus),
+            "duration": round(time.time() - self.start, 3),
+        })
+        if self.file:
+            self.file.close()
@@ -0,0 +1,141 @@
+import time
+from collections import deque
+
+from xdist.scheduler import LoadScheduling
+
+from utils.sharding import duration_estimates, lpt_plan
+
+
+class DurationScheduling(LoadScheduling):
+    """xdist scheduler that balances workers by historical test durations
+
+    The collection is planned longest processing time first (lpt_plan on the
+    median of each test's passed runs) into one queue per worker. A worker is
+    kept two tests deep (an xdist worker only starts a test once it knows the
+    next one, or is shut down). When its own queue is empty it steals the
+    shortest queued test of the worker with the most predicted work left if
+    it would finish that test sooner, so a wrong estimate does not leave it
+    idle; otherwise it is shut down. Predicted and actual makespan are kept
+    for the summary.
+    """
+
+    def __init__(self, config, log=None, history=None):
+        super().__init__(config, log)
+        self.history = history or {}
+        self.estimates = {}
+        self.node2queue = {}
+        self.predicted = {}  # worker id -> predicted busy seconds
+        self.actual = {}  # worker id -> seconds from the start until its last test finished
+        self.test_started = {}  # node -> when its running test started
+        self.started = None
+
+    @property
+    def tests_finished(self):
+        return super().tests_finished and not any(self.node2queue.values())
+
+    @property
+    def has_pending(self):
+        return super().has_pending or any(self.node2queue.values())
+
+    def add_node(self, node):
+        super().add_node(node)
+        self.node2queue[node] = deque()
+
+    def remove_node(self, node):
+        # Tests still planned for a crashed worker go back to the shared pending list
+        self.pending.extend(self.node2queue.pop(node, ()))
+        self.pending.sort(key=self._longest_first)
+        return super().remove_node(node)
+
+    def mark_test_complete(self, node, item_index, duration=0):
+        self.test_started[node] = time.monotonic()
+        self.actual[node.gateway.id] = self.test_started[node] - self.started
+        super().mark_test_complete(node, item_index, duration)
+
+    def _longest_first(self, index):
+        return -self._estimate(index), self.collection[index]
+
+    def _estimate(self, index):
+        return self.estimates.get(self.collection[index], 0.0)
+
+    def _remaining(self, node):
+        """Predicted seconds until `node` has run everything sent or planned for it"""
+        pending = self.node2pending[node]
+        seconds = sum(self._estimate(index) for index in [*pending, *self.node2queue.get(node, ())])
+        if pending:
+            # The first pending test is running
+            elapsed = time.monotonic() - self.test_started.get(node, self.started)
+            seconds -= min(self._estimate(pending[0]), elapsed)
+        return seconds
+
+    def schedule(self):
+        assert self.collection_is_completed
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = list(self.node2collection.values())[0]
+        if not self.collection:
+            return
+        self.estimates = duration_estimates(self.collection, self.history)
+        position = {nodeid: index for index, nodeid in enumerate(self.collection)}
+        nodes = sorted(self.nodes, key=lambda node: node.gateway.id)
+        for node, (load, nodeids) in zip(nodes, lpt_plan(self.estimates, len(nodes))):
+            self.node2queue[node].extend(position[nodeid] for nodeid in nodeids)
+            self.predicted[node.gateway.id] = load
+        self.started = time.monotonic()
+        # Every worker first gets its own plan, so no start-up steal takes a test another worker was given
+        for node in nodes:
+            while len(self.node2pending[node]) < 2 and self.node2queue[node]:
+                self._send(node, self.node2queue[node].popleft())
+        for node in nodes:
+            self.check_schedule(node)
+
+    def check_schedule(self, node, duration=0):
+        if node.shutting_down:
+            return
+        while len(self.node2pending[node]) < 2:
+            index = self._next_test(node)
+            if index is None:
+                # Nothing left for this worker: it finishes what it has and exits
+                node.shutdown()
+                return
+            self._send(node, index)
+
+    def _send(self, node, index):
+        self.node2pending[node].append(index)
+        node.send_runtest_some([index])
+
+    def _next_test(self, node):
+        """Next test for `node`: its own queue, then re-queued tests, then the busiest worker's shortest"""
+        if self.node2queue.get(node):
+            return self.node2queue[node].popleft()
+        if self.pending:
+            return self.pending.pop(0)
+        victims = [other for other, queue in self.node2queue.items() if queue and other is not node]
+        if not victims:
+            return None
+        victim = max(victims, key=self._remaining)
+        if self._remaining(node) + self._estimate(self.node2queue[victim][-1]) > self._remaining(victim):
+            return None
+        return self.node2queue[victim].pop()
+
+    def summary_lines(self, test_time):
+        """Predicted vs actual makespan, per worker; `test_time` is the summed duration of all tests"""
+        if self.started is None or not self.predicted:
+            return []
+        known = sum(1 for nodeid in self.collection if self.history.get(nodeid))
+        workers = len(self.predicted)
+        lines = [
+            f"makespan predicted {max(self.predicted.values()):.1f}s, actual {max(self.actual.values(), default=0.0):.1f}s, "
+            f"ideal {test_time / workers:.1f}s ({test_time:.1f}s test time / {workers} workers, "
+            f"{known}/{len(self.collection)} tests with history)"
+        ]
+        for worker in sorted(self.predicted):
+            lines.append(f"{worker}: predicted {self.predicted[worker]:7.1f}s, "
+                         f"finished after {self.actual.get(worker, 0.0):7.1f}s")
+        return lines
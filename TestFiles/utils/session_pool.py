@@ -0,0 +1,115 @@
+import time
+from collections import deque
+
+from selenium.common.exceptions import WebDriverException
+
+from utils.cdp import execute_cdp
+
+
+class SessionPool:
+    """Pool of started WebDriver sessions reused across tests of one worker
+
+    Sessions are reset between tests (extra windows, cookies, storage, URL) and
+    recycled after `max_uses` tests, after `max_idle` seconds without use (the
+    grid drops idle sessions after SE_NODE_SESSION_TIMEOUT) or when the reset
+    itself fails, which means the browser crashed or the session is gone.
+    Protected windows (checkpoint tabs) survive the reset.
+    """
+
+    def __init__(self, factory, size=1, max_uses=20, max_idle=240):
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.max_idle = max_idle
+        self.idle = deque()
+        self.uses = {}
+        self.last_used = {}
+        self.in_use = set()
+        self.protected = {}  # driver -> window handles kept open across resets
+
+    def start(self):
+        """Start `size` sessions up front so the first tests get a warm browser"""
+        while len(self.idle) < self.size:
+            self.idle.append(self._create())
+
+    def acquire(self):
+        """Hand out an idle session, starting a new one if none is available"""
+        while self.idle:
+            driver = self.idle.popleft()
+            if time.monotonic() - self.last_used[driver] < self.max_idle:
+                break
+            self._discard(driver)
+        else:
+            driver = self._create()
+        self.in_use.add(driver)
+        return driver
+
+    def release(self, driver, discard=False):
+        """Return a session to the pool, resetting or recycling it"""
+        self.in_use.discard(driver)
+        self.uses[driver] += 1
+        if discard or self.uses[driver] >= self.max_uses or not self._reset(driver):
+            self._discard(driver)
+            return
+        self.last_used[driver] = time.monotonic()
+        if len(self.idle) < self.size:
+            self.idle.append(driver)
+        else:
+            self._discard(driver)
+
+    def protect(self, driver, handle):
+        """Keep `handle` open (and untouched) when the session is reset"""
+        self.protected.setdefault(driver, set()).add(handle)
+
+    def unprotect(self, driver, handle):
+        self.protected.get(driver, set()).discard(handle)
+
+    def close(self):
+        """Quit every session owned by the pool"""
+        for driver in list(self.idle) + list(self.in_use):
+            self._discard(driver)
+        self.idle.clear()
+        self.in_use.clear()
+
+    def _create(self):
+        driver = self.factory()
+        self.uses[driver] = 0
+        self.last_used[driver] = time.monotonic()
+        return driver
+
+    def _discard(self, driver):
+        self.uses.pop(driver, None)
+        self.last_used.pop(driver, None)
+        self.protected.pop(driver, None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _reset(self, driver):
+        """Bring a session back to a blank state, returns False if it is unusable"""
+        try:
+            # Close windows opened by the test (e.g. View Role opens Lever in a new tab)
+            protected = self.protected.get(driver, set())
+            handles = [handle for handle in driver.window_handles if handle not in protected]
+            if not handles:
+                driver.switch_to.new_window("tab")
+                handles = [driver.current_window_handle]
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+
+            # Storage is per origin, so clear it before leaving the current page
+            driver.execute_script(
+                "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+            )
+            try:
+                execute_cdp(driver, "Network.clearBrowserCookies")
+            except WebDriverException:
+                driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except WebDriverException as e:
+            print(f"[POOL] Session reset failed, recycling: {e.__class__.__name__}")
+            return False
@@ -0,0 +1,72 @@
+import heapq
+import os
+import statistics
+
+# Estimate of a test without history when no test has any
+DEFAULT_ESTIMATE = 30.0
+
+
+def get_shard():
+    """Return (index, count) of the shard this pytest process runs
+
+    In an Indexed Job Kubernetes sets JOB_COMPLETION_INDEX for every pod and
+    deploy.py sets TEST_SHARD_COUNT; TEST_SHARD_INDEX overrides the index for
+    local runs. Without them the whole suite is a single shard.
+    """
+    count = max(1, int(os.getenv('TEST_SHARD_COUNT', '1') or 1))
+    index = int(os.getenv('TEST_SHARD_INDEX') or os.getenv('JOB_COMPLETION_INDEX') or 0)
+    return index % count, count
+
+
+def duration_estimates(nodeids, history):
+    """Expected duration of each test: median of its passed runs in `history` ({nodeid: [s, ...]})
+
+    Tests without history get the median estimate of the others, or
+    DEFAULT_ESTIMATE when no test has any.
+    """
+    known = {nodeid: statistics.median(history[nodeid]) for nodeid in nodeids if history.get(nodeid)}
+    default = statistics.median(known.values()) if known else DEFAULT_ESTIMATE
+    return {nodeid: known.get(nodeid, default) for nodeid in nodeids}
+
+
+def lpt_plan(estimates, count):
+    """Longest processing time first: each test, longest first, goes to the least loaded of `count` bins
+
+    Returns [(predicted load, [nodeid, ...]), ...]. Ties are broken by node id
+    and bin index, so every process computes the same plan and equal
+    estimates give a round-robin split.
+    """
+    loads, bins = [0.0] * count, [[] for _ in range(count)]
+    heap = [(0.0, index) for index in range(count)]
+    for nodeid in sorted(estimates, key=lambda nodeid: (-estimates[nodeid], nodeid)):
+        load, index = heapq.heappop(heap)
+        loads[index] = load + estimates[nodeid]
+        bins[index].append(nodeid)
+        heapq.heappush(heap, (loads[index], index))
+    return list(zip(loads, bins))
+
+
+def split_shard(items, index, count, estimates=None):
+    """Split collected items into (selected, deselected) for shard `index` of `count`
+
+    Items are assigned by lpt_plan on their estimated durations (all equal
+    without `estimates`), so every pod (and every xdist worker inside it)
+    computes the same disjoint partition with balanced predicted load.
+    """
+    if count <= 1:
+        return list(items), []
+    estimates = estimates or dict.fromkeys((item.nodeid for item in items), DEFAULT_ESTIMATE)
+    shard = set(lpt_plan({item.nodeid: estimates[item.nodeid] for item in items}, count)[index][1])
+    selected, deselected = [], []
+    for item in items:
+        (selected if item.nodeid in shard else deselected).append(item)
+    return selected, deselected
+
+
+def shard_endpoints(endpoints, index, count):
+    """Chrome Node endpoints reserved for one shard, so shards never share a browser"""
+    if count <= 1 or not endpoints:
+        return endpoints
+    if len(endpoints) < count:
+        return [endpoints[index % len(endpoints)]]
+    return endpoints[index::count]
@@ -0,0 +1,124 @@
+import json
+import math
+import os
+
+HISTORY_FILE = os.path.join(
+    os.getenv('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'testops', 'timeouts.json'
+)
+
+# Samples kept per wait site / test, and needed before history replaces a default
+KEEP_SAMPLES = 30
+MIN_SAMPLES = 5
+MIN_WAIT_TIMEOUT = 1.0
+MAX_WAIT_TIMEOUT = 60.0
+MIN_TEST_DEADLINE = 15.0
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list, None when empty
+
+    Also used by deploy.py and report_index.py, so keep this module free of
+    third-party imports.
+    """
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def p99(values):
+    """Nearest-rank 99th percentile"""
+    return percentile(sorted(values), 0.99)
+
+
+def merge_samples(base, update, keep=KEEP_SAMPLES):
+    """Append `update` samples ({"sites": {key: [s, ...]}, "tests": {...}}) to `base`, keeping the newest"""
+    for kind in ("sites", "tests"):
+        target = base.setdefault(kind, {})
+        for key, values in update.get(kind, {}).items():
+            merged = target.get(key, []) + list(values)
+            target[key] = merged[-keep:] if keep else merged
+    return base
+
+
+class TimeoutHistory:
+    """Observed durations of successful waits (per call site) and passed tests
+
+    Timeouts are p99 of the history times a safety factor; with fewer than
+    MIN_SAMPLES the hardcoded default is kept. History comes from the cache
+    file plus TIMEOUT_HISTORY_JSON (set by deploy.py for controller pods).
+    New samples are collected in `new` and saved by one process at the end.
+    Until configure() is called every default is kept.
+    """
+
+    def __init__(self):
+        self.path = HISTORY_FILE
+        self.factor = 3.0
+        self.enabled = False
+        self.samples = {"sites": {}, "tests": {}}
+        self.new = {"sites": {}, "tests": {}}
+
+    def configure(self, path=HISTORY_FILE, factor=3.0, enabled=True):
+        self.path = path
+        self.factor = factor
+        self.enabled = enabled
+        self.samples = self._load()
+        seed = os.getenv('TIMEOUT_HISTORY_JSON')
+        if seed:
+            try:
+                merge_samples(self.samples, json.loads(seed))
+            except ValueError:
+                pass
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"sites": {}, "tests": {}}
+
+    def _derived(self, kind, key):
+        values = self.samples.get(kind, {}).get(key, [])
+        if not self.enabled or len(values) < MIN_SAMPLES:
+            return None
+        return p99(values) * self.factor
+
+    def wait_timeout(self, site, default):
+        """Timeout of one wait at `site` (default until enough history exists)"""
+        derived = self._derived("sites", site)
+        if derived is None:
+            return default
+        return min(MAX_WAIT_TIMEOUT, max(MIN_WAIT_TIMEOUT, derived))
+
+    def test_deadline(self, nodeid, default):
+        """Wall-clock budget of one test (default until enough history exists)"""
+        derived = self._derived("tests", nodeid)
+        if derived is None:
+            return default
+        return max(MIN_TEST_DEADLINE, derived)
+
+    def record(self, kind, key, seconds):
+        self.new[kind].setdefault(key, []).append(round(seconds, 3))
+
+    def add(self, samples):
+        """Samples collected by an xdist worker"""
+        merge_samples(self.new, samples, keep=None)
+
+    def has_new(self):
+        return any(self.new[kind] for kind in self.new)
+
+    def save(self):
+        if not self.has_new():
+            return
+        try:
+            history = merge_samples(self._load(), self.new)
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(history, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+
+TIMEOUTS = TimeoutHistory()
@@ -0,0 +1,115 @@
+import json
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+# Returned by span() while tracing is off: entering it costs next to nothing
+NO_SPAN = nullcontext()
+
+
+def describe(locator):
+    """Readable form of a (By, value) locator, e.g. 'xpath=//*[@id='jobs-list']/div/div'"""
+    if isinstance(locator, tuple) and len(locator) == 2:
+        return f"{locator[0]}={str(locator[1]).strip()}"
+    return str(locator)
+
+
+class Tracer:
+    """Spans of page object actions (action, target, duration, outcome)
+
+    Spans are aggregated per (action, target) for the whole run and per test,
+    and kept as Chrome trace events ("X" complete events) that chrome://tracing
+    or ui.perfetto.dev can open. Each pytest process is one trace process.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.pid = 0
+        self.events = []
+        self.stats = defaultdict(lambda: [0, 0.0, 0.0, 0])  # (action, target) -> calls, seconds, max, failures
+        self.test = None
+        self.test_slowest = None
+
+    def start(self, process="main"):
+        """Enable tracing in this process; xdist worker gwN becomes trace process N + 1"""
+        self.enabled = True
+        self.pid = int(process[2:]) + 1 if process.startswith("gw") else 0
+        self.events.append({"name": "process_name", "ph": "M", "pid": self.pid, "args": {"name": process}})
+
+    def span(self, action, target=""):
+        """Context manager timing one action; a shared no-op while tracing is off"""
+        if not self.enabled:
+            return NO_SPAN
+        return self._span(action, target)
+
+    @contextmanager
+    def _span(self, action, target):
+        wall = time.time()
+        start = time.perf_counter()
+        outcome = "ok"
+        try:
+            yield
+        except BaseException as e:
+            outcome = e.__class__.__name__
+            raise
+        finally:
+            self.record(action, target, wall, time.perf_counter() - start, outcome)
+
+    def record(self, action, target, wall, seconds, outcome):
+        self.events.append({
+            "name": f"{action} {target}".strip(),
+            "cat": action,
+            "ph": "X",
+            "ts": int(wall * 1e6),
+            "dur": int(seconds * 1e6),
+            "pid": self.pid,
+            "tid": self.pid,
+            "args": {"target": target, "outcome": outcome, "test": self.test},
+        })
+        if action == "test":
+            return
+        stats = self.stats[(action, target)]
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] = max(stats[2], seconds)
+        stats[3] += outcome != "ok"
+        if self.test is not None and (self.test_slowest is None or seconds > self.test_slowest[2]):
+            self.test_slowest = (action, target, seconds)
+
+    @contextmanager
+    def test_span(self, nodeid):
+        """Span of a whole test; yields a callable returning its slowest action"""
+        self.test, self.test_slowest = nodeid, None
+        try:
+            with self.span("test", nodeid):
+                yield lambda: self.test_slowest
+        finally:
+            self.test = None
+
+    def merge(self, events, stats):
+        """Add the events and stats handed over by an xdist worker"""
+        self.events.extend(events)
+        for key, (calls, seconds, longest, failures) in stats:
+            total = self.stats[tuple(key)]
+            total[0] += calls
+            total[1] += seconds
+            total[2] = max(total[2], longest)
+            total[3] += failures
+
+    def export(self):
+        """Events and stats in a form that survives xdist's workeroutput"""
+        return self.events, [[list(key), value] for key, value in self.stats.items()]
+
+    def slowest(self, top=10):
+        """(action, target, calls, seconds, max, failures) by total time, longest first"""
+        rows = [(key[0], key[1], *value) for key, value in self.stats.items()]
+        return sorted(rows, key=lambda row: -row[3])[:top]
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+
+
+TRACER = Tracer()
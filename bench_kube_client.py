@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Kubernetes backend benchmark
+deploy.py'nin kubectl (process başına bir çağrı) ve api (kalıcı bağlantı havuzu)
+backend'lerini yerel sahte bir API server'a karşı aynı işlemlerle ölçer.
+
+    python3 bench_kube_client.py --iterations 50
+
+Karşılaştırma için kubectl PATH'te olmalı; yoksa betik hata verir. Yalnızca api
+backend'i ölçmek için `--api-only` kullanın (kubectl ölçümü atlandığı yazdırılır).
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import yaml
+
+from kube_client import ApiBackend, KubectlBackend
+
+NAMESPACE = 'test-automation'
+
+API_RESOURCES = {
+    '/api/v1': [
+        {"name": "configmaps", "namespaced": True, "kind": "ConfigMap", "verbs": ["get", "patch", "watch"]},
+        {"name": "endpoints", "namespaced": True, "kind": "Endpoints", "verbs": ["get", "watch"]},
+        {"name": "pods", "namespaced": True, "kind": "Pod", "verbs": ["get", "watch"]},
+        {"name": "namespaces", "namespaced": False, "kind": "Namespace", "verbs": ["get", "delete"]},
+    ],
+    '/apis/apps/v1': [
+        {"name": "deployments", "namespaced": True, "kind": "Deployment", "verbs": ["get", "patch", "watch"]},
+        {"name": "deployments/scale", "namespaced": True, "kind": "Scale", "group": "autoscaling",
+         "version": "v1", "verbs": ["get", "patch"]},
+    ],
+}
+
+
+def merge(target, patch):
+    """JSON merge patch (RFC 7386)"""
+    for key, value in patch.items():
+        if value is None:
+            target.pop(key, None)
+        elif isinstance(value, dict) and isinstance(target.get(key), dict):
+            merge(target[key], value)
+        else:
+            target[key] = value
+    return target
+
+
+class FakeApiServer(ThreadingHTTPServer):
+    """deploy.py'nin kullandığı kadarını konuşan bellek içi API server"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), FakeApiHandler)
+        base = f"/namespaces/{NAMESPACE}"
+        self.objects = {
+            f"/api/v1{base}/configmaps/test-automation-config": {
+                "apiVersion": "v1", "kind": "ConfigMap",
+                "metadata": {"name": "test-automation-config", "namespace": NAMESPACE},
+                "data": {"node_count": "2"},
+            },
+            f"/apis/apps/v1{base}/deployments/chrome-node": {
+                "apiVersion": "apps/v1", "kind": "Deployment",
+                "metadata": {"name": "chrome-node", "namespace": NAMESPACE},
+                "spec": {"replicas": 2}, "status": {"replicas": 2, "readyReplicas": 2},
+            },
+        }
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    wbufsize = -1  # Header ve body tek segmentte gitsin (Nagle + delayed ACK gecikmesi olmasın)
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def not_found(self, path):
+        self.send_json(404, {"kind": "Status", "status": "Failure", "reason": "NotFound",
+                             "message": f"{path} not found", "code": 404})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        path = url.path
+        if path == '/version':
+            return self.send_json(200, {"major": "1", "minor": "33", "gitVersion": "v1.33.0"})
+        if path == '/api':
+            return self.send_json(200, {"kind": "APIVersions", "versions": ["v1"]})
+        if path == '/apis':
+            return self.send_json(200, {"kind": "APIGroupList", "apiVersion": "v1", "groups": [{
+                "name": "apps", "versions": [{"groupVersion": "apps/v1", "version": "v1"}],
+                "preferredVersion": {"groupVersion": "apps/v1", "version": "v1"}}]})
+        if path in API_RESOURCES:
+            return self.send_json(200, {"kind": "APIResourceList", "groupVersion": path.split('/', 2)[-1],
+                                        "resources": API_RESOURCES[path]})
+
+        query = parse_qs(url.query)
+        if query.get('watch'):
+            # Watch: mevcut objeleri ADDED olayı olarak gönder ve bağlantıyı kapat
+            name = query.get('fieldSelector', [''])[0].replace('metadata.name=', '')
+            events = b''.join(
+                json.dumps({"type": "ADDED", "object": obj}).encode() + b'\n'
+                for key, obj in self.server.objects.items()
+                if key.startswith(path) and (not name or key.endswith('/' + name))
+            )
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(events)))
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            self.wfile.write(events)
+            return
+
+        with self.server.lock:
+            obj = self.server.objects.get(path)
+        if obj is None:
+            return self.not_found(path)
+        self.send_json(200, obj)
+
+    def do_PATCH(self):
+        path = urlparse(self.path).path
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        scale = path.endswith('/scale')
+        target = path[:-len('/scale')] if scale else path
+        with self.server.lock:
+            obj = self.server.objects.get(target)
+            if obj is None:
+                return self.not_found(path)
+            merge(obj, body)
+            if scale:
+                obj = {"apiVersion": "autoscaling/v1", "kind": "Scale",
+                       "metadata": obj["metadata"], "spec": {"replicas": obj["spec"]["replicas"]}}
+        self.send_json(200, obj)
+
+
+def run_operations(backend, iterations):
+    """Her işlemi `iterations` kez çalıştır, işlem başına ortalama ms döndür"""
+    operations = {
+        'get deployment': lambda i: backend.get('Deployment', 'chrome-node'),
+        'patch configmap': lambda i: backend.patch_configmap('test-automation-config', {"node_count": str(i)}),
+        'scale deployment': lambda i: backend.scale('chrome-node', 1 + i % 5),
+        'watch (1 event)': lambda i: next(iter(backend.watch('Deployment', name='chrome-node', timeout=5))),
+    }
+    timings = {}
+    for name, operation in operations.items():
+        start = time.perf_counter()
+        for i in range(iterations):
+            operation(i)
+        timings[name] = (time.perf_counter() - start) * 1000 / iterations
+    return timings
+
+
+def run_command(command, check=True, capture_output=True):
+    return subprocess.run(command, shell=True, check=check, capture_output=capture_output, text=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='kubectl ve api backend karşılaştırması')
+    parser.add_argument('--iterations', type=int, default=50, help='İşlem başına tekrar (varsayılan: 50)')
+    parser.add_argument('--api-only', action='store_true',
+                        help='kubectl karşılaştırmasını atla, yalnızca api backend\'i ölç')
+    args = parser.parse_args()
+    if not args.api_only and not shutil.which('kubectl'):
+        print("kubectl PATH'te yok, karşılaştırılacak ölçüm alınamaz (yalnızca api için --api-only)",
+              file=sys.stderr)
+        return 1
+
+    server = FakeApiServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    workdir = tempfile.mkdtemp(prefix='testops-bench-')
+    kubeconfig = os.path.join(workdir, 'config')
+    with open(kubeconfig, 'w') as f:
+        yaml.safe_dump({
+            "apiVersion": "v1", "kind": "Config", "current-context": "fake",
+            "clusters": [{"name": "fake", "cluster": {"server": server.url}}],
+            "users": [{"name": "fake", "user": {"token": "fake-token"}}],
+            "contexts": [{"name": "fake", "context": {"cluster": "fake", "user": "fake"}}],
+        }, f)
+
+    results = {}
+    api = ApiBackend(NAMESPACE, kubeconfig=kubeconfig)
+    results['api'] = run_operations(api, args.iterations)
+    api.close()
+
+    if not args.api_only:
+        kubectl = KubectlBackend(
+            NAMESPACE, run_command,
+            kubectl=f"kubectl --kubeconfig {kubeconfig} --cache-dir {workdir}/cache"
+        )
+        results['kubectl'] = run_operations(kubectl, args.iterations)
+    else:
+        print("kubectl baseline atlandı (--api-only), yalnızca api backend ölçüldü\n")
+
+    server.shutdown()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    backends = list(results)
+    print(f"{'işlem':<20}" + "".join(f"{name:>12}" for name in backends) + ("    hızlanma" if len(backends) > 1 else ""))
+    for operation in results['api']:
+        row = f"{operation:<20}" + "".join(f"{results[name][operation]:>10.2f}ms" for name in backends)
+        if 'kubectl' in results:
+            row += f"{results['kubectl'][operation] / results['api'][operation]:>11.1f}x"
+        print(row)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,9 +8,32 @@ import subprocess
 import sys
 import time
 import argparse
+import fcntl
+import gzip
+import hashlib
+import heapq
+import json
 import os
+import queue
+import re
+import secrets
+import shlex
+import shutil
+import signal
+import statistics
+import tarfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
 
+from impact_map import MAP_FILE, changed_files, head_commit, load_map, save_map, select
+from kube_client import create_backend, load_manifest, yaml
+from report_index import ARTIFACTS_SUFFIX, DB_NAME, SUITE_DIR, ReportIndex, prune_artifacts
+# Controller ile ortak (report_index TestFiles'ı sys.path'e ekler)
+from utils.sharding import DEFAULT_ESTIMATE, lpt_plan
+from utils.timeouts import merge_samples
+
 
 class Colors:
     """Terminal renk kodları"""
@@ -24,16 +47,335 @@ class Colors:
     BOLD = '\033[1m'
 
 
+# Pytest'in son özet satırı, örn. "==== 3 failed, 2 passed in 95.12s (0:01:35) ===="
+PYTEST_SUMMARY_RE = re.compile(r"^=+ (?P<counts>.+?) in [\d.]+s\b.*=+$")
+# Controller'ın (conftest ResultsRecorder) her test bitince bastığı JSON kayıt satırları
+RESULT_PREFIX = "##testops-result "
+# Bir adım başarısız olunca süren adımların iptali görüp bitmesi için beklenen en uzun süre
+STEP_JOIN_TIMEOUT = 30
+
+# Test süresi limiti: geçmişten beklenen süre × çarpan + pod başlatma payı (geçmiş yoksa sabit)
+DEFAULT_TEST_TIMEOUT = 300
+MIN_TEST_TIMEOUT = 180
+STARTUP_ALLOWANCE = 120
+# Controller'ların gönderdiği bekleme/test süre örnekleri; sonraki Job'a TIMEOUT_HISTORY_JSON olarak verilir
+TIMEOUT_HISTORY_FILE = 'timeout-history.json'
+
+# Hata artifact arşivlerinin rapor dizininde kaplayabileceği toplam alan (eskiler silinir)
+DEFAULT_KEEP_ARTIFACTS_MB = 500
+
+# --node-count auto: tahmini test süresi hedefe inene kadar Chrome Node eklenir (cluster kapasitesi kadar)
+DEFAULT_TARGET_DURATION = 300
+# Süre tahmini için suite'in toplanmasına verilen süre
+COLLECT_TIMEOUT = 120
+# Manifest okunamazsa Chrome Node / controller pod'larının kaynak istekleri (cpu çekirdek, memory byte)
+CHROME_NODE_REQUESTS = (0.5, 2 ** 30)
+TEST_CONTROLLER_REQUESTS = (0.25, 512 * 2 ** 20)
+# Scale down'da önce işi biten pod silinsin (düşük maliyet önce silinir, Kubernetes 1.22+)
+POD_DELETION_COST = 'controller.kubernetes.io/pod-deletion-cost'
+QUANTITY_SUFFIXES = (('Ki', 2 ** 10), ('Mi', 2 ** 20), ('Gi', 2 ** 30), ('Ti', 2 ** 40),
+                     ('k', 1e3), ('M', 1e6), ('G', 1e9), ('T', 1e12), ('m', 1e-3))
+
+# İzole çalıştırmalar (--isolated / --run-id) kendi namespace'lerinde: test-automation-<run id>
+DEFAULT_NAMESPACE = 'test-automation'
+RUN_LABEL = 'testops/run'
+RUN_ID_RE = re.compile(r'^[a-z0-9]([a-z0-9-]{0,30}[a-z0-9])?$')
+
+# Warm cluster durumu namespace annotation'larında tutulur
+ANNOTATION_MANIFEST_HASH = 'testops/manifest-hash'
+ANNOTATION_LAST_RUN = 'testops/last-run'
+ANNOTATION_IDLE_TTL = 'testops/idle-ttl'
+# Süren çalıştırmanın başlangıcı; bitince silinir. deploy.py öldürülüp işaret kalırsa
+# bu kadar saniyeden eski işaret --reap-idle'ı engellemez
+ANNOTATION_RUN_STARTED = 'testops/run-started'
+RUN_MARKER_STALE_AFTER = 6 * 3600
+# Controller her çalıştırmada yeni bir Job olduğu için hash'e dahil edilmez
+WARM_MANIFESTS = ('01-namespace.yaml', '02-configmap.yaml', '03-chrome-node-deployment.yaml',
+                  '04-chrome-node-service.yaml', '06-test-controller-prepull.yaml')
+
+
+def new_run_id():
+    """Namespace adına uygun, eşzamanlı çalıştırmalar arasında benzersiz run id"""
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(2)}"
+
+
+@contextmanager
+def file_lock(path):
+    """Aynı rapor dizinini paylaşan eşzamanlı çalıştırmalar geçmiş dosyalarını sırayla güncellesin"""
+    with open(f"{path}.lock", 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def parse_quantity(value):
+    """Kubernetes miktarı ("500m", "1Gi", "2") -> sayı (cpu çekirdek, memory byte)"""
+    value = str(value)
+    for suffix, factor in QUANTITY_SUFFIXES:
+        if value.endswith(suffix):
+            return float(value[:-len(suffix)]) * factor
+    return float(value)
+
+
+def container_requests(pod_spec):
+    """Pod'un container'larının toplam (cpu, memory) isteği"""
+    cpu = memory = 0.0
+    for container in pod_spec.get('containers') or []:
+        requests = (container.get('resources') or {}).get('requests') or {}
+        cpu += parse_quantity(requests.get('cpu', 0))
+        memory += parse_quantity(requests.get('memory', 0))
+    return cpu, memory
+
+
+def lpt_makespan(durations, workers):
+    """Testler ({test: süre}) controller'daki gibi LPT ile dağıtılırsa en geç biten worker'ın süresi"""
+    return max(load for load, _ in lpt_plan(durations, workers))
+
+
+class TestResults:
+    """Controller'dan akan yapılandırılmış test sonuçlarını artımlı olarak topla
+
+    Binlerce test için de hafif kalır: yalnızca sonuç sayıları, en yavaş
+    `slowest` test ve başarısız testler tutulur, tüm kayıtlar diske yazılır.
+    `attempt` > 0 iken gelen kayıtlar tekrar denemedir: geçen test başarısızlardan
+    çıkar ve "tekrar denemede geçti" sayılır.
+    """
+
+    def __init__(self, slowest=10):
+        self.counts = {}
+        self.attempt = 0
+        self.failed_tests = {}  # test -> ilk başarısız sonucu (failed/error)
+        self.rerun_passed = []
+        self.slowest_limit = slowest
+        self.slowest = []  # (duration, test, node) min-heap
+        self.total_duration = 0.0
+        self.node_durations = {}  # Chrome Node -> üzerinde çalışan testlerin toplam süresi
+        self.finished = False
+        self.exitstatus = None
+        self.timeout_samples = {}
+        self.impact_map = {}  # test -> kullandığı page object modülleri/sınıfları
+
+    def add(self, record):
+        """Bir sonuç kaydını işle"""
+        if record.get("event") == "session_finish":
+            self.finished = True
+            self.exitstatus = record.get("exitstatus")
+            return
+        if record.get("event") == "timeout_samples":
+            merge_samples(self.timeout_samples, record.get("samples", {}), keep=None)
+            return
+        if record.get("event") == "impact_map":
+            self.impact_map.update(record.get("tests", {}))
+            return
+        if record.get("event", "test") != "test":
+            return
+        outcome = record.get("outcome", "unknown")
+        test = record.get("test", "?")
+        if self.attempt == 0:
+            self.counts[outcome] = self.counts.get(outcome, 0) + 1
+            if outcome in ("failed", "error"):
+                self.failed_tests[test] = outcome
+        elif outcome == "passed" and test in self.failed_tests:
+            # Sayılarda ilk sonucun yerine geçer; rapor ayrıca "tekrar denemede geçti" olarak işaretler
+            first = self.failed_tests.pop(test)
+            self.counts[first] -= 1
+            self.counts["passed"] = self.counts.get("passed", 0) + 1
+            self.rerun_passed.append(test)
+        duration = record.get("duration") or 0.0
+        self.total_duration += duration
+        node = record.get("node") or "-"
+        self.node_durations[node] = self.node_durations.get(node, 0.0) + duration
+        entry = (duration, test, node)
+        if len(self.slowest) < self.slowest_limit:
+            heapq.heappush(self.slowest, entry)
+        else:
+            heapq.heappushpop(self.slowest, entry)
+
+    @property
+    def test_count(self):
+        return sum(self.counts.values())
+
+    def seed(self, outcomes):
+        """--rerun-failed: önceki çalıştırmanın sonuçlarını ilk deneme olarak yükle"""
+        for test, outcome in outcomes.items():
+            self.counts[outcome] = self.counts.get(outcome, 0) + 1
+            if outcome in ("failed", "error"):
+                self.failed_tests[test] = outcome
+
+    def passed(self):
+        """Hiç failed/error yoksa ve en az bir test geçtiyse başarılı"""
+        return (self.counts.get("passed", 0) > 0
+                and not self.counts.get("failed") and not self.counts.get("error"))
+
+    def summary_lines(self):
+        """Sonuç özeti ve en yavaş testler"""
+        counts = ", ".join(f"{count} {outcome}" for outcome, count in sorted(self.counts.items()) if count)
+        lines = [f"{self.test_count} test ({counts}), toplam test süresi {self.total_duration:.1f}s"]
+        if self.attempt:
+            first_time = self.counts.get("passed", 0) - len(self.rerun_passed)
+            lines.append(f"İlk denemede geçen: {first_time}, tekrar denemede geçen: {len(self.rerun_passed)}, "
+                         f"başarısız: {len(self.failed_tests)}")
+            lines += [f"  passed-on-rerun  {test}" for test in self.rerun_passed]
+            lines += [f"  failed           {test}" for test in sorted(self.failed_tests)]
+        if len(self.node_durations) > 1:
+            # Dengeli dağıtımda en yoğun node toplam süre / node sayısına yaklaşır
+            ideal = self.total_duration / len(self.node_durations)
+            lines.append(f"Node yükü (en yoğun {max(self.node_durations.values()):.1f}s, ideal {ideal:.1f}s):")
+            for node, seconds in sorted(self.node_durations.items(), key=lambda item: -item[1]):
+                lines.append(f"  {seconds:8.2f}s  {node}")
+        if self.slowest:
+            lines.append("En yavaş testler:")
+            for duration, test, node in sorted(self.slowest, reverse=True):
+                lines.append(f"  {duration:8.2f}s  {test}  [{node}]")
+        return lines
+
+
+class StepGraph:
+    """Bağımlılıkları bildirilmiş deploy adımlarını paralel çalıştır
+
+    Her adım (isim, fonksiyon, bağımlılıklar) üçlüsüdür. Bağımlılıkları biten
+    adımlar hemen kendi thread'lerinde başlar. Bir adım False dönerse (veya
+    hata fırlatırsa) yeni adım başlatılmaz ve `cancel` event'i set edilir;
+    süren adımlar bunu görüp (ör. watch'lar) erken biter. Çalışma, süren
+    adımlar en fazla `join_timeout` saniye beklendikten sonra başarısız döner.
+    """
+
+    def __init__(self, steps, cancel=None, join_timeout=STEP_JOIN_TIMEOUT):
+        self.steps = {name: (func, list(deps)) for name, func, deps in steps}
+        for name, (_, deps) in self.steps.items():
+            unknown = [dep for dep in deps if dep not in self.steps]
+            if unknown:
+                raise ValueError(f"{name}: bilinmeyen bağımlılık {unknown}")
+        self.timings = {}  # isim -> (başlangıç, bitiş) saniye, çalıştırma başına göre
+        self.failed_step = None
+        self.cancel = cancel or threading.Event()
+        self.join_timeout = join_timeout
+
+    def run(self):
+        """Tüm adımları çalıştır, hepsi başarılıysa True döndür"""
+        done = queue.Queue()
+        pending = dict(self.steps)
+        finished = set()
+        running = 0
+        origin = time.monotonic()
+
+        def worker(name, func):
+            started = time.monotonic() - origin
+            try:
+                ok = bool(func())
+            except Exception as e:
+                print(f"{Colors.FAIL}✗ {name} adımında beklenmeyen hata: {e}{Colors.ENDC}")
+                ok = False
+            done.put((name, ok, started, time.monotonic() - origin))
+
+        while pending or running:
+            ready = [name for name, (_, deps) in pending.items() if all(dep in finished for dep in deps)]
+            for name in ready:
+                func, _ = pending.pop(name)
+                threading.Thread(target=worker, args=(name, func), name=name, daemon=True).start()
+                running += 1
+            if not running:
+                raise ValueError(f"Döngüsel bağımlılık: {sorted(pending)}")
+
+            name, ok, started, ended = done.get()
+            running -= 1
+            self.timings[name] = (started, ended)
+            if not ok:
+                self.failed_step = name
+                self.cancel.set()
+                self.join(done, running)
+                return False
+            finished.add(name)
+        return True
+
+    def join(self, done, running):
+        """İptal edilen çalıştırmada süren adımların bitmesini en fazla join_timeout saniye bekle"""
+        deadline = time.monotonic() + self.join_timeout
+        while running:
+            try:
+                name, _, started, ended = done.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                print(f"{Colors.WARNING}⚠ {running} adım iptalden sonra {self.join_timeout}s içinde "
+                      f"bitmedi{Colors.ENDC}")
+                return
+            running -= 1
+            self.timings[name] = (started, ended)
+
+    def critical_path(self):
+        """En son biten adımdan geriye, en geç biten bağımlılıkları izleyen zincir"""
+        if not self.timings:
+            return []
+        name = max(self.timings, key=lambda step: self.timings[step][1])
+        path = [name]
+        while True:
+            deps = [dep for dep in self.steps[name][1] if dep in self.timings]
+            if not deps:
+                break
+            name = max(deps, key=lambda step: self.timings[step][1])
+            path.append(name)
+        return path[::-1]
+
+    def timeline_lines(self):
+        """Adım süreleri; kritik yol üzerindekiler * ile işaretli"""
+        critical = set(self.critical_path())
+        lines = []
+        for name, (started, ended) in sorted(self.timings.items(), key=lambda item: item[1]):
+            mark = '*' if name in critical else ' '
+            lines.append(f"  {mark} {started:7.1f}s → {ended:7.1f}s  {ended - started:7.1f}s  {name}")
+        return lines
+
+
 class KubernetesDeployer:
     """Kubernetes deployment yöneticisi"""
 
-    def __init__(self, manifests_dir='k8s/manifests', node_count=2):
+    def __init__(self, manifests_dir='k8s/manifests', node_count=2, backend='kubectl',
+                 kubectl='kubectl', kubeconfig=None, run_id=None):
         self.manifests_dir = Path(manifests_dir)
         self.node_count = max(1, min(5, node_count))  # 1-5 arası
-        self.namespace = 'test-automation'
+        # run_id verilirse tüm kaynaklar bu çalıştırmaya ait namespace'e şablonlanır
+        self.run_id = run_id
+        self.namespace = f"{DEFAULT_NAMESPACE}-{run_id}" if run_id else DEFAULT_NAMESPACE
         self.max_retries = 5
         self.retry_delay = 10
         self.deployment_timeout = 300  # 5 dakika
+        self.chrome_node_endpoints = []
+        self.test_timeout = DEFAULT_TEST_TIMEOUT  # deploy_test_controller geçmişten hesaplar
+        self.fixed_test_timeout = None  # --test-timeout
+        self.timeout_factor = 2.0
+        self.report_dir = '/home/ec2-user/TestOps/reports'
+        self.report_file = None
+        self.keep_raw_reports = 50
+        self.test_summary = None
+        self.pod_summaries = {}  # shard pod adı -> pytest özet satırı (commit_shard_results'a kadar)
+        self.results = TestResults()
+        self.reuse = False
+        self.warm = False
+        self.idle_ttl = 30 * 60  # saniye
+        self.shards = 1
+        self.job_name = None
+        self.job_shards = 1
+        self.reruns = 0  # --reruns: başarısız testleri aynı Chrome Node'larda en fazla N kez tekrar çalıştır
+        self.rerun_failed = False  # --rerun-failed: yalnızca son kayıtlı çalıştırmanın başarısızları
+        self.status_written = False
+        self.seeded_outcomes = {}  # --rerun-failed: önceki çalıştırmanın test sonuçları
+        self.only_tests = None
+        self.auto_nodes = False  # --node-count auto: node sayısını testlerden ve cluster kapasitesinden hesapla
+        self.target_duration = DEFAULT_TARGET_DURATION
+        self.chrome_node_pods = {}  # endpoint -> pod adı
+        self.released_nodes = set()
+        self.scale_lock = threading.Lock()
+        # Bir deploy adımı başarısız olunca set edilir; süren adımlar (watch'lar, tekrar denemeler) durur
+        self.cancelled = threading.Event()
+        self.run_marked = False  # namespace'te bu çalıştırmanın ANNOTATION_RUN_STARTED işareti var
+        # Başarısız testlerin artifact'leri: pod'lardan çekilip tek arşive yazılır
+        self.artifacts = None  # açık tarfile
+        self.artifacts_lock = threading.Lock()
+        self.artifact_threads = []
+        self.keep_artifacts_mb = DEFAULT_KEEP_ARTIFACTS_MB
+        self.select = 'all'  # --select impacted: yalnızca --impact-base'den bu yana değişikliklerden etkilenen testler
+        self.impact_base = 'HEAD'
+        # kubectl process'leri veya kalıcı bağlantılı API client (--backend)
+        self.kube = create_backend(backend, self.namespace, self.run_command,
+                                   kubectl=kubectl, kubeconfig=kubeconfig)
 
     def log(self, message, color=Colors.OKBLUE):
         """Renkli log mesajı yazdır"""
@@ -56,34 +398,70 @@ class KubernetesDeployer:
                 self.log(f"Hata detayı: {e.stderr}", Colors.FAIL)
             raise
 
+    def watch_until(self, kind, predicate, name=None, selector=None, timeout=None):
+        """Kaynağı watch ile izle, predicate bir obje için truthy dönünce sonucu döndür
+
+        Timeout dolarsa veya çalıştırma iptal edilirse None döner.
+        """
+        for obj in self.kube.watch(kind, name=name, selector=selector,
+                                   timeout=timeout or self.deployment_timeout, stop=self.cancelled):
+            if self.cancelled.is_set():
+                return None
+            result = predicate(obj)
+            if result:
+                return result
+        return None
+
     def check_kubectl(self):
         """kubectl kurulu mu kontrol et"""
-        self.log("kubectl kontrol ediliyor...", Colors.HEADER)
+        self.log(f"{self.kube.name} backend kontrol ediliyor...", Colors.HEADER)
         try:
-            result = self.run_command("kubectl version --client")
-            self.log("✓ kubectl bulundu", Colors.OKGREEN)
+            self.kube.check_client()
+            self.log(f"✓ {self.kube.name} backend hazır", Colors.OKGREEN)
             return True
-        except:
-            self.log("✗ kubectl bulunamadı! Lütfen kubectl'i yükleyin.", Colors.FAIL)
+        except Exception as e:
+            if self.kube.name == 'kubectl':
+                self.log("✗ kubectl bulunamadı! Lütfen kubectl'i yükleyin.", Colors.FAIL)
+            else:
+                self.log(f"✗ kubeconfig okunamadı: {e}", Colors.FAIL)
             return False
 
     def check_cluster_connection(self):
         """Kubernetes cluster bağlantısını kontrol et"""
         self.log("Cluster bağlantısı kontrol ediliyor...", Colors.HEADER)
         try:
-            result = self.run_command("kubectl cluster-info")
+            self.kube.check_cluster()
             self.log("✓ Cluster'a bağlantı başarılı", Colors.OKGREEN)
             return True
         except:
             self.log("✗ Cluster'a bağlanılamadı!", Colors.FAIL)
             return False
 
+    def apply_manifest(self, manifest):
+        """Manifest'i uygula; izole çalıştırmada objeler bu çalıştırmanın namespace'ine şablonlanır"""
+        if not self.run_id:
+            self.kube.apply_manifest(manifest)
+            return
+        for obj in load_manifest(manifest):
+            self.kube.apply_object(self.templated(obj))
+
+    def templated(self, obj):
+        """Objeyi bu çalıştırmanın namespace'ine taşı (Namespace objesinin kendisi run etiketiyle yeniden adlandırılır)"""
+        metadata = obj['metadata']
+        if obj['kind'] == 'Namespace':
+            metadata['name'] = self.namespace
+            if self.run_id:
+                metadata.setdefault('labels', {})[RUN_LABEL] = self.run_id
+        else:
+            metadata['namespace'] = self.namespace
+        return obj
+
     def create_namespace(self):
         """Namespace oluştur"""
         self.log(f"\n{self.namespace} namespace oluşturuluyor...", Colors.HEADER)
         manifest = self.manifests_dir / '01-namespace.yaml'
         try:
-            self.run_command(f"kubectl apply -f {manifest}")
+            self.apply_manifest(manifest)
             self.log(f"✓ Namespace oluşturuldu", Colors.OKGREEN)
             return True
         except:
@@ -97,13 +475,10 @@ class KubernetesDeployer:
 
         # ConfigMap'i node_count ile güncelle
         try:
-            self.run_command(f"kubectl apply -f {manifest}")
+            if not self.warm:
+                self.apply_manifest(manifest)
             # Node count'u güncelle
-            self.run_command(
-                f"kubectl patch configmap test-automation-config "
-                f"-n {self.namespace} "
-                f"--type merge -p '{{\"data\":{{\"node_count\":\"{self.node_count}\"}}}}'"
-            )
+            self.kube.patch_configmap('test-automation-config', {"node_count": str(self.node_count)})
             self.log(f"✓ ConfigMap deploy edildi (node_count: {self.node_count})", Colors.OKGREEN)
             return True
         except:
@@ -115,7 +490,7 @@ class KubernetesDeployer:
         self.log("\nChrome Node Service deploy ediliyor...", Colors.HEADER)
         manifest = self.manifests_dir / '04-chrome-node-service.yaml'
         try:
-            self.run_command(f"kubectl apply -f {manifest}")
+            self.apply_manifest(manifest)
             self.log("✓ Chrome Node Service deploy edildi", Colors.OKGREEN)
             return True
         except:
@@ -127,12 +502,10 @@ class KubernetesDeployer:
         self.log(f"\nChrome Node deployment scale ediliyor ({self.node_count} replica)...", Colors.HEADER)
         manifest = self.manifests_dir / '03-chrome-node-deployment.yaml'
         try:
-            self.run_command(f"kubectl apply -f {manifest}")
-            # Replica sayısını ayarla
-            self.run_command(
-                f"kubectl scale deployment chrome-node "
-                f"-n {self.namespace} --replicas={self.node_count}"
-            )
+            if not self.warm:
+                self.apply_manifest(manifest)
+            # Replica sayısını ayarla (warm cluster'da yalnızca scale up/down)
+            self.kube.scale('chrome-node', self.node_count)
             self.log(f"✓ Chrome Node deployment scale edildi", Colors.OKGREEN)
             return True
         except:
@@ -143,26 +516,16 @@ class KubernetesDeployer:
         """Chrome Node'ların hazır olmasını bekle"""
         self.log("\nChrome Node'ların hazır olması bekleniyor...", Colors.HEADER)
 
-        start_time = time.time()
-        while time.time() - start_time < self.deployment_timeout:
-            try:
-                result = self.run_command(
-                    f"kubectl get deployment chrome-node -n {self.namespace} "
-                    f"-o jsonpath='{{.status.readyReplicas}}'",
-                    check=False
-                )
-                ready_replicas = result.stdout.strip()
-
-                if ready_replicas and int(ready_replicas) == self.node_count:
-                    self.log(f"✓ Tüm Chrome Node'lar hazır ({ready_replicas}/{self.node_count})", Colors.OKGREEN)
-                    return True
-                else:
-                    ready = ready_replicas if ready_replicas else "0"
-                    self.log(f"  Hazır pod sayısı: {ready}/{self.node_count}", Colors.WARNING)
-                    time.sleep(self.retry_delay)
-            except Exception as e:
-                self.log(f"  Kontrol hatası: {e}", Colors.WARNING)
-                time.sleep(self.retry_delay)
+        def all_ready(deployment):
+            status = deployment.get('status', {})
+            ready = status.get('readyReplicas') or 0
+            self.log(f"  Hazır pod sayısı: {ready}/{self.node_count}", Colors.WARNING)
+            # Warm cluster scale down edilirken kapanan pod'lar da sayılmasın
+            return ready == self.node_count and (status.get('replicas') or 0) == self.node_count
+
+        if self.watch_until('Deployment', all_ready, name='chrome-node'):
+            self.log(f"✓ Tüm Chrome Node'lar hazır ({self.node_count}/{self.node_count})", Colors.OKGREEN)
+            return True
 
         self.log("✗ Chrome Node'lar timeout süresinde hazır olamadı", Colors.FAIL)
         return False
@@ -171,15 +534,23 @@ class KubernetesDeployer:
         """Chrome Node Service'in çalıştığını doğrula"""
         self.log("\nChrome Node Service doğrulanıyor...", Colors.HEADER)
         try:
-            result = self.run_command(
-                f"kubectl get endpoints chrome-node-service -n {self.namespace} "
-                f"-o jsonpath='{{.subsets[*].addresses[*].ip}}'",
-                check=False
-            )
-            endpoints = result.stdout.strip()
+            seen = []
+
+            # Endpoint'ler pod readiness'ından biraz sonra güncellenir; tümü görünene kadar izle
+            def all_endpoints(endpoints):
+                seen[:] = [address
+                           for subset in endpoints.get('subsets') or []
+                           for address in subset.get('addresses') or []]
+                return len(seen) == self.node_count
+
+            self.watch_until('Endpoints', all_endpoints, name='chrome-node-service', timeout=60)
+            endpoint_list = [address['ip'] for address in seen]
 
-            if endpoints:
-                endpoint_list = endpoints.split()
+            if endpoint_list:
+                self.chrome_node_endpoints = [f"http://{ip}:4444" for ip in endpoint_list]
+                # İşi biten node'u scale down'da seçebilmek için (--node-count auto)
+                self.chrome_node_pods = {f"http://{address['ip']}:4444": (address.get('targetRef') or {}).get('name')
+                                         for address in seen}
                 self.log(f"✓ Service hazır ({len(endpoint_list)} endpoint)", Colors.OKGREEN)
                 return True
             else:
@@ -189,86 +560,140 @@ class KubernetesDeployer:
             self.log("✗ Service doğrulanamadı", Colors.FAIL)
             return False
 
-    def deploy_test_controller(self):
-        """Test Controller'ı deploy et"""
-        self.log("\nTest Controller deploy ediliyor...", Colors.HEADER)
-        manifest = self.manifests_dir / '05-test-controller-deployment.yaml'
+    def publish_chrome_node_endpoints(self):
+        """Hazır Chrome Node endpoint'lerini ConfigMap'e yaz (worker başına bir node)"""
+        self.log("\nChrome Node endpoint'leri yayınlanıyor...", Colors.HEADER)
+        endpoints = ",".join(self.chrome_node_endpoints)
         try:
-            self.run_command(f"kubectl apply -f {manifest}")
-            self.log("✓ Test Controller deploy edildi", Colors.OKGREEN)
+            self.kube.patch_configmap('test-automation-config', {"chrome_node_endpoints": endpoints})
+            self.log(f"✓ {len(self.chrome_node_endpoints)} endpoint yayınlandı, "
+                     f"testler {len(self.chrome_node_endpoints)} worker ile paralel koşacak", Colors.OKGREEN)
             return True
         except:
-            self.log("✗ Test Controller deploy edilemedi", Colors.FAIL)
+            self.log("✗ Chrome Node endpoint'leri yayınlanamadı", Colors.FAIL)
             return False
 
-    def monitor_test_execution(self):
-        """Test execution'ı izle"""
-        self.log("\nTest execution izleniyor...", Colors.HEADER)
-        self.log("Test Controller logları:\n", Colors.OKCYAN)
+    def prepull_test_controller_image(self):
+        """Test Controller image'ını Chrome Node'lar hazırlanırken node'lara çektir"""
+        self.log("\nTest Controller image'ı önceden çekiliyor...", Colors.HEADER)
+        manifest = self.manifests_dir / '06-test-controller-prepull.yaml'
+        if not manifest.exists():
+            self.log("⚠ Prepull manifest'i yok, atlanıyor", Colors.WARNING)
+            return True
+        try:
+            self.apply_manifest(manifest)
+            self.log("✓ Test Controller image çekimi başlatıldı", Colors.OKGREEN)
+        except:
+            # Yalnızca hızlandırma; başarısız olursa controller image'ı kendisi çeker
+            self.log("⚠ Test Controller image çekimi başlatılamadı", Colors.WARNING)
+        return True
 
-        # Pod'un başlamasını bekle
-        time.sleep(5)
+    def render_test_controller_job(self, manifest):
+        """Job manifest'ini bu çalıştırmaya göre doldur: benzersiz isim ve shard sayısı"""
+        job = self.templated(load_manifest(manifest)[0])
+        self.job_name = f"test-controller-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        if self.results.attempt:
+            self.job_name += f"-rerun{self.results.attempt}"
+        # Tekrar denemede test sayısından fazla shard açılmaz
+        # Yalnızca tek tek test ID'leri verildiyse shard sayısı test sayısını geçmez (dosya yolları birçok test içerir)
+        if self.only_tests and all('::' in test for test in self.only_tests):
+            self.job_shards = min(self.shards, len(self.only_tests))
+        else:
+            self.job_shards = self.shards
+        job['metadata']['name'] = self.job_name
+        job['spec']['completions'] = self.job_shards
+        job['spec']['parallelism'] = self.job_shards
+        # Süre limitini Kubernetes de uygular: aşılırsa Job Failed (DeadlineExceeded) olur
+        job['spec']['activeDeadlineSeconds'] = self.test_timeout
+        history = self.load_timeout_history()
+        for container in job['spec']['template']['spec']['containers']:
+            for env in container.get('env', []):
+                if env['name'] == 'TEST_SHARD_COUNT':
+                    env['value'] = str(self.job_shards)
+            if self.only_tests:
+                # conftest yalnızca bu test ID'lerini / test dosyalarını çalıştırır
+                container.setdefault('env', []).append({'name': 'TEST_IDS', 'value': '\n'.join(self.only_tests)})
+            if history:
+                # Pod'lar geçmişten bekleme ve test başına süre limitlerini türetir
+                container.setdefault('env', []).append(
+                    {'name': 'TIMEOUT_HISTORY_JSON', 'value': json.dumps(history, separators=(',', ':'))}
+                )
+        return job
 
+    def deploy_test_controller(self):
+        """Test Controller Job'ını başlat (her çalıştırma için yeni bir Job)"""
+        if self.cancelled.is_set():
+            return False
+        if self.shards > self.node_count:
+            # Shard'lar Chrome Node paylaşmasın
+            self.log(f"⚠ Shard sayısı node sayısına indirildi ({self.shards} → {self.node_count})", Colors.WARNING)
+            self.shards = self.node_count
+        self.test_timeout = self.suite_timeout()
+        self.log(f"\nTest Controller Job'ı başlatılıyor ({self.shards} shard)...", Colors.HEADER)
+        manifest = self.manifests_dir / '05-test-controller-job.yaml'
         try:
-            # Pod adını al
-            result = self.run_command(
-                f"kubectl get pods -n {self.namespace} "
-                f"-l component=test-controller "
-                f"-o jsonpath='{{.items[0].metadata.name}}'",
-                check=False
-            )
-            pod_name = result.stdout.strip()
-
-            if not pod_name:
-                self.log("✗ Test Controller pod bulunamadı", Colors.FAIL)
-                return False
+            # Eski sürümlerden kalan, sürekli çalışan controller Deployment'ı warm namespace'te olabilir
+            if self.kube.find('Deployment', 'test-controller'):
+                self.kube.delete('Deployment', 'test-controller')
+            self.kube.apply_object(self.render_test_controller_job(manifest))
+            self.log(f"✓ Test Controller Job'ı başlatıldı: {self.job_name}", Colors.OKGREEN)
+            return True
+        except Exception as e:
+            self.log(f"✗ Test Controller Job'ı başlatılamadı: {e}", Colors.FAIL)
+            return False
 
-            # Logları takip et (tail -f /dev/null için timeout)
-            self.log("Testler çalışıyor, loglar izleniyor...\n")
+    def monitor_test_execution(self):
+        """Test Job'ını izle: her shard pod'unun logunu akıt, bitişi Job status'undan al"""
+        self.log("\nTest execution izleniyor...", Colors.HEADER)
+        self.log("Test Controller logları:\n", Colors.OKCYAN)
 
-            max_wait = 300 
-            start_time = time.time()
-            test_completed = False
+        def job_finished(job):
+            for condition in job.get('status', {}).get('conditions') or []:
+                if condition.get('status') == 'True' and condition.get('type') in ('Complete', 'Failed'):
+                    return condition['type']
+            return None
 
-            while time.time() - start_time < max_wait:
-                result = self.run_command(
-                    f"kubectl logs {pod_name} -n {self.namespace} --tail=100",
-                    check=False,
-                    capture_output=True
-                )
+        try:
+            # Tekrar denemeler aynı rapora eklenir, tek bir birleşik rapor oluşur
+            mode = 'a' if self.results.attempt and self.report_file else 'w'
+            if mode == 'w':
+                self.report_file = self.new_report_file()
+            stop = threading.Event()
+            with open(self.report_file, mode) as report, \
+                    open(self.results_file_for(self.report_file), mode) as results:
+                if mode == 'w' and self.seeded_outcomes:
+                    # --rerun-failed ama önceki rapor yok: ilk deneme sonuçları bu raporda dursun
+                    for test, outcome in self.seeded_outcomes.items():
+                        results.write(json.dumps({"event": "test", "test": test, "outcome": outcome},
+                                                 separators=(',', ':')) + '\n')
+                if self.results.attempt:
+                    header = f"===== Tekrar deneme {self.results.attempt}: {len(self.only_tests)} test ====="
+                    print(header)
+                    report.write(header + '\n')
+                sink = (report, results, threading.Lock())
+                streams = self.follow_job_pods(sink, stop)
+                # activeDeadlineSeconds dolunca Job'ın Failed olması da görülsün diye biraz fazla beklenir
+                state = self.watch_until('Job', job_finished, name=self.job_name, timeout=self.test_timeout + 60)
 
-                # "Tests completed" veya "passed in" mesajı var mı?
-                if result.stdout and ("Tests completed" in result.stdout or "passed in" in result.stdout or "failed in" in result.stdout):
-                    # Tüm logları göster
-                    full_logs = self.run_command(
-                        f"kubectl logs {pod_name} -n {self.namespace}",
-                        check=False,
-                        capture_output=True
-                    )
-                    print(full_logs.stdout)
-                    test_completed = True
-                    break
-
-                time.sleep(5) 
-
-            if not test_completed:
-                self.log("\n⚠ Test timeout (5 dakika)", Colors.WARNING)
-                # Timeout olsa bile logları göster
-                full_logs = self.run_command(
-                    f"kubectl logs {pod_name} -n {self.namespace}",
-                    check=False,
-                    capture_output=True
-                )
-                print(full_logs.stdout)
+                if state:
+                    # Son pod'ların log stream'leri de bitsin (pod'lar çıktığı için stream kendiliğinden kapanır)
+                    deadline = time.monotonic() + 30
+                    while (len({stream[0] for stream in list(streams.values())}) < self.job_shards
+                           and time.monotonic() < deadline):
+                        time.sleep(0.5)
+                    for stream in list(streams.values()):
+                        stream[1].join(max(0, deadline - time.monotonic()) + 30)
+                with sink[2]:
+                    stop.set()
+                    self.commit_shard_results(streams, results)
 
-            # Test sonucunu kontrol et
-            result = self.run_command(
-                f"kubectl logs {pod_name} -n {self.namespace}",
-                check=False,
-                capture_output=True
-            )
+            if state is None:
+                self.log(f"\n⚠ Test timeout ({self.test_timeout} saniye)", Colors.WARNING)
+            elif state == 'Failed':
+                self.log(f"\n⚠ Test Job'ı başarısız oldu (pod hatası/backoffLimit veya {self.test_timeout}s süre limiti)",
+                         Colors.WARNING)
 
-            if "passed in" in result.stdout and "failed" not in result.stdout:
+            if self.tests_passed():
                 self.log("\n✓ Testler başarıyla tamamlandı!", Colors.OKGREEN)
                 return True
             else:
@@ -279,62 +704,626 @@ class KubernetesDeployer:
             self.log(f"✗ Test monitoring hatası: {e}", Colors.FAIL)
             return False
 
+    def follow_job_pods(self, sink, stop):
+        """Job'ın her pod'u başlayınca logunu ayrı bir thread'de akıt
+
+        {pod adı: (shard index, thread, oluşturulma zamanı, sonuç kayıtları)}
+        sözlüğünü döndürür; sözlük pod'lar başladıkça arka planda doldurulur.
+        Başarısız shard pod'unun yerine Job aynı index'le yeni pod açar; hangi
+        pod'un sonuçlarının sayılacağına Job bitince commit_shard_results karar verir.
+        """
+        streams = {}
+
+        def on_pod(pod):
+            if stop.is_set():
+                return True
+            metadata = pod['metadata']
+            phase = pod.get('status', {}).get('phase')
+            if metadata['name'] not in streams and phase in ("Running", "Succeeded", "Failed"):
+                index = (metadata.get('annotations') or {}).get('batch.kubernetes.io/job-completion-index', '0')
+                prefix = f"[shard {index}] " if self.job_shards > 1 else ""
+                records = []
+                thread = threading.Thread(target=self.stream_test_logs,
+                                          args=(metadata['name'], sink, stop, prefix, records), daemon=True)
+                streams[metadata['name']] = (index, thread, metadata.get('creationTimestamp') or '', records)
+                thread.start()
+            return False
+
+        threading.Thread(target=self.watch_until, args=('Pod', on_pod),
+                         kwargs={'selector': f"job-name={self.job_name}", 'timeout': self.test_timeout},
+                         daemon=True).start()
+        return streams
+
+    def commit_shard_results(self, streams, results):
+        """Her shard index'inin en son pod'unun sonuç kayıtlarını .jsonl'a yaz ve say
+
+        Yerine yenisi açılan pod'un kayıtları atılır: yeni pod shard'ın tüm
+        testlerini baştan çalıştırır, iki pod'un sonuçları birlikte sayılmaz.
+        """
+        streams = dict(streams)  # watch thread'i hâlâ ekleyebilir
+        latest = {}
+        for name, (index, _, created, _) in streams.items():
+            if index not in latest or created >= streams[latest[index]][2]:
+                latest[index] = name
+        for name, (index, _, _, records) in sorted(streams.items(), key=lambda item: item[1][2]):
+            if latest[index] != name:
+                self.pod_summaries.pop(name, None)
+                if records:
+                    self.log(f"⚠ Shard {index}: yeniden başlatılan {name} pod'unun {len(records)} kaydı atıldı",
+                             Colors.WARNING)
+                continue
+            for record_json in records:
+                results.write(record_json + '\n')
+                self.results.add(json.loads(record_json))
+            records.clear()
+            counts = self.pod_summaries.pop(name, None)
+            if counts:
+                self.test_summary = f"{self.test_summary}; {counts}" if self.test_summary else counts
+
+    def new_report_file(self):
+        """Bu çalıştırmanın rapor dosyası yolunu oluştur"""
+        os.makedirs(self.report_dir, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        suffix = f"-{self.run_id}" if self.run_id else ""
+        return f"{self.report_dir}/test-results-{timestamp}{suffix}.log"
+
+    def stream_test_logs(self, pod_name, sink, stop, prefix="", records=None):
+        """Pod logunu follow modunda bir kez akıt: konsola bas, rapora yaz, sonucu yakala
+
+        Loglar bellekte biriktirilmez; yalnızca pytest özet satırları tutulur.
+        Sonuç kayıtları `records` verilmişse oraya biriktirilir (shard pod'u
+        yeniden başlatılırsa yalnızca sonuncusununkiler sayılır), yoksa hemen
+        `.jsonl` dosyasına yazılıp sayılır. Birden fazla shard'ın stream'i aynı
+        dosyalara satır satır (kilitle) yazar; stream pod çıkınca biter.
+        """
+        report, results, lock = sink
+        for line in self.kube.stream_logs(pod_name, self.test_timeout):
+            with lock:
+                if stop.is_set():
+                    return
+                if line.startswith(RESULT_PREFIX):
+                    # Yapılandırılmış sonuç: ayrı .jsonl dosyasına, konsola basılmaz
+                    record_json = line[len(RESULT_PREFIX):]
+                    try:
+                        record = json.loads(record_json)
+                    except ValueError:
+                        record = None
+                    if record is not None and self.results.attempt and record.get('event') in ('test', 'session_finish'):
+                        # Tekrar deneme kayıtları aynı .jsonl'a deneme numarasıyla eklenir
+                        record['attempt'] = self.results.attempt
+                        record_json = json.dumps(record, separators=(',', ':'))
+                    # Node bırakma ve artifact olayları beklemeden işlenir
+                    live = record is None or record.get('event') in ('node_idle', 'artifacts')
+                    if records is not None and not live:
+                        records.append(record_json)
+                    else:
+                        results.write(record_json + '\n')
+                        if record is not None:
+                            self.results.add(record)
+                    if record is not None:
+                        if record.get('event') == 'node_idle' and self.draining():
+                            threading.Thread(target=self.release_chrome_node, args=(record.get('node'),),
+                                             daemon=True).start()
+                        elif record.get('event') == 'artifacts':
+                            # Pod çıkmadan (işaret dosyasını bekler) artifact'leri çek
+                            thread = threading.Thread(target=self.collect_artifacts, args=(pod_name, record),
+                                                      daemon=True)
+                            self.artifact_threads.append(thread)
+                            thread.start()
+                    continue
+                print(prefix + line)
+                report.write(line + '\n')
+                match = PYTEST_SUMMARY_RE.match(line)
+                if match:
+                    counts = match.group('counts')
+                    if records is not None:
+                        self.pod_summaries[pod_name] = counts
+                    else:
+                        self.test_summary = f"{self.test_summary}; {counts}" if self.test_summary else counts
+
+    def rerun_failures(self):
+        """Başarısız testleri aynı Chrome Node'larda yeni bir Job ile en fazla --reruns kez tekrar çalıştır"""
+        while self.results.failed_tests and self.results.attempt < self.reruns and not self.cancelled.is_set():
+            self.results.attempt += 1
+            self.only_tests = sorted(self.results.failed_tests)
+            self.log(f"\n{len(self.only_tests)} başarısız test tekrar çalıştırılıyor "
+                     f"(deneme {self.results.attempt}/{self.reruns})...", Colors.HEADER)
+            if not self.deploy_test_controller() or not self.monitor_test_execution():
+                self.write_status_block()
+                return False
+        self.write_status_block()
+        return True
+
+    def write_status_block(self):
+        """Birleşik raporun sonuna her testin durumunu yaz: ilk denemede / tekrar denemede geçti / başarısız
+
+        Tekrar deneme yapıldıysa bir kez yazılır; --rerun-failed'de Reruns adımı atlansa da
+        save_test_reports çağırır.
+        """
+        if not self.results.attempt or not self.report_file or self.status_written:
+            return
+        with open(self.report_file, 'a') as report:
+            report.write('\n'.join(self.results.summary_lines()) + '\n')
+        self.status_written = True
+
+    def load_last_failures(self):
+        """--rerun-failed: son kayıtlı çalıştırmanın sonuçlarını ilk deneme olarak yükle
+
+        Başarısız test yoksa False döner (tekrar çalıştırılacak bir şey yok).
+        """
+        index = ReportIndex(os.path.join(self.report_dir, DB_NAME))
+        try:
+            index.backfill(self.report_dir)
+            log_path, outcomes = index.last_run_outcomes()
+        finally:
+            index.close()
+        self.results.seed(outcomes)
+        self.seeded_outcomes = outcomes
+        if not self.results.failed_tests:
+            self.log("Son çalıştırmada başarısız test yok, tekrar çalıştırılacak test bulunmadı", Colors.OKGREEN)
+            return False
+        # Önceki çalıştırma ilk deneme sayılır; bu çalıştırma tekrar denemedir. Denemeler onun
+        # raporuna eklenir, indekste tek ve tam bir çalıştırma kalır (bkz. index_report)
+        self.report_file = self.reopen_report(log_path)
+        if self.report_file is None:
+            self.log("⚠ Son çalıştırmanın raporu bulunamadı, sonuçları yeni rapora ilk deneme olarak yazılacak",
+                     Colors.WARNING)
+        self.results.attempt = 1
+        self.reruns += 1  # --reruns bu denemeden sonraki tekrarları sayar
+        self.only_tests = sorted(self.results.failed_tests)
+        self.log(f"Son çalıştırmanın {len(self.only_tests)} başarısız testi tekrar çalıştırılacak:", Colors.HEADER)
+        for test in self.only_tests:
+            print(f"  {test}")
+        return True
+
+    def reopen_report(self, log_path):
+        """Rapor ve .jsonl'a ekleme yapılabilsin diye (sıkıştırılmışsa açarak) ham yolunu döndür, yoksa None"""
+        if not log_path:
+            return None
+        raw = re.sub(r"\.gz$", "", log_path)
+        for path in (raw, self.results_file_for(raw)):
+            if not os.path.exists(path) and os.path.exists(path + '.gz'):
+                with gzip.open(path + '.gz', 'rb') as src, open(path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+                os.unlink(path + '.gz')
+        return raw if os.path.exists(raw) else None
+
+    def collect_suite_tests(self):
+        """Suite'in şu anki test ID'leri (`pytest --collect-only -q`); toplanamazsa None"""
+        try:
+            result = subprocess.run([sys.executable, '-m', 'pytest', '--collect-only', '-q', 'tests/'],
+                                    cwd=SUITE_DIR, capture_output=True, text=True, timeout=COLLECT_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        if result.returncode != 0:
+            return None
+        return {line.strip() for line in result.stdout.splitlines() if '::' in line}
+
+    def expected_test_durations(self):
+        """Çalıştırılacak testler ve beklenen süreleri
+
+        Testler suite toplanarak bulunur (toplanamazsa geçmişteki testler
+        kullanılır). Süre, testin geçen çalıştırmalarının medyanı (süre
+        geçmişi), yoksa rapor indeksindeki p50'sidir; hiç geçmişi olmayan
+        teste bilinenlerin medyanı verilir.
+        """
+        history = self.load_timeout_history().get('tests', {})
+        index = ReportIndex(os.path.join(self.report_dir, DB_NAME))
+        try:
+            indexed = index.durations(last=20)
+        finally:
+            index.close()
+        collected = self.collect_suite_tests()
+        if collected is None:
+            self.log("⚠ Suite toplanamadı, süre geçmişindeki testler kullanılacak", Colors.WARNING)
+            tests = set(indexed) | set(history)
+        else:
+            # Geçmişte kalıp artık suite'te olmayan testler düşer, yeni testler tahminle eklenir
+            tests = collected
+        # Bilinmeyen testin tahmini, seçimden önce suite'in bilinen testlerinin medyanı
+        known = {test: statistics.median(history[test]) if history.get(test) else indexed[test][1]
+                 for test in tests if history.get(test) or test in indexed}
+        default = statistics.median(known.values()) if known else DEFAULT_ESTIMATE
+        if self.only_tests:
+            only = set(self.only_tests)
+            tests = {test for test in tests if test in only or test.split('::')[0] in only}
+            if collected is None:
+                tests |= {test for test in only if '::' in test}
+        return {test: known.get(test, default) for test in tests}
+
+    def chrome_node_capacity(self):
+        """Cluster'ın boş allocatable CPU/memory'sine (controller pod'ları ayrıldıktan sonra) kaç Chrome Node sığar"""
+        try:
+            chrome = container_requests(load_manifest(self.manifests_dir / '03-chrome-node-deployment.yaml')[0]
+                                        ['spec']['template']['spec'])
+            controller = container_requests(load_manifest(self.manifests_dir / '05-test-controller-job.yaml')[0]
+                                            ['spec']['template']['spec'])
+        except Exception:
+            chrome, controller = CHROME_NODE_REQUESTS, TEST_CONTROLLER_REQUESTS
+        free = {}
+        for node in self.kube.list_objects('Node'):
+            spec, status = node.get('spec', {}), node.get('status', {})
+            ready = any(condition.get('type') == 'Ready' and condition.get('status') == 'True'
+                        for condition in status.get('conditions') or [])
+            tainted = any(taint.get('effect') in ('NoSchedule', 'NoExecute') for taint in spec.get('taints') or [])
+            if ready and not spec.get('unschedulable') and not tainted:
+                allocatable = status.get('allocatable', {})
+                free[node['metadata']['name']] = [parse_quantity(allocatable.get('cpu', 0)),
+                                                  parse_quantity(allocatable.get('memory', 0))]
+        for pod in self.kube.list_objects('Pod', all_namespaces=True):
+            metadata, spec = pod['metadata'], pod.get('spec', {})
+            if pod.get('status', {}).get('phase') in ('Succeeded', 'Failed') or spec.get('nodeName') not in free:
+                continue
+            # Mevcut Chrome Node'lar (warm cluster) yeniden boyutlanacak, yerleri boş sayılır
+            if (metadata.get('namespace') == self.namespace
+                    and (metadata.get('labels') or {}).get('component') == 'chrome-node'):
+                continue
+            cpu, memory = container_requests(spec)
+            free[spec['nodeName']][0] -= cpu
+            free[spec['nodeName']][1] -= memory
+        for _ in range(self.shards):
+            # Her shard'ın controller pod'u en boş node'a yerleşir
+            if free:
+                roomiest = max(free.values())
+                roomiest[0] -= controller[0]
+                roomiest[1] -= controller[1]
+        return sum(max(0, int(min(cpu / chrome[0] if chrome[0] else float('inf'),
+                                  memory / chrome[1] if chrome[1] else float('inf'))))
+                   for cpu, memory in free.values())
+
+    def size_chrome_nodes(self):
+        """--node-count auto: tahmini test süresini hedefe indiren en az node, kapasite ve test sayısıyla sınırlı"""
+        self.log("\nChrome Node sayısı hesaplanıyor...", Colors.HEADER)
+        try:
+            durations = self.expected_test_durations()
+            capacity = self.chrome_node_capacity()
+        except Exception as e:
+            self.log(f"⚠ Node sayısı hesaplanamadı ({e}), {self.node_count} node kullanılacak", Colors.WARNING)
+            return
+        if not durations:
+            self.log(f"⚠ Test süresi geçmişi yok, {self.node_count} node kullanılacak", Colors.WARNING)
+            return
+        if capacity < 1:
+            self.log("⚠ Cluster'da Chrome Node'a yer yok, 1 node istenecek (pod yer açılınca başlar)", Colors.WARNING)
+        limit = max(1, min(capacity, len(durations)))
+        best = None
+        for count in range(1, limit + 1):
+            makespan = lpt_makespan(durations, count)
+            if best is None or makespan < best[1]:
+                best = (count, makespan)
+            if makespan <= self.target_duration:
+                break
+        self.node_count, makespan = best
+        self.log(f"✓ {self.node_count} Chrome Node: {len(durations)} test, toplam {sum(durations.values()):.0f}s, "
+                 f"tahmini süre {makespan:.0f}s (hedef {self.target_duration}s, kapasite {capacity} node)",
+                 Colors.OKGREEN)
+
+    def draining(self):
+        """İşi biten Chrome Node'lar bırakılsın mı (auto modda, warm cluster ve bekleyen tekrar deneme yoksa)"""
+        return self.auto_nodes and not self.reuse and self.results.attempt >= self.reruns
+
+    def release_chrome_node(self, endpoint):
+        """Worker'ı işini bitiren Chrome Node'un pod'unu silinecek ilk pod yapıp deployment'ı bir azalt"""
+        with self.scale_lock:
+            pod = self.chrome_node_pods.get(endpoint)
+            if not pod or endpoint in self.released_nodes:
+                return
+            try:
+                self.kube.patch('Pod', pod, {"metadata": {"annotations": {POD_DELETION_COST: "-1000"}}})
+                self.released_nodes.add(endpoint)
+                replicas = self.node_count - len(self.released_nodes)
+                self.kube.scale('chrome-node', replicas)
+                self.log(f"  İşi biten Chrome Node bırakıldı: {pod} ({replicas} replica kaldı)", Colors.OKCYAN)
+            except Exception as e:
+                self.log(f"⚠ Chrome Node bırakılamadı ({pod}): {e}", Colors.WARNING)
+
+    def release_chrome_nodes(self):
+        """Testler (ve tekrar denemeler) bitti: kalan Chrome Node'ları sıfıra indir"""
+        with self.scale_lock:
+            try:
+                self.kube.scale('chrome-node', 0)
+                self.log("✓ Chrome Node'lar sıfıra indirildi", Colors.OKGREEN)
+            except Exception as e:
+                self.log(f"⚠ Chrome Node'lar sıfıra indirilemedi: {e}", Colors.WARNING)
+        return True
+
+    def results_file_for(self, report_file):
+        """Rapor dosyasının yanındaki yapılandırılmış sonuç dosyası"""
+        return str(Path(report_file).with_suffix('.jsonl'))
+
+    def tests_passed(self):
+        """Yapılandırılmış sonuçlara (yoksa pytest özetine) göre testler başarılı mı"""
+        if self.results.test_count:
+            return self.results.passed()
+        if not self.test_summary:
+            return False
+        counts = self.test_summary
+        return "passed" in counts and "failed" not in counts and "error" not in counts
+
     def save_test_reports(self):
         """Test raporlarını local'e kaydet"""
         self.log("\nTest raporları kaydediliyor...", Colors.HEADER)
 
+        # Loglar izleme sırasında doğrudan rapor dosyasına yazıldı, tekrar indirilmez
+        if not self.report_file or not os.path.exists(self.report_file):
+            self.log("✗ Test raporu bulunamadı", Colors.FAIL)
+            return False
+
+        self.write_status_block()
+        self.log(f"✓ Test raporu kaydedildi: {self.report_file}", Colors.OKGREEN)
+        if self.results.test_count:
+            self.log(f"✓ Test sonuçları kaydedildi: {self.results_file_for(self.report_file)}", Colors.OKGREEN)
+            for line in self.results.summary_lines():
+                print(line)
+        else:
+            print(self.test_summary or 'Test sonucu bulunamadı')
+        self.save_artifacts()
+        self.index_report()
+        self.save_timeout_history()
+        self.save_impact_map()
+        return True
+
+    def artifacts_file_for(self, report_file):
+        """Rapor dosyasının yanındaki hata artifact arşivi"""
+        return str(Path(report_file).with_suffix(ARTIFACTS_SUFFIX))
+
+    def collect_artifacts(self, pod, record):
+        """Pod'daki hata artifact'lerini tek bir tar stream'i olarak çekip çalıştırmanın arşivine ekle
+
+        Dosyalar pod'da zaten sıkıştırılmış (PNG, .gz) yazılır; arşiv diske
+        dosya dosya indirilmeden, stream okunurken yazılır. Tekrar denemelerin
+        dosyaları rerun-N/ altına girer. Komut sonunda pod'un beklediği işaret
+        dosyası yazılır, pod çıkar.
+        """
+        directory = record.get('dir')
+        if not directory:
+            return
+        command = ['sh', '-c', f"tar -cf - -C {shlex.quote(directory)} .; touch {shlex.quote(directory + '.collected')}"]
+        prefix = f"rerun-{self.results.attempt}/" if self.results.attempt else ""
+        files = size = 0
         try:
-            # Report dizini
-            report_dir = getattr(self, 'report_dir', '/home/ec2-user/TestOps/reports')
-
-            # Report dizinini oluştur
-            import os
-            os.makedirs(report_dir, exist_ok=True)
-
-            # Timestamp
-            from datetime import datetime
-            timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
-            report_file = f"{report_dir}/test-results-{timestamp}.log"
-
-            # Pod adını al
-            result = self.run_command(
-                f"kubectl get pods -n {self.namespace} "
-                f"-l component=test-controller "
-                f"-o jsonpath='{{.items[0].metadata.name}}'",
-                check=False
-            )
-            pod_name = result.stdout.strip()
+            with self.kube.exec_stream(pod, command) as stream:
+                with tarfile.open(fileobj=stream, mode='r|') as incoming:
+                    for member in incoming:
+                        if not member.isfile():
+                            continue
+                        member.name = prefix + member.name.removeprefix('./')
+                        with self.artifacts_lock:
+                            if self.artifacts is None:
+                                # --rerun-failed: önceki çalıştırmanın arşivine eklenir
+                                self.artifacts = tarfile.open(self.artifacts_file_for(self.report_file), 'a')
+                            self.artifacts.addfile(member, incoming.extractfile(member))
+                        files += 1
+                        size += member.size
+            self.log(f"  Hata artifact'leri alındı: {pod} ({files} dosya, {size / 1024 / 1024:.1f} MB)",
+                     Colors.OKCYAN)
+        except Exception as e:
+            self.log(f"⚠ Hata artifact'leri alınamadı ({pod}): {e}", Colors.WARNING)
 
-            if not pod_name:
-                self.log("✗ Test Controller pod bulunamadı", Colors.FAIL)
-                return False
+    def save_artifacts(self):
+        """Artifact çekimlerinin bitmesini bekle, arşivi kapat ve toplam boyut sınırına göre eskileri sil"""
+        for thread in self.artifact_threads:
+            thread.join(60)
+        with self.artifacts_lock:
+            if self.artifacts is None:
+                return
+            path = self.artifacts.name
+            self.artifacts.close()
+            self.artifacts = None
+        self.log(f"✓ Hata artifact'leri kaydedildi: {path} ({os.path.getsize(path) / 1024 / 1024:.1f} MB)",
+                 Colors.OKGREEN)
+        try:
+            removed, freed = prune_artifacts(self.report_dir, self.keep_artifacts_mb * 1024 * 1024, keep=[path])
+            if removed:
+                self.log(f"  {removed} eski artifact arşivi silindi ({freed / 1024 / 1024:.1f} MB)", Colors.OKCYAN)
+        except OSError as e:
+            self.log(f"⚠ Eski artifact arşivleri silinemedi: {e}", Colors.WARNING)
 
-            # Logları kaydet
-            self.run_command(
-                f"kubectl logs {pod_name} -n {self.namespace} > {report_file}",
-                check=False
-            )
+    def suite_timeout(self):
+        """Test süresi limiti: rapor geçmişinden beklenen süre × çarpan + pod başlatma payı"""
+        if self.fixed_test_timeout:
+            return self.fixed_test_timeout
+        expected = None
+        try:
+            index = ReportIndex(os.path.join(self.report_dir, DB_NAME))
+            try:
+                # -n auto her Chrome Node için bir worker başlatır (tüm shard'lar toplamı)
+                expected = index.expected_duration(parallelism=self.node_count)
+            finally:
+                index.close()
+        except Exception as e:
+            self.log(f"⚠ Rapor geçmişi okunamadı: {e}", Colors.WARNING)
+        if not expected:
+            self.log(f"Test süresi limiti: {DEFAULT_TEST_TIMEOUT}s (geçmiş yok)", Colors.OKCYAN)
+            return DEFAULT_TEST_TIMEOUT
+        timeout = max(MIN_TEST_TIMEOUT, int(expected * self.timeout_factor + STARTUP_ALLOWANCE))
+        self.log(f"Test süresi limiti: {timeout}s (beklenen {expected:.0f}s × {self.timeout_factor:g} "
+                 f"+ {STARTUP_ALLOWANCE}s başlatma)", Colors.OKCYAN)
+        return timeout
 
-            self.log(f"✓ Test raporu kaydedildi: {report_file}", Colors.OKGREEN)
+    def timeout_history_path(self):
+        return os.path.join(self.report_dir, TIMEOUT_HISTORY_FILE)
 
-            # Özet göster
-            self.run_command(
-                f"cat {report_file} | grep -E '(passed|failed) in' || echo 'Test sonucu bulunamadı'",
-                check=False,
-                capture_output=False
-            )
+    def load_timeout_history(self):
+        try:
+            with open(self.timeout_history_path()) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_timeout_history(self):
+        """Bu çalıştırmanın bekleme/test süre örneklerini geçmiş dosyasına ekle"""
+        if not self.results.timeout_samples:
+            return
+        try:
+            with file_lock(self.timeout_history_path()):
+                history = merge_samples(self.load_timeout_history(), self.results.timeout_samples)
+                tmp_file = f"{self.timeout_history_path()}.{os.getpid()}.tmp"
+                with open(tmp_file, 'w') as f:
+                    json.dump(history, f)
+                os.replace(tmp_file, self.timeout_history_path())
+        except OSError as e:
+            self.log(f"⚠ Süre geçmişi kaydedilemedi: {e}", Colors.WARNING)
+
+    def select_impacted_tests(self):
+        """--select impacted: etki haritası ve git diff'inden çalıştırılacak testleri seç
 
+        Harita eskiyse veya değişiklik ortak bir dosyadaysa tüm suite çalışır.
+        Hiçbir test etkilenmediyse False döner (çalıştırılacak bir şey yok).
+        """
+        impact_map = load_map(os.path.join(self.report_dir, MAP_FILE))
+        tests, reason = select(impact_map, changed_files(self.impact_base), base=self.impact_base)
+        if tests is None:
+            self.log(f"Tüm suite çalıştırılacak: {reason}", Colors.OKCYAN)
             return True
+        if not tests:
+            self.log(f"{self.impact_base}'den bu yana değişiklikler hiçbir testi etkilemiyor ({reason})",
+                     Colors.OKGREEN)
+            return False
+        self.only_tests = tests
+        self.log(f"Etkilenen {len(tests)} test/dosya çalıştırılacak ({reason}):", Colors.HEADER)
+        for test in tests:
+            print(f"  {test}")
+        return True
+
+    def save_impact_map(self):
+        """Controller'ın kaydettiği test bağımlılıklarını bu commit'in etki haritası olarak sakla"""
+        if not self.results.impact_map:
+            return
+        commit = head_commit()
+        if not commit:
+            self.log("⚠ Etki haritası kaydedilmedi: git commit'i okunamadı", Colors.WARNING)
+            return
+        try:
+            path = os.path.join(self.report_dir, MAP_FILE)
+            with file_lock(path):
+                save_map(path, commit, self.results.impact_map)
+            self.log(f"✓ Etki haritası güncellendi ({len(self.results.impact_map)} test)", Colors.OKGREEN)
+        except OSError as e:
+            self.log(f"⚠ Etki haritası kaydedilemedi: {e}", Colors.WARNING)
+
+    def index_report(self):
+        """Raporu geçmiş indeksine ekle ve eski ham logları sıkıştır"""
+        try:
+            index = ReportIndex(os.path.join(self.report_dir, DB_NAME))
+            try:
+                if self.rerun_failed:
+                    # Denemeler önceki çalıştırmanın raporuna eklendi: o çalıştırma yeniden okunur
+                    index.add_run(self.report_file, replace=True)
+                # Yalnızca henüz indekslenmemiş raporlar eklenir (ilk kullanımda eski raporlar da)
+                index.backfill(self.report_dir)
+                compacted = index.compact(self.keep_raw_reports)
+            finally:
+                index.close()
+            self.log(f"✓ Rapor indekse eklendi ({compacted} eski log sıkıştırıldı)", Colors.OKGREEN)
+        except Exception as e:
+            # İndeks hatası test sonucunu etkilememeli
+            self.log(f"⚠ Rapor indekslenemedi: {e}", Colors.WARNING)
+
+    def manifest_hash(self):
+        """Chrome Node altyapısını tanımlayan manifest'lerin hash'i"""
+        digest = hashlib.sha256()
+        for name in WARM_MANIFESTS:
+            path = self.manifests_dir / name
+            if path.exists():
+                digest.update(name.encode())
+                digest.update(path.read_bytes())
+        return digest.hexdigest()[:16]
+
+    def detect_warm_cluster(self):
+        """Aynı manifest'lerle kurulmuş, çalışır durumda bir namespace var mı"""
+        self.log("\nWarm cluster aranıyor...", Colors.HEADER)
+        try:
+            namespace = self.kube.find('Namespace', self.namespace)
+            if not namespace or namespace.get('status', {}).get('phase') == 'Terminating':
+                self.log("  Mevcut namespace yok, tam kurulum yapılacak", Colors.WARNING)
+                return False
+            annotations = namespace['metadata'].get('annotations') or {}
+            if annotations.get(ANNOTATION_MANIFEST_HASH) != self.manifest_hash():
+                self.log("  Manifest'ler değişmiş, tam kurulum yapılacak", Colors.WARNING)
+                return False
+            if not self.kube.find('Deployment', 'chrome-node'):
+                self.log("  Chrome Node deployment yok, tam kurulum yapılacak", Colors.WARNING)
+                return False
+        except Exception as e:
+            self.log(f"  Warm cluster kontrol edilemedi ({e}), tam kurulum yapılacak", Colors.WARNING)
+            return False
+        self.log("✓ Warm cluster bulundu, Chrome Node'lar yeniden kullanılacak", Colors.OKGREEN)
+        return True
+
+    def mark_run_started(self):
+        """Çalıştırma sürerken --reap-idle node'ları sıfıra indirmesin diye namespace'i işaretle"""
+        try:
+            self.kube.patch('Namespace', self.namespace, {"metadata": {"annotations": {
+                ANNOTATION_RUN_STARTED: str(int(time.time())),
+            }}})
+            self.run_marked = True
+        except Exception as e:
+            self.log(f"⚠ Çalıştırma işareti yazılamadı: {e}", Colors.WARNING)
+        return True
+
+    def mark_warm_state(self):
+        """Namespace'e manifest hash'ini ve son çalıştırma zamanını yaz (--reuse ve --reap-idle için)"""
+        try:
+            self.kube.patch('Namespace', self.namespace, {"metadata": {"annotations": {
+                ANNOTATION_MANIFEST_HASH: self.manifest_hash(),
+                ANNOTATION_LAST_RUN: str(int(time.time())),
+                ANNOTATION_IDLE_TTL: str(self.idle_ttl),
+                ANNOTATION_RUN_STARTED: None,  # merge patch'te null annotation'ı siler
+            }}})
+            self.run_marked = False
+        except Exception as e:
+            self.log(f"⚠ Warm cluster durumu kaydedilemedi: {e}", Colors.WARNING)
+        return True
+
+    def clear_run_marker(self):
+        """Başarısız çalıştırmanın işaretini kaldır; idle süresi bu andan sayılır (manifest hash'i yazılmaz)"""
+        try:
+            self.kube.patch('Namespace', self.namespace, {"metadata": {"annotations": {
+                ANNOTATION_LAST_RUN: str(int(time.time())),
+                ANNOTATION_RUN_STARTED: None,
+            }}})
+            self.run_marked = False
+        except Exception as e:
+            self.log(f"⚠ Çalıştırma işareti kaldırılamadı: {e}", Colors.WARNING)
 
+    def reap_idle(self):
+        """Idle TTL'i dolmuş warm cluster'ın Chrome Node pod'larını sıfıra indir"""
+        self.log("\nIdle warm cluster kontrol ediliyor...", Colors.HEADER)
+        try:
+            namespace = self.kube.find('Namespace', self.namespace)
+            if not namespace:
+                self.log("  Namespace yok, yapılacak bir şey yok", Colors.OKGREEN)
+                return True
+            annotations = namespace['metadata'].get('annotations') or {}
+            started = annotations.get(ANNOTATION_RUN_STARTED)
+            if started and time.time() - int(started) < RUN_MARKER_STALE_AFTER:
+                self.log(f"  Süren bir çalıştırma var ({(time.time() - int(started)) / 60:.0f} dk önce başladı), "
+                         f"node'lar korunuyor", Colors.OKGREEN)
+                return True
+            if ANNOTATION_LAST_RUN not in annotations:
+                # Hiç tamamlanmış çalıştırma yok (ör. ilk kurulum sürüyor): ne zamandır boşta olduğu bilinmez
+                self.log("  Son çalıştırma zamanı yok, node'lar korunuyor", Colors.OKGREEN)
+                return True
+            last_run = int(annotations[ANNOTATION_LAST_RUN])
+            ttl = int(annotations.get(ANNOTATION_IDLE_TTL, self.idle_ttl))
+            idle = time.time() - last_run
+            if idle < ttl:
+                self.log(f"  Son çalıştırma {idle / 60:.0f} dk önce (TTL {ttl / 60:.0f} dk), node'lar korunuyor",
+                         Colors.OKGREEN)
+                return True
+            self.kube.scale('chrome-node', 0)
+            self.log(f"✓ {idle / 60:.0f} dk boşta kalan Chrome Node'lar sıfıra indirildi", Colors.OKGREEN)
+            return True
         except Exception as e:
-            self.log(f"✗ Rapor kaydetme hatası: {e}", Colors.FAIL)
+            self.log(f"✗ Idle kontrolü başarısız: {e}", Colors.FAIL)
             return False
 
-    def cleanup(self):
-        """Tüm kaynakları temizle"""
-        self.log("\nKaynaklar temizleniyor...", Colors.HEADER)
+    def cleanup(self, wait=True):
+        """Tüm kaynakları (bu çalıştırmanın namespace'ini) temizle; wait=False silmeyi başlatıp döner"""
+        self.log(f"\nKaynaklar temizleniyor ({self.namespace})...", Colors.HEADER)
         try:
-            self.run_command(f"kubectl delete namespace {self.namespace}")
+            self.kube.delete_namespace(wait=wait)
             self.log("✓ Tüm kaynaklar temizlendi", Colors.OKGREEN)
             return True
         except:
@@ -347,29 +1336,76 @@ class KubernetesDeployer:
         self.log("Kubernetes Test Automation Deployment", Colors.BOLD)
         self.log(f"{'='*60}\n", Colors.BOLD)
 
+        if self.rerun_failed and not self.load_last_failures():
+            return True
+        if not self.rerun_failed and self.select == 'impacted' and not self.select_impacted_tests():
+            return True
+
         # Ön kontroller
+        if yaml is None:
+            # Job manifest'i şablonlanamaz; Chrome Node'lar kurulduktan sonra değil, baştan dur
+            self.log("✗ PyYAML yüklü değil: pip3 install -r requirements.txt", Colors.FAIL)
+            return False
         if not self.check_kubectl():
             return False
         if not self.check_cluster_connection():
             return False
 
-        # Deploy adımları
+        # --reuse: aynı manifest'lerle kurulu namespace varsa yalnızca scale edip yeni test başlat
+        self.warm = self.reuse and self.detect_warm_cluster()
+        if self.auto_nodes:
+            self.size_chrome_nodes()
+
+        # Deploy adımları ve bağımlılıkları; bağımsız adımlar paralel çalışır
         steps = [
-            ("Namespace", self.create_namespace),
-            ("ConfigMap", self.deploy_configmap),
-            ("Chrome Node Service", self.deploy_chrome_node_service),
-            ("Chrome Node Deployment", self.scale_chrome_nodes),
-            ("Chrome Node Readiness", self.wait_for_chrome_nodes_ready),
-            ("Service Verification", self.verify_chrome_node_service),
-            ("Test Controller", self.deploy_test_controller),
-            ("Test Execution", self.monitor_test_execution),
-            ("Save Reports", self.save_test_reports)
+            ("Namespace", self.create_namespace, []),
+            ("Run Marker", self.mark_run_started, ["Namespace"]),
+            ("ConfigMap", self.deploy_configmap, ["Namespace"]),
+            ("Chrome Node Service", self.deploy_chrome_node_service, ["Namespace"]),
+            ("Chrome Node Deployment", self.scale_chrome_nodes, ["Run Marker"]),
+            ("Test Controller Image", self.prepull_test_controller_image, ["Namespace"]),
+            ("Chrome Node Readiness", self.wait_for_chrome_nodes_ready, ["Chrome Node Deployment"]),
+            ("Service Verification", self.verify_chrome_node_service,
+             ["Chrome Node Service", "Chrome Node Readiness"]),
+            ("Chrome Node Endpoints", self.publish_chrome_node_endpoints,
+             ["ConfigMap", "Service Verification"]),
+            ("Test Controller", self.deploy_test_controller, ["Chrome Node Endpoints"]),
+            ("Test Execution", self.monitor_test_execution, ["Test Controller"]),
+            ("Reruns", self.rerun_failures, ["Test Execution"]),
+            ("Save Reports", self.save_test_reports, ["Reruns"]),
+            ("Chrome Node Release", self.release_chrome_nodes, ["Reruns"]),
+            ("Warm State", self.mark_warm_state, ["Save Reports"])
         ]
+        skipped = set() if self.reruns > self.results.attempt else {"Reruns"}
+        if not self.auto_nodes or self.reuse:
+            skipped.add("Chrome Node Release")
+        if self.run_id:
+            # İzole namespace çalıştırma sonunda silinir, warm state tutulmaz
+            skipped |= {"Run Marker", "Warm State"}
+        if self.warm:
+            skipped |= {"Namespace", "Chrome Node Service", "Test Controller Image"}
+        if skipped:
+            # Atlanan adıma bağlı adımlar onun bağımlılıklarını devralır
+            deps_of = {name: deps for name, _, deps in steps}
 
-        for step_name, step_func in steps:
-            if not step_func():
-                self.log(f"\n✗ Deployment başarısız: {step_name} adımında hata", Colors.FAIL)
-                return False
+            def resolve(deps):
+                return [dep for name in deps for dep in (resolve(deps_of[name]) if name in skipped else [name])]
+
+            steps = [(name, func, resolve(deps)) for name, func, deps in steps if name not in skipped]
+
+        graph = StepGraph(steps, cancel=self.cancelled)
+        success = graph.run()
+        if self.run_marked:
+            # Warm State'e ulaşılamadı: işaret kalırsa --reap-idle node'ları hiç indirmez
+            self.clear_run_marker()
+
+        self.log("\nAdım süreleri (* kritik yol):", Colors.HEADER)
+        for line in graph.timeline_lines():
+            print(line)
+
+        if not success:
+            self.log(f"\n✗ Deployment başarısız: {graph.failed_step} adımında hata", Colors.FAIL)
+            return False
 
         self.log(f"\n{'='*60}", Colors.BOLD)
         self.log("✓ Deployment başarıyla tamamlandı!", Colors.OKGREEN)
@@ -377,15 +1413,46 @@ class KubernetesDeployer:
         return True
 
 
+def run_deployer(deployer, args, isolated, run_id):
+    """Seçilen işlemi (temizlik, idle reap, kurulum) çalıştır; başarılıysa True"""
+    if args.cleanup:
+        return deployer.cleanup()
+
+    if args.reap_idle:
+        return deployer.reap_idle()
+
+    if not isolated:
+        return deployer.deploy()
+
+    # SIGTERM (ör. orchestrator'ın iptali) de finally'deki temizliğe düşsün
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+    deployer.log(f"İzole çalıştırma {run_id} ({deployer.namespace})", Colors.OKBLUE)
+    success = False
+    try:
+        success = deployer.deploy()
+    finally:
+        if not args.keep_namespace:
+            # Silme arka planda tamamlanır, eşzamanlı çalıştırmalar birbirini beklemez
+            deployer.cleanup(wait=False)
+    return success
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Kubernetes Test Automation Deployment Script'
     )
     parser.add_argument(
         '--node-count',
-        type=int,
+        type=lambda value: value if value == 'auto' else int(value),
         default=2,
-        help='Chrome Node pod sayısı (1-5 arası, varsayılan: 2)'
+        help='Chrome Node pod sayısı (1-5 arası) veya auto: test süresi geçmişi, --target-duration ve '
+             'cluster\'ın boş kapasitesinden hesaplanır, işi biten node\'lar hemen bırakılır (varsayılan: 2)'
+    )
+    parser.add_argument(
+        '--target-duration',
+        type=int,
+        default=DEFAULT_TARGET_DURATION,
+        help=f'--node-count auto için hedef test süresi, saniye (varsayılan: {DEFAULT_TARGET_DURATION})'
     )
     parser.add_argument(
         '--manifests-dir',
@@ -404,20 +1471,155 @@ def main():
         default='/home/ec2-user/TestOps/reports',
         help='Test raporlarının kaydedileceği dizin (varsayılan: /home/ec2-user/TestOps/reports)'
     )
+    parser.add_argument(
+        '--keep-artifacts-mb',
+        type=int,
+        default=DEFAULT_KEEP_ARTIFACTS_MB,
+        help='Başarısız testlerin artifact arşivlerine (ekran görüntüsü, sayfa kaynağı, konsol) ayrılan toplam alan, '
+             f'MB; aşılınca en eskiler silinir (varsayılan: {DEFAULT_KEEP_ARTIFACTS_MB})'
+    )
+    parser.add_argument(
+        '--keep-raw-reports',
+        type=int,
+        default=50,
+        help='Ham (sıkıştırılmamış) tutulacak son rapor sayısı, eskiler gzip\'lenir (varsayılan: 50)'
+    )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        '--backend',
+        choices=['kubectl', 'api'],
+        default='kubectl',
+        help='Cluster erişimi: her işlem için kubectl process\'i (kubectl) veya '
+             'kalıcı bağlantılı API client (api, PyYAML gerekir) (varsayılan: kubectl)'
+    )
+    parser.add_argument(
+        '--kubeconfig',
+        type=str,
+        default=None,
+        help='api backend için kubeconfig dosyası (varsayılan: $KUBECONFIG veya ~/.kube/config)'
+    )
 
-    deployer = KubernetesDeployer(
-        manifests_dir=args.manifests_dir,
-        node_count=args.node_count
+    parser.add_argument(
+        '--reruns',
+        type=int,
+        default=0,
+        help='Başarısız testleri aynı Chrome Node\'larda en fazla N kez tekrar çalıştır, sonuçlar tek raporda birleşir'
+    )
+    parser.add_argument(
+        '--rerun-failed',
+        action='store_true',
+        help='Yalnızca son kayıtlı çalıştırmanın başarısız testlerini çalıştır (--reuse ile warm cluster\'da)'
+    )
+    parser.add_argument(
+        '--select',
+        choices=['all', 'impacted'],
+        default='all',
+        help='Çalıştırılacak testler: tümü veya kayıtlı etki haritasına göre --impact-base\'den bu yana '
+             'değişikliklerden etkilenenler; harita eskiyse tüm suite (varsayılan: all)'
+    )
+    parser.add_argument(
+        '--impact-base',
+        type=str,
+        default='HEAD',
+        help='--select impacted için karşılaştırılacak git ref, örn. origin/main (varsayılan: HEAD)'
+    )
+    parser.add_argument(
+        '--test-timeout',
+        type=int,
+        default=None,
+        help='Test süresi limiti (saniye); verilmezse rapor geçmişindeki beklenen süreden hesaplanır'
+    )
+    parser.add_argument(
+        '--timeout-factor',
+        type=float,
+        default=2.0,
+        help='Beklenen test süresine uygulanan güvenlik çarpanı (varsayılan: 2.0)'
     )
-    deployer.report_dir = args.report_dir
 
-    if args.cleanup:
-        success = deployer.cleanup()
-        sys.exit(0 if success else 1)
+    parser.add_argument(
+        '--shards',
+        type=int,
+        default=1,
+        help='Testleri bu kadar pod\'a bölen Indexed Job (en fazla --node-count, varsayılan: 1)'
+    )
+    parser.add_argument(
+        '--reuse',
+        action='store_true',
+        help='Aynı manifest\'lerle kurulu namespace varsa yeniden kurmadan kullan, '
+             'Chrome Node\'ları bir sonraki çalıştırma için açık bırak'
+    )
+    parser.add_argument(
+        '--idle-ttl',
+        type=int,
+        default=30,
+        help='Warm cluster bu kadar dakika çalıştırma almazsa --reap-idle node\'ları sıfıra indirir (varsayılan: 30)'
+    )
+    parser.add_argument(
+        '--reap-idle',
+        action='store_true',
+        help='Idle TTL\'i dolmuş warm cluster\'ı sıfıra scale et ve çık (cron için)'
+    )
+    parser.add_argument(
+        '--isolated',
+        action='store_true',
+        help=f'Çalıştırmayı kendine ait {DEFAULT_NAMESPACE}-<run id> namespace\'inde kur, '
+             f'bitince (hata veya SIGTERM dahil) namespace\'i sil'
+    )
+    parser.add_argument(
+        '--run-id',
+        type=str,
+        default=None,
+        help='İzole çalıştırmanın id\'si (--isolated\'ı içerir; varsayılan: zaman damgası + rastgele ek). '
+             '--cleanup ile yalnızca bu çalıştırmanın namespace\'ini siler'
+    )
+    parser.add_argument(
+        '--keep-namespace',
+        action='store_true',
+        help='İzole çalıştırmanın namespace\'ini sonunda silme (hata ayıklamak için)'
+    )
+
+    args = parser.parse_args()
+    if args.run_id is not None and not RUN_ID_RE.match(args.run_id):
+        parser.error('--run-id küçük harf, rakam ve - içermeli (en fazla 32 karakter)')
+    isolated = args.isolated or args.run_id is not None
+    if isolated and (args.reuse or args.reap_idle):
+        parser.error('--isolated/--run-id, --reuse ve --reap-idle ile birlikte kullanılamaz')
+    if args.cleanup and args.isolated and args.run_id is None:
+        parser.error('--cleanup --isolated için --run-id gerekli')
+    run_id = (args.run_id or new_run_id()) if isolated else None
+
+    try:
+        deployer = KubernetesDeployer(
+            manifests_dir=args.manifests_dir,
+            node_count=2 if args.node_count == 'auto' else args.node_count,
+            backend=args.backend,
+            kubeconfig=args.kubeconfig,
+            run_id=run_id
+        )
+    except Exception as e:
+        print(f"{Colors.FAIL}✗ {args.backend} backend başlatılamadı: {e}{Colors.ENDC}")
+        sys.exit(1)
+    deployer.report_dir = args.report_dir
+    deployer.keep_raw_reports = args.keep_raw_reports
+    deployer.keep_artifacts_mb = args.keep_artifacts_mb
+    deployer.auto_nodes = args.node_count == 'auto'
+    deployer.target_duration = args.target_duration
+    # İzole çalıştırma warm cluster kullanmaz, --rerun-failed yeni namespace'te çalışır
+    deployer.reuse = args.reuse or (args.rerun_failed and not isolated)
+    deployer.reruns = max(0, args.reruns)
+    deployer.rerun_failed = args.rerun_failed
+    deployer.select = args.select
+    deployer.impact_base = args.impact_base
+    deployer.shards = max(1, args.shards)
+    deployer.fixed_test_timeout = args.test_timeout
+    deployer.timeout_factor = args.timeout_factor
+    deployer.idle_ttl = args.idle_ttl * 60
 
-    success = deployer.deploy()
+    try:
+        success = run_deployer(deployer, args, isolated, run_id)
+    finally:
+        # api backend'in bağlantıları ve kubeconfig'den açılan geçici anahtar dosyaları
+        deployer.kube.close()
     sys.exit(0 if success else 1)
 
 
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Test Etki Haritası
+Controller'ın çalıştırma sırasında kaydettiği test -> page object modülü / sınıfı
+haritasını saklar ve bir git diff'inden etkilenen testleri seçer. Page object
+modülündeki değişiklik yalnızca sınıf gövdelerine dokunuyorsa o sınıfları
+kullanan testler seçilir.
+
+Harita kaydedildiği commit ile birlikte tutulur. Harita yoksa, o commit bu
+checkout'ta bulunamıyorsa veya değişiklik haritanın bilmediği ortak bir dosyaya
+(conftest, utils, manifest'ler...) dokunuyorsa tüm suite çalıştırılır.
+
+Örnekler:
+    python3 impact_map.py select --base origin/main
+    python3 impact_map.py show
+"""
+
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_REPORT_DIR = os.path.join(REPO_DIR, 'reports')
+MAP_FILE = 'impact-map.json'
+
+# Haritadaki yollar suite köküne (conftest.py'nin dizini) göre
+SUITE_DIR = 'TestFiles/'
+# Değişikliği yalnızca test dosyasının kendisini etkileyen dizin
+TESTS_DIR = 'tests/'
+# Haritada hiçbir testin kullanmadığı bir dosyası değişirse hiçbir test etkilenmez
+PAGES_DIR = 'pages/'
+# Suite dışında olsa da tüm testleri etkileyen yollar (controller imajı ve Job tanımı)
+FULL_SUITE_PATHS = ('k8s/manifests/', 'docker/', 'Dockerfile', 'docker-compose.test.yaml')
+# git diff -U0 hunk başlığı: @@ -eski_başlangıç[,sayı] +yeni_başlangıç[,sayı] @@
+HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+def run_git(*args, cwd=None):
+    """git komutunun çıktısı; git yoksa veya hata verirse None"""
+    try:
+        result = subprocess.run(['git', *args], cwd=cwd or REPO_DIR, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout
+
+
+def head_commit(cwd=None):
+    output = run_git('rev-parse', 'HEAD', cwd=cwd)
+    return output.strip() if output else None
+
+
+def changed_files(base, cwd=None):
+    """`base`'den bu yana değişen (commit'lenmiş ve commit'lenmemiş) dosyalar; hata olursa None"""
+    output = run_git('diff', '--name-only', base, cwd=cwd)
+    if output is None:
+        return None
+    return [line for line in output.splitlines() if line.strip()]
+
+
+def diff_hunks(ref, path, cwd=None):
+    """`ref`'ten çalışma ağacına `path`'in değişen satır aralıkları: [((eski başlangıç, sayı), (yeni başlangıç, sayı))]"""
+    output = run_git('diff', '-U0', ref, '--', path, cwd=cwd)
+    if output is None:
+        return None
+    hunks = []
+    for line in output.splitlines():
+        match = HUNK_RE.match(line)
+        if match:
+            old_start, old_count, new_start, new_count = match.groups()
+            hunks.append(((int(old_start), int(1 if old_count is None else old_count)),
+                          (int(new_start), int(1 if new_count is None else new_count))))
+    return hunks
+
+
+def class_spans(source):
+    """Modülün üst düzey sınıfları: [(isim, ilk satır, son satır)] (dekoratörler dahil); ayrıştırılamazsa None"""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+    return [(node.name, min([node.lineno] + [d.lineno for d in node.decorator_list]), node.end_lineno)
+            for node in tree.body if isinstance(node, ast.ClassDef)]
+
+
+def changed_classes(path, refs, cwd=None):
+    """`refs`'ten bu yana `path` modülünde değişen sınıflar
+
+    Değişiklik herhangi bir sınıfın dışına (import, modül sabiti...) da
+    dokunuyorsa veya modül okunamıyorsa None döner: modülün tamamı değişmiş sayılır.
+    """
+    try:
+        with open(os.path.join(cwd or REPO_DIR, path)) as f:
+            new_spans = class_spans(f.read())
+    except OSError:
+        return None
+    classes = set()
+    for ref in refs:
+        hunks = diff_hunks(ref, path, cwd=cwd)
+        old_source = run_git('show', f"{ref}:{path}", cwd=cwd)
+        old_spans = class_spans(old_source) if old_source is not None else []
+        if hunks is None or new_spans is None or old_spans is None:
+            return None
+        for (old_start, old_count), (new_start, new_count) in hunks:
+            for spans, start, count in ((old_spans, old_start, old_count), (new_spans, new_start, new_count)):
+                for line in range(start, start + count):
+                    owner = next((name for name, first, last in spans if first <= line <= last), None)
+                    if owner is None:
+                        return None
+                    classes.add(owner)
+    return classes
+
+
+def load_map(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_map(path, commit, tests):
+    """Kaydedilen testleri mevcut haritanın üzerine yaz (çalışmayan testlerin kaydı korunur)"""
+    impact_map = load_map(path) or {}
+    merged = dict(impact_map.get('tests', {}))
+    merged.update(tests)
+    tmp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump({'commit': commit, 'tests': merged}, f, indent=2, sort_keys=True)
+    os.replace(tmp_file, path)
+
+
+def select(impact_map, changed, cwd=None, base=None):
+    """Değişikliklerden etkilenen testler: (test ID'leri/test dosyaları, neden)
+
+    `changed` `base`'den bu yana değişen dosyalardır; `base` verilirse page
+    object modüllerinin değişen satırları sınıflara eşlenir. Tüm suite
+    gerekiyorsa liste yerine None döner; boş liste hiçbir testin etkilenmediğini
+    gösterir.
+    """
+    if not impact_map or not impact_map.get('tests'):
+        return None, 'etki haritası yok'
+    commit = impact_map.get('commit')
+    if not commit or run_git('cat-file', '-e', f"{commit}^{{commit}}", cwd=cwd) is None:
+        return None, f"haritanın commit'i ({commit or '?'}) bu checkout'ta yok"
+    # Harita kaydedildikten sonraki değişiklikler de hesaba katılır
+    since_map = changed_files(commit, cwd=cwd)
+    if changed is None or since_map is None:
+        return None, 'git diff alınamadı'
+
+    tests = impact_map['tests']
+    users = {}  # suite'e göre dosya yolu -> onu kullanan testler
+    for test, entry in tests.items():
+        for module in entry.get('modules', []):
+            users.setdefault(module, set()).add(test)
+
+    selected = set()
+    for path in sorted(set(changed) | set(since_map)):
+        if path.startswith(FULL_SUITE_PATHS):
+            return None, f"{path} değişti"
+        if not path.startswith(SUITE_DIR):
+            continue
+        suite_path = path[len(SUITE_DIR):]
+        if suite_path.startswith(TESTS_DIR):
+            if suite_path.endswith('.py'):
+                # Test dosyası: haritada olmayan yeni testler dahil dosyanın tamamı
+                selected.add(suite_path)
+            continue
+        if suite_path in users:
+            classes = None
+            if suite_path.startswith(PAGES_DIR) and suite_path.endswith('.py'):
+                classes = changed_classes(path, [commit] + ([base] if base else []), cwd=cwd)
+            if classes is None:
+                selected |= users[suite_path]
+            else:
+                # Haritadaki sınıf adları modülün import adıyla: pages.qa_jobs_page.QAJobsPage
+                module = suite_path[:-len('.py')].replace('/', '.')
+                names = {f"{module}.{name}" for name in classes}
+                selected |= {test for test in users[suite_path]
+                             if 'classes' not in tests[test] or names & set(tests[test]['classes'])}
+        elif not suite_path.startswith(PAGES_DIR):
+            return None, f"{path} değişti (testlere bağımlılığı kaydedilmiyor)"
+
+    # Dosyanın tamamı seçildiyse içindeki tek tek testler ayrıca gerekmez
+    files = {test for test in selected if '::' not in test}
+    selected = files | {test for test in selected if test.split('::')[0] not in files}
+    return sorted(selected), f"{len(tests)} testlik haritaya göre"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Test etki haritası ve etkilenen test seçimi')
+    parser.add_argument(
+        '--report-dir',
+        default=DEFAULT_REPORT_DIR,
+        help=f'Rapor dizini (varsayılan: {DEFAULT_REPORT_DIR})'
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+    selection = commands.add_parser('select', help='Git diff\'inden etkilenen testleri listele')
+    selection.add_argument('--base', default='HEAD', help='Karşılaştırılacak git ref (varsayılan: HEAD)')
+    commands.add_parser('show', help='Haritadaki testleri ve kullandıkları modülleri listele')
+    args = parser.parse_args()
+
+    impact_map = load_map(os.path.join(args.report_dir, MAP_FILE))
+    if args.command == 'select':
+        tests, reason = select(impact_map, changed_files(args.base), base=args.base)
+        if tests is None:
+            print(f"Tüm suite ({reason})", file=sys.stderr)
+            return 0
+        print(f"{len(tests)} test/dosya etkilendi ({reason})", file=sys.stderr)
+        for test in tests:
+            print(test)
+    elif args.command == 'show':
+        if not impact_map:
+            print('Etki haritası yok')
+            return 0
+        print(f"commit {impact_map.get('commit')}")
+        for test, entry in sorted(impact_map.get('tests', {}).items()):
+            print(f"{test}\n    {', '.join(entry.get('modules', []))}")
+            if entry.get('classes'):
+                print(f"    {', '.join(entry['classes'])}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,668 @@
+"""
+Kubernetes erişim katmanı
+deploy.py'nin kullandığı cluster işlemlerini iki backend ile sunar:
+
+- KubectlBackend: her işlem için kubectl process'i çalıştırır (varsayılan)
+- ApiBackend: kubeconfig'i okuyup API server ile kalıcı, havuzlanmış HTTP(S)
+  bağlantıları üzerinden konuşur; işlem başına process/auth başlatma maliyeti yoktur
+
+Her iki backend aynı işlemleri aynı veri şekilleriyle (Kubernetes JSON objeleri,
+log satırları) döndürür, böylece deploy.py hangisinin kullanıldığını bilmez.
+"""
+
+import atexit
+import base64
+import http.client
+import json
+import os
+import queue
+import shlex
+import socket
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from urllib.parse import urlencode, urlparse
+
+try:
+    import yaml
+except ImportError:  # api backend ve şablonlanan manifest'ler (Job) için gerekli
+    yaml = None
+
+
+# kind -> (API prefix, plural, namespaced)
+RESOURCES = {
+    'Namespace': ('/api/v1', 'namespaces', False),
+    'ConfigMap': ('/api/v1', 'configmaps', True),
+    'Service': ('/api/v1', 'services', True),
+    'Endpoints': ('/api/v1', 'endpoints', True),
+    'Pod': ('/api/v1', 'pods', True),
+    'Node': ('/api/v1', 'nodes', False),
+    'Deployment': ('/apis/apps/v1', 'deployments', True),
+    'DaemonSet': ('/apis/apps/v1', 'daemonsets', True),
+    'Job': ('/apis/batch/v1', 'jobs', True),
+}
+
+FIELD_MANAGER = 'testops-deploy'
+# Watch'lar iptal (stop event'i) için bu aralıkla kontrol edilir
+STOP_POLL = 0.5
+
+
+class KubeError(Exception):
+    """Cluster işlemi başarısız oldu"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+def load_manifest(path):
+    """Manifest dosyasındaki objeleri değiştirilebilir dict'ler olarak oku"""
+    if yaml is None:
+        raise KubeError(f"{path} şablonlanamadı: PyYAML gerekli (pip install pyyaml)")
+    with open(path) as f:
+        return [doc for doc in yaml.safe_load_all(f) if doc]
+
+
+def _pump_lines(stream, events):
+    """Bir process çıktısını satır satır kuyruğa aktar, bitince None koy"""
+    for line in stream:
+        events.put(line)
+    events.put(None)
+
+
+def _shutdown_on_stop(sock, stop, finished):
+    """`stop` set edilirse soketi kapat ki bloklanan okuma hemen dönsün; akış bitince çık"""
+    while not finished.wait(STOP_POLL):
+        if stop.is_set():
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            return
+
+
+def watch_events(command, timeout, restart_delay=1.0, reconnect=True, stop=None):
+    """`kubectl get --watch` komutunun her çıktı satırını bir olay olarak üret
+
+    Olaylar geldiği anda işlenir; polling ve sabit bekleme yoktur. Watch koparsa
+    (örn. kaynak henüz yok) komut yeniden başlatılır. Toplam süre `timeout` ile
+    sınırlıdır; `stop` event'i set edilince de (en geç STOP_POLL saniyede) biter.
+    Komut satır basan herhangi bir program olabileceği için testlerde kubectl
+    yerine olayları sırayla basan sahte bir script kullanılabilir.
+    """
+    stop = stop or threading.Event()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and not stop.is_set():
+        process = subprocess.Popen(
+            command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        )
+        events = queue.Queue()
+        threading.Thread(target=_pump_lines, args=(process.stdout, events), daemon=True).start()
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or stop.is_set():
+                    return
+                try:
+                    line = events.get(timeout=min(remaining, STOP_POLL))
+                except queue.Empty:
+                    continue
+                if line is None:
+                    if not reconnect:
+                        return
+                    break  # Watch sonlandı, yeniden bağlan
+                yield line.rstrip('\n')
+        finally:
+            process.kill()
+            process.wait()
+        stop.wait(max(0, min(restart_delay, deadline - time.monotonic())))
+
+
+class KubectlBackend:
+    """Her işlemi bir kubectl process'i ile yapan backend"""
+
+    name = 'kubectl'
+
+    def __init__(self, namespace, run_command, kubectl='kubectl'):
+        self.namespace = namespace
+        self.run_command = run_command
+        self.kubectl = kubectl
+
+    def close(self):
+        """Kalıcı kaynak yok; ApiBackend ile aynı arayüz için"""
+
+    def check_client(self):
+        self.run_command(f"{self.kubectl} version --client")
+
+    def check_cluster(self):
+        self.run_command(f"{self.kubectl} cluster-info")
+
+    def apply_manifest(self, path):
+        self.run_command(f"{self.kubectl} apply -f {path}")
+
+    def apply_object(self, obj):
+        # kubectl JSON manifest'i de kabul eder
+        with tempfile.NamedTemporaryFile('w', suffix='.json', prefix='testops-') as f:
+            json.dump(obj, f)
+            f.flush()
+            self.apply_manifest(f.name)
+
+    def patch_configmap(self, name, data):
+        patch = json.dumps({"data": data})
+        self.run_command(
+            f"{self.kubectl} patch configmap {name} -n {self.namespace} --type merge -p {shlex.quote(patch)}"
+        )
+
+    def patch(self, kind, name, body):
+        self.run_command(
+            f"{self.kubectl} patch {kind.lower()} {name} -n {self.namespace} "
+            f"--type merge -p {shlex.quote(json.dumps(body))}"
+        )
+
+    def scale(self, deployment, replicas):
+        self.run_command(
+            f"{self.kubectl} scale deployment {deployment} -n {self.namespace} --replicas={replicas}"
+        )
+
+    def get(self, kind, name):
+        result = self.run_command(f"{self.kubectl} get {kind.lower()} {name} -n {self.namespace} -o json")
+        return json.loads(result.stdout)
+
+    def find(self, kind, name):
+        """Obje yoksa hata yerine None döndür"""
+        result = self.run_command(
+            f"{self.kubectl} get {kind.lower()} {name} -n {self.namespace} --ignore-not-found -o json"
+        )
+        return json.loads(result.stdout) if result.stdout.strip() else None
+
+    def list_objects(self, kind, selector=None, all_namespaces=False):
+        """Türdeki objeler (namespace'li türlerde bu namespace'tekiler veya tümü)"""
+        scope = "-A" if all_namespaces else f"-n {self.namespace}"
+        selector_arg = f" -l {selector}" if selector else ""
+        result = self.run_command(f"{self.kubectl} get {kind.lower()} {scope}{selector_arg} -o json")
+        return json.loads(result.stdout).get('items', [])
+
+    def watch(self, kind, name=None, selector=None, timeout=300, stop=None):
+        """Kaynağın her değişikliğinde güncel objeyi üret (`stop` set edilince biter)"""
+        target = f"{kind.lower()} {name}" if name else kind.lower()
+        selector_arg = f" -l {selector}" if selector else ""
+        command = f"{self.kubectl} get {target} -n {self.namespace}{selector_arg} --watch -o json"
+        # kubectl her objeyi girintili JSON olarak basar; kök obje "{" satırıyla başlar,
+        # "}" satırıyla biter. Watch obje ortasında koparsa yarım kalan kısım atılır.
+        buffer = []
+        for line in watch_events(command, timeout, stop=stop):
+            if line == "{":
+                buffer = []
+            buffer.append(line)
+            if line == "}":
+                try:
+                    yield json.loads("\n".join(buffer))
+                except ValueError:
+                    pass
+                buffer = []
+
+    def stream_logs(self, pod, timeout):
+        command = f"{self.kubectl} logs -f {pod} -n {self.namespace}"
+        yield from watch_events(command, timeout, reconnect=False)
+
+    @contextmanager
+    def exec_stream(self, pod, command):
+        """Pod'da komut çalıştır, stdout'unu okunabilir binary stream olarak ver (ör. tar arşivi)"""
+        process = subprocess.Popen(
+            f"{self.kubectl} exec {pod} -n {self.namespace} -- {shlex.join(command)}",
+            shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        try:
+            yield process.stdout
+            _, stderr = process.communicate(timeout=60)
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+        if process.returncode:
+            raise KubeError(f"exec {pod}: {stderr.decode(errors='replace').strip()}")
+
+    def delete(self, kind, name):
+        self.run_command(
+            f"{self.kubectl} delete {kind.lower()} {name} -n {self.namespace} --ignore-not-found --wait=false"
+        )
+
+    def delete_namespace(self, wait=True):
+        """Namespace'i sil; wait=False ise silme başlatılıp hemen dönülür"""
+        wait_arg = "" if wait else " --wait=false"
+        self.run_command(f"{self.kubectl} delete namespace {self.namespace}{wait_arg}")
+
+
+class KubeConfig:
+    """kubeconfig'in aktif context'inden bağlantı ve kimlik bilgileri"""
+
+    def __init__(self, path=None, context=None):
+        if yaml is None:
+            raise KubeError("api backend için PyYAML gerekli (pip install pyyaml)")
+        path = path or os.getenv('KUBECONFIG', '').split(os.pathsep)[0] or os.path.expanduser('~/.kube/config')
+        with open(path) as f:
+            config = yaml.safe_load(f)
+        self.base_dir = os.path.dirname(os.path.abspath(path))
+
+        context_name = context or config.get('current-context')
+        context = self._named(config.get('contexts'), context_name)
+        self.cluster = self._named(config.get('clusters'), context['cluster'])
+        self.user = self._named(config.get('users'), context.get('user')) if context.get('user') else {}
+        self.namespace = context.get('namespace')
+        self.server = self.cluster['server'].rstrip('/')
+        self._token = None
+        self._token_expiry = None
+        self._temp_files = []
+
+    @staticmethod
+    def _named(items, name):
+        for item in items or []:
+            if item.get('name') == name:
+                return item.get('context') or item.get('cluster') or item.get('user') or {}
+        raise KubeError(f"kubeconfig içinde '{name}' bulunamadı")
+
+    def _path(self, value):
+        return value if os.path.isabs(value) else os.path.join(self.base_dir, value)
+
+    def _data_file(self, data):
+        """*-data alanlarını ssl modülünün okuyabileceği geçici dosyaya yaz
+
+        Dosyalar (istemci anahtarı dahil) close() ile, çağrılmazsa çıkışta silinir.
+        """
+        if not self._temp_files:
+            atexit.register(self.cleanup)
+        handle, path = tempfile.mkstemp(prefix='testops-kube-')
+        self._temp_files.append(path)
+        with os.fdopen(handle, 'wb') as f:
+            f.write(base64.b64decode(data))
+        return path
+
+    def ssl_context(self):
+        if self.cluster.get('insecure-skip-tls-verify'):
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        elif self.cluster.get('certificate-authority-data'):
+            context = ssl.create_default_context(
+                cadata=base64.b64decode(self.cluster['certificate-authority-data']).decode()
+            )
+        elif self.cluster.get('certificate-authority'):
+            context = ssl.create_default_context(cafile=self._path(self.cluster['certificate-authority']))
+        else:
+            context = ssl.create_default_context()
+
+        if self.user.get('client-certificate-data'):
+            context.load_cert_chain(
+                self._data_file(self.user['client-certificate-data']),
+                self._data_file(self.user['client-key-data'])
+            )
+        elif self.user.get('client-certificate'):
+            context.load_cert_chain(
+                self._path(self.user['client-certificate']), self._path(self.user['client-key'])
+            )
+        return context
+
+    def token(self):
+        """Bearer token; exec plugin (örn. `aws eks get-token`) sonucu süresi dolana kadar önbellekte"""
+        if self.user.get('token'):
+            return self.user['token']
+        if self.user.get('tokenFile'):
+            with open(self._path(self.user['tokenFile'])) as f:
+                return f.read().strip()
+        exec_config = self.user.get('exec')
+        if not exec_config:
+            return None
+        if self._token and (self._token_expiry is None or time.time() < self._token_expiry - 60):
+            return self._token
+
+        env = dict(os.environ)
+        for item in exec_config.get('env') or []:
+            env[item['name']] = item['value']
+        output = subprocess.run(
+            [exec_config['command']] + list(exec_config.get('args') or []),
+            env=env, check=True, capture_output=True, text=True
+        ).stdout
+        status = json.loads(output).get('status', {})
+        self._token = status.get('token')
+        expiry = status.get('expirationTimestamp')
+        self._token_expiry = (
+            datetime.strptime(expiry, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc).timestamp()
+            if expiry else None
+        )
+        return self._token
+
+    def cleanup(self):
+        while self._temp_files:
+            try:
+                os.unlink(self._temp_files.pop())
+            except OSError:
+                pass
+
+
+class ExecStream:
+    """Pod exec WebSocket'inin (v4.channel.k8s.io) stdout kanalını okunabilir stream olarak veren sarmalayıcı
+
+    Her mesajın ilk baytı kanaldır: 1 stdout, 2 stderr, 3 komutun sonuç Status'u.
+    """
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.buffer = b''
+        self.stderr = b''
+        self.status = b''
+        self.channel = None
+        self.closed = False
+
+    def _frame(self):
+        """Bir WebSocket frame'i: (opcode, payload); bağlantı koptuysa close (8)"""
+        header = self.fp.read(2)
+        if len(header) < 2:
+            return 8, b''
+        length = header[1] & 0x7f
+        if length == 126:
+            length = int.from_bytes(self.fp.read(2), 'big')
+        elif length == 127:
+            length = int.from_bytes(self.fp.read(8), 'big')
+        mask = self.fp.read(4) if header[1] & 0x80 else None
+        payload = self.fp.read(length)
+        if mask:
+            payload = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+        return header[0] & 0x0f, payload
+
+    def _fill(self):
+        """Sıradaki mesajı kanalına dağıt; stdout verisi geldiyse True, akış bittiyse False"""
+        while not self.closed:
+            opcode, payload = self._frame()
+            if opcode == 8:
+                self.closed = True
+                break
+            if opcode in (1, 2):
+                if not payload:
+                    continue
+                self.channel, payload = payload[0], payload[1:]
+            elif opcode != 0:
+                continue  # ping/pong; 0 bir önceki mesajın devamı
+            if self.channel == 1 and payload:
+                self.buffer += payload
+                return True
+            if self.channel == 2:
+                self.stderr += payload
+            elif self.channel == 3:
+                self.status += payload
+        return False
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            while self._fill():
+                pass
+            size = len(self.buffer)
+        elif not self.buffer:
+            self._fill()
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def finish(self):
+        """Kalan çıktıyı oku; komut başarısız olduysa KubeError"""
+        while self._fill():
+            self.buffer = b''
+        try:
+            status = json.loads(self.status) if self.status else {}
+        except ValueError:
+            status = {}
+        if status.get('status', 'Success') != 'Success':
+            raise KubeError(f"exec: {status.get('message') or self.stderr.decode(errors='replace').strip()}")
+
+
+class ApiBackend:
+    """API server ile kalıcı HTTP(S) bağlantı havuzu üzerinden konuşan backend"""
+
+    name = 'api'
+
+    def __init__(self, namespace, kubeconfig=None, context=None, pool_size=4):
+        self.namespace = namespace
+        self.config = KubeConfig(kubeconfig, context)
+        server = urlparse(self.config.server)
+        self.scheme = server.scheme
+        self.host = server.hostname
+        self.port = server.port or (443 if server.scheme == 'https' else 80)
+        self.base_path = server.path.rstrip('/')
+        self.ssl_context = self.config.ssl_context() if self.scheme == 'https' else None
+        self.pool = queue.LifoQueue(maxsize=pool_size)
+
+    # --- HTTP katmanı ---
+
+    def _connect(self, timeout=30):
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, self.port, timeout=timeout, context=self.ssl_context)
+        return http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+
+    def _headers(self, content_type=None):
+        headers = {'Accept': 'application/json', 'User-Agent': FIELD_MANAGER}
+        token = self.config.token()
+        if token:
+            headers['Authorization'] = f"Bearer {token}"
+        if content_type:
+            headers['Content-Type'] = content_type
+        return headers
+
+    def request(self, method, path, body=None, content_type='application/json', query=None):
+        """Havuzdaki bir bağlantıyla istek yap, JSON cevabı döndür"""
+        url = self.base_path + path + (f"?{urlencode(query)}" if query else "")
+        payload = json.dumps(body).encode() if body is not None else None
+        for attempt in range(2):
+            try:
+                conn = self.pool.get_nowait()
+                reused = True
+            except queue.Empty:
+                conn = self._connect()
+                reused = False
+            try:
+                conn.request(method, url, body=payload, headers=self._headers(content_type if payload else None))
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, ConnectionError, socket.timeout):
+                conn.close()
+                # Sunucunun kapattığı eski keep-alive bağlantısı: yenisiyle bir kez daha dene
+                if reused and attempt == 0:
+                    continue
+                raise
+            if response.will_close:
+                conn.close()
+            else:
+                try:
+                    self.pool.put_nowait(conn)
+                except queue.Full:
+                    conn.close()
+            if response.status >= 400:
+                try:
+                    message = json.loads(data).get('message', data.decode())
+                except ValueError:
+                    message = data.decode(errors='replace')
+                raise KubeError(f"{method} {path}: HTTP {response.status} {message}", response.status)
+            return json.loads(data) if data else {}
+
+    def _stream(self, path, query, timeout, stop=None):
+        """Uzun süreli (watch/log) istek için ayrı bağlantı aç, satırları üret
+
+        `stop` set edilince soket kapatılır, okuma beklemeden biter.
+        """
+        deadline = time.monotonic() + timeout
+        conn = self._connect(timeout=timeout)
+        finished = threading.Event()
+        try:
+            conn.request('GET', f"{self.base_path}{path}?{urlencode(query)}", headers=self._headers())
+            # Connection: close cevabında conn.sock sıfırlanır; soketi önceden tut
+            sock = conn.sock
+            response = conn.getresponse()
+            if response.status >= 400:
+                raise KubeError(f"GET {path}: HTTP {response.status} {response.read().decode(errors='replace')}",
+                                response.status)
+            if stop is not None:
+                threading.Thread(target=_shutdown_on_stop, args=(sock, stop, finished), daemon=True).start()
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                sock.settimeout(remaining)
+                try:
+                    line = response.readline()
+                except socket.timeout:
+                    return
+                except (OSError, http.client.HTTPException):
+                    if stop is not None and stop.is_set():
+                        return
+                    raise
+                if not line or (stop is not None and stop.is_set()):
+                    return
+                yield line.decode(errors='replace').rstrip('\n')
+        finally:
+            finished.set()
+            conn.close()
+
+    def resource_path(self, kind, name=None, namespace=None):
+        prefix, plural, namespaced = RESOURCES[kind]
+        path = prefix
+        if namespaced:
+            path += f"/namespaces/{namespace or self.namespace}"
+        path += f"/{plural}"
+        if name:
+            path += f"/{name}"
+        return path
+
+    # --- İşlemler ---
+
+    def check_client(self):
+        # Kubeconfig __init__ içinde okundu; token alınabiliyor mu kontrol et
+        self.config.token()
+
+    def check_cluster(self):
+        self.request('GET', '/version')
+
+    def apply_manifest(self, path):
+        for document in load_manifest(path):
+            self.apply_object(document)
+
+    def apply_object(self, obj):
+        """Server-side apply (kubectl apply karşılığı)"""
+        metadata = obj['metadata']
+        self.request(
+            'PATCH',
+            self.resource_path(obj['kind'], metadata['name'], metadata.get('namespace')),
+            body=obj,
+            content_type='application/apply-patch+yaml',
+            query={'fieldManager': FIELD_MANAGER, 'force': 'true'}
+        )
+
+    def patch_configmap(self, name, data):
+        self.request(
+            'PATCH', self.resource_path('ConfigMap', name), body={"data": data},
+            content_type='application/merge-patch+json'
+        )
+
+    def patch(self, kind, name, body):
+        self.request('PATCH', self.resource_path(kind, name), body=body, content_type='application/merge-patch+json')
+
+    def scale(self, deployment, replicas):
+        self.request(
+            'PATCH', self.resource_path('Deployment', deployment) + '/scale',
+            body={"spec": {"replicas": replicas}}, content_type='application/merge-patch+json'
+        )
+
+    def get(self, kind, name):
+        return self.request('GET', self.resource_path(kind, name))
+
+    def find(self, kind, name):
+        try:
+            return self.get(kind, name)
+        except KubeError as e:
+            if e.status == 404:
+                return None
+            raise
+
+    def list_objects(self, kind, selector=None, all_namespaces=False):
+        prefix, plural, namespaced = RESOURCES[kind]
+        path = f"{prefix}/{plural}" if all_namespaces or not namespaced else self.resource_path(kind)
+        query = {'labelSelector': selector} if selector else None
+        return self.request('GET', path, query=query).get('items', [])
+
+    def watch(self, kind, name=None, selector=None, timeout=300, stop=None):
+        """Kaynağın her değişikliğinde güncel objeyi üret (ilk durum ADDED olayları ile gelir)"""
+        stop = stop or threading.Event()
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or stop.is_set():
+                return
+            query = {'watch': '1', 'timeoutSeconds': str(max(1, int(remaining)))}
+            if name:
+                query['fieldSelector'] = f"metadata.name={name}"
+            if selector:
+                query['labelSelector'] = selector
+            for line in self._stream(self.resource_path(kind), query, remaining, stop):
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if event.get('type') == 'ERROR':
+                    break  # Örn. resourceVersion çok eski: yeniden bağlan
+                yield event['object']
+            stop.wait(max(0, min(1.0, deadline - time.monotonic())))
+
+    def stream_logs(self, pod, timeout):
+        yield from self._stream(self.resource_path('Pod', pod) + '/log', {'follow': 'true'}, timeout)
+
+    @contextmanager
+    def exec_stream(self, pod, command):
+        """Pod'da komut çalıştır (exec WebSocket'i), stdout'unu okunabilir binary stream olarak ver"""
+        query = urlencode([('command', arg) for arg in command] + [('stdout', 'true'), ('stderr', 'true')])
+        headers = self._headers()
+        headers.update({
+            'Connection': 'Upgrade',
+            'Upgrade': 'websocket',
+            'Sec-WebSocket-Version': '13',
+            'Sec-WebSocket-Key': base64.b64encode(os.urandom(16)).decode(),
+            'Sec-WebSocket-Protocol': 'v4.channel.k8s.io',
+        })
+        conn = self._connect(timeout=300)
+        try:
+            conn.request('GET', f"{self.base_path}{self.resource_path('Pod', pod)}/exec?{query}", headers=headers)
+            response = conn.getresponse()
+            if response.status != 101:
+                raise KubeError(f"exec {pod}: HTTP {response.status} {response.read().decode(errors='replace')}",
+                                response.status)
+            # 101 cevabının gövdesi yok; frame'ler bağlantının kendi tamponlu okuyucusundan okunur
+            stream = ExecStream(response.fp)
+            yield stream
+            stream.finish()
+        finally:
+            conn.close()
+
+    def delete(self, kind, name):
+        try:
+            self.request('DELETE', self.resource_path(kind, name), body={"propagationPolicy": "Background"})
+        except KubeError as e:
+            if e.status != 404:
+                raise
+
+    def delete_namespace(self, wait=True):
+        # API server silmeyi arka planda bitirir; wait yalnızca kubectl için anlamlı
+        self.request('DELETE', self.resource_path('Namespace', self.namespace))
+
+    def close(self):
+        while True:
+            try:
+                self.pool.get_nowait().close()
+            except queue.Empty:
+                break
+        self.config.cleanup()
+
+
+def create_backend(name, namespace, run_command, kubectl='kubectl', kubeconfig=None, context=None):
+    """İsme göre backend oluştur ('kubectl' veya 'api')"""
+    if name == 'api':
+        return ApiBackend(namespace, kubeconfig=kubeconfig, context=context)
+    return KubectlBackend(namespace, run_command, kubectl=kubectl)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Test Çalıştırma Orkestratörü
+Birden fazla izole test çalıştırmasını tek process'ten eşzamanlı yürütür. Her
+çalıştırma kendi namespace'inde (test-automation-<run id>) bir deploy.py
+--run-id process'idir; aynı anda en fazla --parallel kadarı çalışır.
+
+Her çalıştırma kendi namespace'ini bitince kendisi siler. Zaman aşımında veya
+iptalde (Ctrl-C) process'e SIGTERM gönderilir, kapanmazsa öldürülür ve
+namespace'i ayrı bir deploy.py --cleanup ile silinir; diğer çalıştırmalar
+bunu beklemez.
+
+Örnekler:
+    python3 orchestrator.py --parallel 2 --run "--node-count 2" --run "--node-count 3 --shards 3"
+    python3 orchestrator.py --parallel 3 --repeat 3 --run "--node-count auto" --run-timeout 1800
+"""
+
+import argparse
+import asyncio
+import os
+import shlex
+import sys
+import time
+
+from deploy import DEFAULT_NAMESPACE, new_run_id
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+DEPLOY_SCRIPT = os.path.join(REPO_DIR, 'deploy.py')
+
+# SIGTERM'den sonra deploy.py'nin kendi temizliğini yapması için beklenen süre
+TERMINATE_GRACE = 30
+# Ayrı deploy.py --cleanup çalıştırmasının üst sınırı
+CLEANUP_TIMEOUT = 120
+# Çalıştırmanın izolasyonunu orchestrator yönetir; --run içinde bu deploy.py argümanları verilemez
+ISOLATION_ARGS = ('--run-id', '--isolated', '--reuse', '--reap-idle', '--cleanup')
+
+
+class Run:
+    """Tek bir izole çalıştırma: deploy.py argümanları ve sonucu"""
+
+    def __init__(self, args):
+        self.args = args
+        self.run_id = new_run_id()
+        self.namespace = f"{DEFAULT_NAMESPACE}-{self.run_id}"
+        self.returncode = None
+        self.status = 'bekliyor'
+        self.duration = 0.0
+
+
+class Orchestrator:
+    """İzole çalıştırmaları sınırlı paralellikle yürüten asyncio döngüsü"""
+
+    def __init__(self, runs, parallel=2, run_timeout=None):
+        self.runs = runs
+        self.semaphore = asyncio.Semaphore(max(1, parallel))
+        self.run_timeout = run_timeout
+        # Zorla kapatılan çalıştırmaların arka plandaki --cleanup görevleri
+        self.cleanups = set()
+
+    def output(self, run, line):
+        print(f"[{run.run_id}] {line}", flush=True)
+
+    async def start(self, run, *extra):
+        env = dict(os.environ, PYTHONUNBUFFERED='1')
+        return await asyncio.create_subprocess_exec(
+            sys.executable, DEPLOY_SCRIPT, '--run-id', run.run_id, *extra,
+            cwd=REPO_DIR, env=env,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+        )
+
+    async def pump(self, run, process):
+        """Process çıktısını satır satır run id önekiyle yazdır"""
+        async for line in process.stdout:
+            self.output(run, line.decode(errors='replace').rstrip())
+        return await process.wait()
+
+    async def execute(self, run):
+        async with self.semaphore:
+            started = time.monotonic()
+            run.status = 'çalışıyor'
+            self.output(run, f"başladı ({run.namespace}): deploy.py {shlex.join(run.args)}")
+            process = await self.start(run, *run.args)
+            try:
+                run.returncode = await asyncio.wait_for(self.pump(run, process), self.run_timeout)
+                run.status = 'başarılı' if run.returncode == 0 else 'başarısız'
+            except asyncio.TimeoutError:
+                run.status = 'zaman aşımı'
+                await self.stop(run, process)
+            except asyncio.CancelledError:
+                run.status = 'iptal'
+                await self.stop(run, process)
+                raise
+            finally:
+                run.duration = time.monotonic() - started
+                self.output(run, f"{run.status} ({run.duration:.0f}s)")
+
+    async def stop(self, run, process):
+        """SIGTERM ile deploy.py'nin kendi temizliğini yapmasını bekle, kapanmazsa öldür"""
+        if process.returncode is None:
+            try:
+                process.terminate()
+                run.returncode = await asyncio.wait_for(self.pump(run, process), TERMINATE_GRACE)
+                return
+            except ProcessLookupError:
+                pass
+            except asyncio.TimeoutError:
+                process.kill()
+                run.returncode = await process.wait()
+        # deploy.py finally'ye ulaşamadı: namespace'i bağımsız bir görev siler
+        task = asyncio.create_task(self.cleanup(run))
+        self.cleanups.add(task)
+        task.add_done_callback(self.cleanups.discard)
+
+    async def cleanup(self, run):
+        process = await self.start(run, '--cleanup')
+        try:
+            await asyncio.wait_for(self.pump(run, process), CLEANUP_TIMEOUT)
+        except asyncio.TimeoutError:
+            process.kill()
+            self.output(run, f"✗ {run.namespace} temizlenemedi, elle silin: "
+                             f"python3 deploy.py --cleanup --run-id {run.run_id}")
+
+    async def run_all(self):
+        tasks = [asyncio.create_task(self.execute(run)) for run in self.runs]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # İptalde de başlamış temizlikler tamamlansın
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if self.cleanups:
+                await asyncio.gather(*self.cleanups, return_exceptions=True)
+
+    def summary_lines(self):
+        lines = [f"{'run id':<22} {'namespace':<38} {'sonuç':<12} {'çıkış':>5} {'süre':>7}"]
+        for run in self.runs:
+            code = '-' if run.returncode is None else str(run.returncode)
+            lines.append(f"{run.run_id:<22} {run.namespace:<38} {run.status:<12} {code:>5} {run.duration:>6.0f}s")
+        return lines
+
+
+def isolation_arg(token):
+    """`--run-id=x` gibi değerli yazımlar ve argparse kısaltmaları (`--iso`) dahil izolasyon argümanı mı"""
+    name = token.split('=', 1)[0]
+    if not name.startswith('--') or len(name) <= 2:
+        return False
+    return any(option.startswith(name) for option in ISOLATION_ARGS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='İzole test çalıştırmalarını eşzamanlı yürüt')
+    parser.add_argument(
+        '--run',
+        action='append',
+        metavar='ARGS',
+        help='Bir çalıştırmanın deploy.py argümanları, tırnak içinde (tekrarlanabilir; varsayılan: tek çalıştırma)'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=1,
+        help='Her --run\'ı bu kadar kez çalıştır (varsayılan: 1)'
+    )
+    parser.add_argument(
+        '--parallel',
+        type=int,
+        default=2,
+        help='Aynı anda çalışan en fazla çalıştırma sayısı (varsayılan: 2)'
+    )
+    parser.add_argument(
+        '--run-timeout',
+        type=int,
+        default=None,
+        help='Bir çalıştırmanın süre limiti (saniye); aşılırsa durdurulup namespace\'i silinir'
+    )
+    args = parser.parse_args()
+
+    runs = []
+    for run_args in args.run or ['']:
+        split = shlex.split(run_args)
+        if any(isolation_arg(token) for token in split):
+            parser.error(f"--run içinde izolasyonu değiştiren argüman kullanılamaz: {run_args}")
+        runs += [Run(split) for _ in range(max(1, args.repeat))]
+
+    orchestrator = Orchestrator(runs, args.parallel, args.run_timeout)
+    try:
+        asyncio.run(orchestrator.run_all())
+    except KeyboardInterrupt:
+        print("\nİptal edildi", file=sys.stderr)
+
+    print()
+    for line in orchestrator.summary_lines():
+        print(line)
+    return 0 if all(run.returncode == 0 for run in runs) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
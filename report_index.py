@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+Test Rapor İndeksi
+reports/ altındaki test çalıştırmalarını SQLite'a indeksler ve geçmiş üzerinde
+süre / flaky / en yavaş çalıştırma sorgularını çalıştırır.
+
+Örnekler:
+    python3 report_index.py backfill
+    python3 report_index.py durations --last 50
+    python3 report_index.py flaky --last 20
+    python3 report_index.py slowest-run
+    python3 report_index.py expected-duration --parallelism 2
+    python3 report_index.py compact --keep 50 --artifacts-mb 500
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import shutil
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_REPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reports')
+# Controller ile aynı hesaplar (yüzdelik, örnek birleştirme, LPT) TestFiles/utils'ten alınır
+SUITE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'TestFiles')
+if SUITE_DIR not in sys.path:
+    sys.path.append(SUITE_DIR)
+
+from utils.timeouts import percentile  # noqa: E402
+
+DB_NAME = 'report-index.sqlite'
+# Başarısız testlerin ekran görüntüsü/sayfa kaynağı/konsol arşivi, çalıştırmanın logunun yanında
+ARTIFACTS_SUFFIX = '.artifacts.tar'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    -- Çalıştırmanın kimliği rapor adıdır (test-results-<zaman>[-<run id>]); dosya yolu
+    -- sıkıştırma veya rapor dizini taşınınca değişir
+    stem TEXT NOT NULL,
+    log_path TEXT NOT NULL,
+    duration REAL,
+    passed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    errors INTEGER NOT NULL DEFAULT 0,
+    skipped INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS runs_started_at ON runs(started_at);
+CREATE INDEX IF NOT EXISTS runs_duration ON runs(duration);
+
+CREATE TABLE IF NOT EXISTS tests (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+-- (test_id, run_id) anahtarı sayesinde bir testin son N çalıştırması index aralık taramasıdır
+CREATE TABLE IF NOT EXISTS results (
+    test_id INTEGER NOT NULL REFERENCES tests(id),
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    outcome TEXT NOT NULL,
+    duration REAL,
+    node TEXT,
+    PRIMARY KEY (test_id, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_run ON results(run_id);
+"""
+
+# İzole çalıştırmaların raporlarında zaman damgasından sonra run id bulunur
+REPORT_NAME_RE = re.compile(r"(?P<stem>test-results-(?P<stamp>\d{8}-\d{6})(?:-[a-z0-9-]+)?)\.log(\.gz)?$")
+# "tests/x.py::T::test PASSED [ 20%]" (pytest -v) ve "[gw0] [ 20%] PASSED tests/x.py::T::test" (xdist)
+VERBOSE_RESULT_RE = re.compile(
+    r"^(?:(?P<test>\S+::\S+) (?P<outcome>PASSED|FAILED|ERROR|SKIPPED|XFAIL|XPASS)\b"
+    r"|\[gw\d+\] \[\s*\d+%\] (?P<outcome2>PASSED|FAILED|ERROR|SKIPPED|XFAIL|XPASS) (?P<test2>\S+::\S+))"
+)
+SUMMARY_DURATION_RE = re.compile(r"^=+ .+? in (?P<seconds>[\d.]+)s\b.*=+$")
+FAILED_OUTCOMES = ('failed', 'error')
+# deploy.py --reruns: ilk denemede başarısız olup tekrar denemede geçen test
+RERUN_PASSED = 'rerun_passed'
+
+
+def report_stem(log_path):
+    """Rapor dosyasının çalıştırma kimliği (ör. test-results-20240101-120000), rapor değilse None"""
+    match = REPORT_NAME_RE.search(Path(log_path).name)
+    return match.group('stem') if match else None
+
+
+def open_text(path):
+    """Düz veya gzip'lenmiş (sıkıştırılmış) rapor dosyasını aç"""
+    if str(path).endswith('.gz'):
+        return gzip.open(path, 'rt', errors='replace')
+    return open(path, errors='replace')
+
+
+def parse_report(log_path):
+    """Bir çalıştırmanın test sonuçlarını ve süresini oku
+
+    Yanında .jsonl (yapılandırılmış sonuçlar) varsa o kullanılır; yoksa eski
+    raporlar için pytest -v çıktısı ayrıştırılır (test süreleri bilinmez).
+    Tekrar denemelerin (`attempt`) kayıtları öncekilerin yerine geçer; geçen
+    tekrar deneme `rerun_passed` olarak işaretlenir.
+    """
+    log_path = Path(log_path)
+    results = {}
+    duration = None
+
+    jsonl_path = Path(re.sub(r"\.log(\.gz)?$", ".jsonl", str(log_path)))
+    jsonl_candidates = [jsonl_path, Path(str(jsonl_path) + '.gz')]
+    jsonl = next((p for p in jsonl_candidates if p.exists()), None)
+    if jsonl is not None:
+        with open_text(jsonl) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get('event') == 'session_finish':
+                    # Çalıştırmanın süresi ilk denemeninkidir (tekrar denemeler yalnızca başarısızları koşar)
+                    if not record.get('attempt'):
+                        duration = record.get('duration')
+                elif record.get('event') == 'test':
+                    outcome = record.get('outcome')
+                    if record.get('attempt') and outcome == 'passed':
+                        outcome = RERUN_PASSED
+                    results[record['test']] = (outcome, record.get('duration'), record.get('node'))
+        if results:
+            return results, duration
+
+    with open_text(log_path) as f:
+        for line in f:
+            line = line.rstrip('\n')
+            match = VERBOSE_RESULT_RE.match(line)
+            if match:
+                test = match.group('test') or match.group('test2')
+                outcome = (match.group('outcome') or match.group('outcome2')).lower()
+                previous = results.get(test)
+                # Teardown hatası PASSED satırından sonra ERROR olarak gelir
+                if previous is None or outcome in FAILED_OUTCOMES:
+                    results[test] = (outcome, None, None)
+                continue
+            match = SUMMARY_DURATION_RE.match(line)
+            if match:
+                duration = float(match.group('seconds'))
+    return results, duration
+
+
+class ReportIndex:
+    """Çalıştırma geçmişi için SQLite indeksi"""
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    def close(self):
+        self.conn.close()
+
+    def _migrate(self):
+        """Çalıştırmaları log yoluyla anahtarlayan eski indeksi rapor adına (stem) geçir
+
+        Aynı rapor farklı yollarla (göreli/mutlak, .log/.log.gz) birden fazla kez
+        eklenmiş olabilir; her rapordan en son eklenen kayıt kalır.
+        """
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(runs)")}
+        if 'stem' not in columns:
+            with self.conn:
+                self.conn.execute("ALTER TABLE runs ADD COLUMN stem TEXT")
+                rows = self.conn.execute("SELECT id, log_path FROM runs").fetchall()
+                self.conn.executemany(
+                    "UPDATE runs SET stem = ? WHERE id = ?",
+                    [(report_stem(log_path) or log_path, run_id) for run_id, log_path in rows]
+                )
+                self.conn.execute("DELETE FROM runs WHERE id NOT IN (SELECT MAX(id) FROM runs GROUP BY stem)")
+        self.conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS runs_stem ON runs(stem)")
+
+    def has_run(self, log_path):
+        row = self.conn.execute("SELECT 1 FROM runs WHERE stem = ?", (report_stem(log_path),)).fetchone()
+        return row is not None
+
+    def add_run(self, log_path, replace=False):
+        """Bir rapor dosyasını indeksle, eklenen test sayısını döndür
+
+        Rapor zaten indeksliyse yalnızca kayıtlı yolu güncellenir (ör. dışarıda
+        sıkıştırılmış veya taşınmış rapor) ve 0 döner. `replace` ile eski kayıt
+        silinip rapor yeniden okunur (ör. --rerun-failed denemeleri eklendikten sonra).
+        """
+        log_path = Path(log_path)
+        match = REPORT_NAME_RE.search(log_path.name)
+        if not match:
+            return 0
+        stem = match.group('stem')
+        if replace:
+            with self.conn:
+                self.conn.execute("DELETE FROM runs WHERE stem = ?", (stem,))
+        elif self.has_run(log_path):
+            with self.conn:
+                self.conn.execute("UPDATE runs SET log_path = ? WHERE stem = ?", (str(log_path), stem))
+            return 0
+        started_at = datetime.strptime(match.group('stamp'), '%Y%m%d-%H%M%S').isoformat()
+        results, duration = parse_report(log_path)
+
+        counts = {'passed': 0, 'failed': 0, 'error': 0, 'skipped': 0}
+        for outcome, _, _ in results.values():
+            if outcome == RERUN_PASSED:
+                outcome = 'passed'
+            if outcome in counts:
+                counts[outcome] += 1
+
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (started_at, stem, log_path, duration, passed, failed, errors, skipped) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (started_at, stem, str(log_path), duration,
+                 counts['passed'], counts['failed'], counts['error'], counts['skipped'])
+            )
+            run_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO tests (name) VALUES (?)", [(name,) for name in results]
+            )
+            test_ids = self._test_ids(results)
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO results (test_id, run_id, outcome, duration, node) VALUES (?, ?, ?, ?, ?)",
+                [(test_ids[name], run_id, outcome, test_duration, node)
+                 for name, (outcome, test_duration, node) in results.items()]
+            )
+        return len(results)
+
+    def _test_ids(self, names):
+        ids = {}
+        for name in names:
+            ids[name] = self.conn.execute("SELECT id FROM tests WHERE name = ?", (name,)).fetchone()[0]
+        return ids
+
+    def backfill(self, report_dir):
+        """Dizindeki henüz indekslenmemiş tüm raporları kronolojik sırayla ekle
+
+        Kayıtlı yolu artık bulunmayan (taşınmış, dışarıda sıkıştırılmış) raporların
+        yolu dizindeki dosyaya güncellenir.
+        """
+        added = 0
+        for path in sorted(Path(report_dir).glob('test-results-*.log*'), key=lambda p: p.name):
+            stem = report_stem(path)
+            if stem is None:
+                continue
+            row = self.conn.execute("SELECT log_path FROM runs WHERE stem = ?", (stem,)).fetchone()
+            if row is None:
+                self.add_run(path)
+                added += 1
+            elif not Path(row[0]).exists():
+                self.add_run(path)
+        return added
+
+    def _last_runs_clause(self, last):
+        return "run_id IN (SELECT id FROM runs ORDER BY started_at DESC LIMIT ?)", (last,)
+
+    def durations(self, last=50):
+        """Son `last` çalıştırmada test başına (örnek sayısı, p50, p95, max) süreler"""
+        clause, params = self._last_runs_clause(last)
+        rows = self.conn.execute(
+            f"SELECT t.name, r.duration FROM results r JOIN tests t ON t.id = r.test_id "
+            f"WHERE {clause} AND r.duration IS NOT NULL ORDER BY t.name, r.duration",
+            params
+        )
+        samples = {}
+        for name, duration in rows:
+            samples.setdefault(name, []).append(duration)
+        return {
+            name: (len(values), percentile(values, 0.50), percentile(values, 0.95), values[-1])
+            for name, values in samples.items()
+        }
+
+    def expected_duration(self, parallelism=1, last=20):
+        """Bir sonraki çalıştırmanın beklenen süresi (saniye), geçmiş yoksa None
+
+        Test başına p99 sürelerin toplamı paralel worker sayısına bölünür ve son
+        çalıştırmaların p99 süresiyle karşılaştırılır; büyük olan döner.
+        """
+        clause, params = self._last_runs_clause(last)
+        rows = self.conn.execute(
+            f"SELECT r.test_id, r.duration FROM results r "
+            f"WHERE {clause} AND r.duration IS NOT NULL ORDER BY r.test_id, r.duration",
+            params
+        )
+        samples = {}
+        for test_id, duration in rows:
+            samples.setdefault(test_id, []).append(duration)
+        per_test = sum(percentile(values, 0.99) for values in samples.values()) / max(1, parallelism)
+
+        runs = sorted(duration for (duration,) in self.conn.execute(
+            "SELECT duration FROM runs WHERE duration IS NOT NULL ORDER BY started_at DESC LIMIT ?", (last,)
+        ))
+        expected = max(per_test, percentile(runs, 0.99) or 0.0)
+        return expected or None
+
+    def failure_rates(self, last=20):
+        """Son `last` çalıştırmada test başına (koşu, hata, hata oranı, geçti mi hiç)"""
+        clause, params = self._last_runs_clause(last)
+        # Tekrar denemede geçen test hem hata hem geçiş sayılır (flaky)
+        rows = self.conn.execute(
+            f"SELECT t.name, COUNT(*), "
+            f"SUM(r.outcome IN ('failed', 'error', '{RERUN_PASSED}')), "
+            f"SUM(r.outcome IN ('passed', '{RERUN_PASSED}')) "
+            f"FROM results r JOIN tests t ON t.id = r.test_id "
+            f"WHERE {clause} GROUP BY t.name",
+            params
+        )
+        return {
+            name: (runs, failures, failures / runs if runs else 0.0, passes > 0)
+            for name, runs, failures, passes in rows
+        }
+
+    def last_run_outcomes(self):
+        """En son çalıştırmanın rapor yolu ve test başına sonucu (tekrar denemede geçenler 'passed')
+
+        İndeks boşsa (None, {}) döner.
+        """
+        last = self.conn.execute("SELECT id, log_path FROM runs ORDER BY started_at DESC LIMIT 1").fetchone()
+        if last is None:
+            return None, {}
+        rows = self.conn.execute(
+            "SELECT t.name, r.outcome FROM results r JOIN tests t ON t.id = r.test_id WHERE r.run_id = ?", (last[0],)
+        )
+        return last[1], {name: 'passed' if outcome == RERUN_PASSED else outcome for name, outcome in rows}
+
+    def slowest_runs(self, limit=1):
+        """En uzun süren çalıştırmalar"""
+        return self.conn.execute(
+            "SELECT started_at, duration, passed, failed, errors, skipped, log_path FROM runs "
+            "WHERE duration IS NOT NULL ORDER BY duration DESC LIMIT ?",
+            (limit,)
+        ).fetchall()
+
+    def compact(self, keep=50):
+        """En yeni `keep` çalıştırma dışındaki ham logları gzip'le
+
+        Sonuçlar indekste kaldığı için sorgular etkilenmez; sıkıştırılmış loglar
+        yine okunabilir ve yeniden indekslenebilir.
+        """
+        rows = self.conn.execute(
+            "SELECT id, log_path FROM runs WHERE log_path NOT LIKE '%.gz' "
+            "ORDER BY started_at DESC LIMIT -1 OFFSET ?",
+            (keep,)
+        ).fetchall()
+        compacted = 0
+        for run_id, log_path in rows:
+            log_path = Path(log_path)
+            if not log_path.exists():
+                continue
+            for raw in (log_path, log_path.with_suffix('.jsonl')):
+                if raw.exists():
+                    with open(raw, 'rb') as src, gzip.open(f"{raw}.gz", 'wb') as dst:
+                        shutil.copyfileobj(src, dst)
+                    raw.unlink()
+            with self.conn:
+                self.conn.execute("UPDATE runs SET log_path = ? WHERE id = ?", (f"{log_path}.gz", run_id))
+            compacted += 1
+        return compacted
+
+
+def prune_artifacts(report_dir, max_bytes, keep=()):
+    """Hata artifact arşivlerini en yeniden eskiye toplam `max_bytes`'a sığanlar kalacak şekilde sil
+
+    `keep` içindeki arşivler (ör. bu çalıştırmanınki) boyutları sayılsa da silinmez.
+    (silinen arşiv sayısı, açılan bayt) döner.
+    """
+    keep = {Path(path).resolve() for path in keep}
+    archives = sorted(Path(report_dir).glob(f'test-results-*{ARTIFACTS_SUFFIX}'), key=lambda p: p.name, reverse=True)
+    total = removed = freed = 0
+    for path in archives:
+        size = path.stat().st_size
+        total += size
+        if total > max_bytes and path.resolve() not in keep:
+            path.unlink()
+            total -= size
+            removed += 1
+            freed += size
+    return removed, freed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Test rapor geçmişi indeksi ve sorguları')
+    parser.add_argument(
+        '--report-dir',
+        default=DEFAULT_REPORT_DIR,
+        help=f'Rapor dizini (varsayılan: {DEFAULT_REPORT_DIR})'
+    )
+    parser.add_argument('--db', help=f'SQLite dosyası (varsayılan: <report-dir>/{DB_NAME})')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('backfill', help='Dizindeki mevcut raporları indeksle')
+    durations = commands.add_parser('durations', help='Test başına p50/p95 süreler')
+    durations.add_argument('--last', type=int, default=50, help='Son N çalıştırma (varsayılan: 50)')
+    flaky = commands.add_parser('flaky', help='Test başına hata oranı')
+    flaky.add_argument('--last', type=int, default=20, help='Son N çalıştırma (varsayılan: 20)')
+    expected = commands.add_parser('expected-duration', help='Beklenen çalıştırma süresi (deploy timeout\'u bundan türetilir)')
+    expected.add_argument('--parallelism', type=int, default=1, help='Paralel worker (Chrome Node) sayısı')
+    expected.add_argument('--last', type=int, default=20, help='Son N çalıştırma (varsayılan: 20)')
+    slowest = commands.add_parser('slowest-run', help='En yavaş çalıştırma(lar)')
+    slowest.add_argument('--limit', type=int, default=1)
+    compact = commands.add_parser('compact', help='Eski ham logları sıkıştır')
+    compact.add_argument('--keep', type=int, default=50, help='Ham bırakılacak son N çalıştırma (varsayılan: 50)')
+    compact.add_argument('--artifacts-mb', type=int, default=None,
+                         help='Hata artifact arşivlerinin toplam üst sınırı (MB), eskiler silinir')
+    args = parser.parse_args()
+
+    index = ReportIndex(args.db or os.path.join(args.report_dir, DB_NAME))
+
+    if args.command == 'backfill':
+        print(f"{index.backfill(args.report_dir)} rapor indekslendi")
+    elif args.command == 'durations':
+        print(f"{'n':>4} {'p50':>8} {'p95':>8} {'max':>8}  test")
+        for name, (count, p50, p95, longest) in sorted(index.durations(args.last).items(), key=lambda i: -i[1][2]):
+            print(f"{count:>4} {p50:>7.2f}s {p95:>7.2f}s {longest:>7.2f}s  {name}")
+    elif args.command == 'flaky':
+        print(f"{'koşu':>5} {'hata':>5} {'oran':>6}  test")
+        for name, (runs, failures, rate, ever_passed) in sorted(index.failure_rates(args.last).items(), key=lambda i: -i[1][2]):
+            flaky_mark = '  (flaky)' if failures and ever_passed else ''
+            print(f"{runs:>5} {failures:>5} {rate:>6.0%}  {name}{flaky_mark}")
+    elif args.command == 'expected-duration':
+        expected_seconds = index.expected_duration(args.parallelism, args.last)
+        print(f"{expected_seconds:.1f}s" if expected_seconds else 'Geçmiş yok')
+    elif args.command == 'slowest-run':
+        for started_at, duration, passed, failed, errors, skipped, log_path in index.slowest_runs(args.limit):
+            print(f"{started_at}  {duration:.1f}s  passed={passed} failed={failed} "
+                  f"errors={errors} skipped={skipped}  {log_path}")
+    elif args.command == 'compact':
+        print(f"{index.compact(args.keep)} rapor sıkıştırıldı")
+        if args.artifacts_mb is not None:
+            removed, freed = prune_artifacts(args.report_dir, args.artifacts_mb * 1024 * 1024)
+            print(f"{removed} artifact arşivi silindi ({freed / 1024 / 1024:.1f} MB)")
+
+    index.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
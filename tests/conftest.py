@@ -0,0 +1,8 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# deploy.py ve kube_client.py repo kökünde
+sys.path.insert(0, ROOT)
+# Controller'ın saf yardımcıları (utils.sharding, utils.scheduling) TestFiles altında
+sys.path.append(os.path.join(ROOT, 'TestFiles'))
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Sahte kubectl: `get ... --watch -o json` çağrılarına senaryodaki olayları basar.
+
+Senaryo FAKE_KUBECTL_SCRIPT dosyasındaki JSON listesidir; her eleman bir watch
+bağlantısıdır (her çağrı sıradakini oynatır). Bağlantının adımları:
+
+    {"object": {...}}  objeyi kubectl gibi girintili JSON olarak bas
+    {"line": "..."}    ham satır bas (bozuk çıktı)
+    {"sleep": 0.2}     bekle
+    {"hang": true}     kapanmadan bekle (timeout senaryosu)
+
+Adımlar bitince process çıkar, yani watch kopar. Kaçıncı bağlantıda olunduğu
+FAKE_KUBECTL_STATE dosyasında sayılır; çağrı argümanları oraya eklenir.
+"""
+
+import json
+import os
+import sys
+import time
+
+
+def main():
+    with open(os.environ['FAKE_KUBECTL_SCRIPT']) as f:
+        sessions = json.load(f)
+    state = os.environ['FAKE_KUBECTL_STATE']
+    with open(state, 'a') as f:
+        f.write(json.dumps(sys.argv[1:]) + '\n')
+    with open(state) as f:
+        call = len(f.readlines()) - 1
+    if call >= len(sessions):
+        return 0
+    for step in sessions[call]:
+        if 'object' in step:
+            print(json.dumps(step['object'], indent=4), flush=True)
+        elif 'line' in step:
+            print(step['line'], flush=True)
+        elif 'sleep' in step:
+            time.sleep(step['sleep'])
+        elif step.get('hang'):
+            time.sleep(3600)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
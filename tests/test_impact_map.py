@@ -0,0 +1,112 @@
+import subprocess
+import textwrap
+
+import pytest
+
+from impact_map import class_spans, select
+
+PAGE = textwrap.dedent("""\
+    import os
+
+
+    class HomePage:
+        def open(self):
+            return 1
+
+
+    @decorated
+    class CareersPage:
+        def blocks(self):
+            return 2
+""")
+
+
+def git(repo, *args):
+    return subprocess.run(['git', *args], cwd=repo, check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Suite'in bir page modülü ve test dosyası commit'lenmiş geçici git deposu"""
+    (tmp_path / 'TestFiles/pages').mkdir(parents=True)
+    (tmp_path / 'TestFiles/tests').mkdir()
+    (tmp_path / 'TestFiles/pages/site.py').write_text(PAGE)
+    (tmp_path / 'TestFiles/tests/test_site.py').write_text("def test_home(): pass\n")
+    git(tmp_path, 'init', '-q')
+    git(tmp_path, 'add', '.')
+    git(tmp_path, '-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-qm', 'init')
+    return tmp_path
+
+
+def impact(repo):
+    return {
+        "commit": git(repo, 'rev-parse', 'HEAD'),
+        "tests": {
+            "tests/test_site.py::test_home": {"modules": ["pages/site.py"], "classes": ["pages.site.HomePage"]},
+            "tests/test_site.py::test_careers": {"modules": ["pages/site.py"], "classes": ["pages.site.CareersPage"]},
+            "tests/test_other.py::test_old": {"modules": ["pages/site.py"]},
+        },
+    }
+
+
+def edit(repo, old, new):
+    path = repo / 'TestFiles/pages/site.py'
+    path.write_text(path.read_text().replace(old, new))
+
+
+def changed(repo):
+    return git(repo, 'diff', '--name-only', 'HEAD').splitlines()
+
+
+def test_class_spans_include_decorators():
+    assert class_spans(PAGE) == [("HomePage", 4, 6), ("CareersPage", 9, 12)]
+    assert class_spans("def broken(:") is None
+
+
+def test_change_inside_one_class_selects_only_its_tests(repo):
+    edit(repo, "return 2", "return 3")
+    tests, _ = select(impact(repo), changed(repo), cwd=repo, base='HEAD')
+    # Sınıf kaydı olmayan eski harita kaydı güvenli tarafta kalır
+    assert tests == ["tests/test_other.py::test_old", "tests/test_site.py::test_careers"]
+
+
+def test_change_to_decorator_belongs_to_the_class(repo):
+    edit(repo, "@decorated", "@other")
+    tests, _ = select(impact(repo), changed(repo), cwd=repo, base='HEAD')
+    assert "tests/test_site.py::test_home" not in tests
+
+
+def test_module_level_change_selects_every_user(repo):
+    edit(repo, "import os", "import sys")
+    tests, _ = select(impact(repo), changed(repo), cwd=repo, base='HEAD')
+    assert len(tests) == 3
+
+
+def test_changed_test_file_selects_the_whole_file(repo):
+    (repo / 'TestFiles/tests/test_site.py').write_text("def test_home(): assert True\n")
+    tests, _ = select(impact(repo), changed(repo), cwd=repo, base='HEAD')
+    assert tests == ["tests/test_site.py"]
+
+
+def test_manifest_change_runs_the_full_suite(repo):
+    (repo / 'k8s/manifests').mkdir(parents=True)
+    (repo / 'k8s/manifests/05-test-controller-job.yaml').write_text("kind: Job\n")
+    git(repo, 'add', '.')
+    tests, reason = select(impact(repo), changed(repo), cwd=repo, base='HEAD')
+    assert tests is None and "k8s/manifests" in reason
+
+
+@pytest.mark.parametrize("impact_map", [None, {}, {"commit": "abc", "tests": {}}])
+def test_without_history_the_full_suite_runs(repo, impact_map):
+    tests, reason = select(impact_map, [], cwd=repo)
+    assert tests is None and reason == 'etki haritası yok'
+
+
+def test_map_of_unknown_commit_runs_the_full_suite(repo):
+    impact_map = dict(impact(repo), commit="0" * 40)
+    tests, _ = select(impact_map, [], cwd=repo)
+    assert tests is None
+
+
+def test_nothing_changed_selects_nothing(repo):
+    assert select(impact(repo), [], cwd=repo, base='HEAD')[0] == []
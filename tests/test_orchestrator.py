@@ -0,0 +1,13 @@
+import pytest
+
+from orchestrator import isolation_arg
+
+
+@pytest.mark.parametrize('token', ['--run-id', '--run-id=x', '--isolated=1', '--reuse', '--cleanup', '--run', '--iso'])
+def test_isolation_args_are_rejected_in_any_spelling(token):
+    assert isolation_arg(token)
+
+
+@pytest.mark.parametrize('token', ['--rerun-failed', '--reruns=2', '--node-count=2', '--select', 'impacted', '-n', '--'])
+def test_other_deploy_args_pass(token):
+    assert not isolation_arg(token)
@@ -0,0 +1,133 @@
+import json
+import sqlite3
+
+from report_index import RERUN_PASSED, ReportIndex, parse_report
+
+
+def write_report(directory, stamp, records, log=''):
+    """Rapor dizinine deploy.py'nin yazdığı gibi .log ve yanında .jsonl yaz"""
+    log_path = directory / f"test-results-{stamp}.log"
+    log_path.write_text(log)
+    if records is not None:
+        log_path.with_suffix('.jsonl').write_text(''.join(json.dumps(record) + '\n' for record in records))
+    return log_path
+
+
+def result(name, outcome, duration, **extra):
+    return {"event": "test", "test": name, "outcome": outcome, "duration": duration, "node": "gw0", **extra}
+
+
+def open_index(tmp_path):
+    return ReportIndex(tmp_path / 'index.sqlite')
+
+
+def test_indexes_structured_results(tmp_path):
+    index = open_index(tmp_path)
+    for stamp, seconds in (("20240101-120000", 1.0), ("20240102-120000", 3.0), ("20240103-120000", 2.0)):
+        write_report(tmp_path, stamp, [result("t::a", "passed", seconds), result("t::b", "failed", 0.5),
+                                       {"event": "session_finish", "duration": 10.0}])
+    assert index.backfill(tmp_path) == 3
+
+    assert index.durations()["t::a"] == (3, 2.0, 3.0, 3.0)
+    runs, failures, rate, ever_passed = index.failure_rates()["t::b"]
+    assert (runs, failures, rate, ever_passed) == (3, 3, 1.0, False)
+    log_path, outcomes = index.last_run_outcomes()
+    assert log_path.endswith("test-results-20240103-120000.log")
+    assert outcomes == {"t::a": "passed", "t::b": "failed"}
+
+
+def test_rerun_attempt_replaces_first_outcome(tmp_path):
+    log_path = write_report(tmp_path, "20240101-120000", [
+        result("t::a", "failed", 1.0), result("t::b", "failed", 1.0),
+        {"event": "session_finish", "duration": 10.0},
+        result("t::a", "passed", 1.0, attempt=1), result("t::b", "failed", 1.0, attempt=1),
+        {"event": "session_finish", "duration": 2.0, "attempt": 1},
+    ])
+    results, duration = parse_report(log_path)
+    # Süre ilk denemeninkidir
+    assert duration == 10.0
+    assert results["t::a"][0] == RERUN_PASSED and results["t::b"][0] == "failed"
+
+    index = open_index(tmp_path)
+    index.add_run(log_path)
+    assert index.failure_rates()["t::a"] == (1, 1, 1.0, True)
+    assert index.last_run_outcomes()[1] == {"t::a": "passed", "t::b": "failed"}
+
+
+def test_verbose_log_is_parsed_without_structured_results(tmp_path):
+    log_path = write_report(tmp_path, "20240101-120000", None, log="\n".join([
+        "tests/x.py::T::test_a PASSED [ 50%]",
+        "[gw1] [100%] PASSED tests/x.py::T::test_b",
+        "tests/x.py::T::test_b ERROR",
+        "===== 1 passed, 1 error in 12.50s =====",
+    ]))
+    results, duration = parse_report(log_path)
+    # Teardown hatası PASSED satırının yerine geçer
+    assert results == {"tests/x.py::T::test_a": ("passed", None, None), "tests/x.py::T::test_b": ("error", None, None)}
+    assert duration == 12.5
+
+
+def test_compacted_report_is_not_indexed_again(tmp_path):
+    index = open_index(tmp_path)
+    write_report(tmp_path, "20240101-120000", [result("t::a", "passed", 1.0)])
+    write_report(tmp_path, "20240102-120000", [result("t::a", "passed", 2.0)])
+    assert index.backfill(tmp_path) == 2
+
+    assert index.compact(keep=1) == 1
+    assert (tmp_path / "test-results-20240101-120000.log.gz").exists()
+    assert (tmp_path / "test-results-20240101-120000.jsonl.gz").exists()
+    assert not (tmp_path / "test-results-20240101-120000.log").exists()
+
+    assert index.backfill(tmp_path) == 0
+    assert index.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 2
+    # Sıkıştırılmış rapor yine okunur
+    assert index.durations()["t::a"][0] == 2
+
+
+def test_moved_report_keeps_one_run(tmp_path):
+    index = open_index(tmp_path)
+    log_path = write_report(tmp_path, "20240101-120000", [result("t::a", "passed", 1.0)])
+    index.add_run(log_path)
+    moved = tmp_path / "moved"
+    moved.mkdir()
+    for path in tmp_path.glob("test-results-*"):
+        path.rename(moved / path.name)
+
+    assert index.backfill(moved) == 0
+    rows = index.conn.execute("SELECT log_path FROM runs").fetchall()
+    assert rows == [(str(moved / log_path.name),)]
+
+
+def test_migrates_index_keyed_by_log_path(tmp_path):
+    db = tmp_path / 'index.sqlite'
+    conn = sqlite3.connect(db)
+    conn.executescript("""
+        CREATE TABLE runs (
+            id INTEGER PRIMARY KEY, started_at TEXT NOT NULL, log_path TEXT NOT NULL UNIQUE,
+            duration REAL, passed INTEGER NOT NULL DEFAULT 0, failed INTEGER NOT NULL DEFAULT 0,
+            errors INTEGER NOT NULL DEFAULT 0, skipped INTEGER NOT NULL DEFAULT 0
+        );
+        INSERT INTO runs (started_at, log_path) VALUES ('2024-01-01T12:00:00', 'reports/test-results-20240101-120000.log');
+        INSERT INTO runs (started_at, log_path) VALUES ('2024-01-01T12:00:00', '/abs/reports/test-results-20240101-120000.log.gz');
+        INSERT INTO runs (started_at, log_path) VALUES ('2024-01-02T12:00:00', 'reports/test-results-20240102-120000.log');
+    """)
+    conn.commit()
+    conn.close()
+
+    index = ReportIndex(db)
+    rows = index.conn.execute("SELECT id, stem, log_path FROM runs ORDER BY id").fetchall()
+    # Aynı raporun en son eklenen kaydı kalır
+    assert rows == [
+        (2, "test-results-20240101-120000", "/abs/reports/test-results-20240101-120000.log.gz"),
+        (3, "test-results-20240102-120000", "reports/test-results-20240102-120000.log"),
+    ]
+    assert index.has_run("elsewhere/test-results-20240101-120000.log")
+    index.close()
+    # İkinci açılış migration'ı tekrarlamaz
+    ReportIndex(db).close()
+
+
+def test_empty_index_has_no_last_run(tmp_path):
+    index = open_index(tmp_path)
+    assert index.last_run_outcomes() == (None, {})
+    assert index.expected_duration() is None
@@ -0,0 +1,50 @@
+import deploy
+
+
+def result(name, outcome, duration=1.0, node="gw0"):
+    return {"event": "test", "test": name, "outcome": outcome, "duration": duration, "node": node}
+
+
+def test_counts_outcomes_and_keeps_slowest():
+    results = deploy.TestResults(slowest=2)
+    for name, outcome, duration in (("a", "passed", 3.0), ("b", "failed", 1.0), ("c", "passed", 5.0), ("d", "error", 2.0)):
+        results.add(result(name, outcome, duration))
+    results.add({"event": "session_finish", "exitstatus": 1})
+
+    assert results.counts == {"passed": 2, "failed": 1, "error": 1}
+    assert results.test_count == 4 and results.total_duration == 11.0
+    assert results.failed_tests == {"b": "failed", "d": "error"}
+    assert sorted(results.slowest, reverse=True) == [(5.0, "c", "gw0"), (3.0, "a", "gw0")]
+    assert results.finished and results.exitstatus == 1 and not results.passed()
+
+
+def test_rerun_that_passes_replaces_first_failure():
+    results = deploy.TestResults()
+    results.add(result("a", "failed"))
+    results.add(result("b", "error"))
+    results.attempt = 1
+    results.add(result("a", "passed"))
+    results.add(result("b", "error"))
+
+    # Tekrar deneme sayılara yeni test eklemez
+    assert results.counts == {"failed": 0, "error": 1, "passed": 1}
+    assert results.rerun_passed == ["a"] and results.failed_tests == {"b": "error"}
+    assert not results.passed()
+
+
+def test_seeded_previous_run_counts_as_first_attempt():
+    results = deploy.TestResults()
+    results.seed({"a": "passed", "b": "failed"})
+    results.attempt = 1
+    results.add(result("b", "passed"))
+    assert results.passed() and results.test_count == 2 and results.rerun_passed == ["b"]
+
+
+def test_timeout_samples_and_impact_map_are_merged():
+    results = deploy.TestResults()
+    results.add({"event": "timeout_samples", "samples": {"tests": {"a": [1.0]}}})
+    results.add({"event": "timeout_samples", "samples": {"tests": {"a": [2.0]}, "sites": {"s": [0.5]}}})
+    results.add({"event": "impact_map", "tests": {"a": {"modules": ["pages/home_page.py"]}}})
+    assert results.timeout_samples == {"sites": {"s": [0.5]}, "tests": {"a": [1.0, 2.0]}}
+    assert results.impact_map == {"a": {"modules": ["pages/home_page.py"]}}
+    assert results.test_count == 0
@@ -0,0 +1,115 @@
+import pytest
+
+pytest.importorskip('xdist')
+
+from utils.scheduling import DurationScheduling
+
+
+class FakeConfig:
+    """`-n 2` ile çalışan xdist controller'ının scheduler'a verdiği config"""
+
+    def __init__(self, workers):
+        self.workers = workers
+
+    def getvalue(self, name):
+        assert name == 'tx'
+        return [f"{self.workers}*popen"]
+
+    def getoption(self, name):
+        assert name == 'maxschedchunk'
+        return None
+
+
+class FakeGateway:
+    def __init__(self, id):
+        self.id = id
+
+
+class FakeNode:
+    """xdist WorkerController yerine: gönderilen testleri ve kapatılmayı kaydeder"""
+
+    def __init__(self, id):
+        self.gateway = FakeGateway(id)
+        self.shutting_down = False
+        self.sent = []
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+def start(history, collection, workers=2):
+    scheduler = DurationScheduling(FakeConfig(workers), history=history)
+    nodes = [FakeNode(f"gw{index}") for index in range(workers)]
+    for node in nodes:
+        scheduler.add_node(node)
+    for node in nodes:
+        scheduler.add_node_collection(node, collection)
+    assert scheduler.collection_is_completed
+    scheduler.schedule()
+    return scheduler, nodes
+
+
+def sent(scheduler, node):
+    return [scheduler.collection[index] for index in node.sent]
+
+
+def finish(scheduler, node, name):
+    scheduler.mark_test_complete(node, scheduler.collection.index(name))
+
+
+def test_plans_workers_longest_first_and_keeps_them_two_deep():
+    history = {"a": [10.0], "b": [1.0], "c": [5.0], "d": [4.0]}
+    scheduler, (gw0, gw1) = start(history, ["a", "b", "c", "d"])
+    assert scheduler.predicted == {"gw0": 10.0, "gw1": 10.0}
+    # gw0'ın tek testi var ve gw1'den b'yi almak onu geç bitirir: bitince kapanır
+    assert sent(scheduler, gw0) == ["a"] and gw0.shutting_down
+    assert sent(scheduler, gw1) == ["c", "d"] and not gw1.shutting_down
+
+    finish(scheduler, gw1, "c")
+    assert sent(scheduler, gw1) == ["c", "d", "b"]
+    for node, name in ((gw0, "a"), (gw1, "d"), (gw1, "b")):
+        finish(scheduler, node, name)
+    assert scheduler.tests_finished and gw1.shutting_down
+
+
+def test_tests_without_history_get_the_median_estimate():
+    scheduler, _ = start({"a": [2.0], "b": [4.0]}, ["a", "b", "new"])
+    assert scheduler.estimates == {"a": 2.0, "b": 4.0, "new": 3.0}
+
+
+def test_idle_worker_steals_shortest_test_of_busiest_worker():
+    history = {"a": [10.0], "b": [10.0], "c": [1.0], "d": [1.0], "e": [1.0], "f": [1.0]}
+    scheduler, (gw0, gw1) = start(history, list("abcdef"))
+    assert sent(scheduler, gw0) == ["a", "c"] and sent(scheduler, gw1) == ["b", "d"]
+
+    # Tahminin aksine a hemen biter: gw0 önce kendi e'sini, sonra gw1'in f'sini alır
+    finish(scheduler, gw0, "a")
+    finish(scheduler, gw0, "c")
+    assert sent(scheduler, gw0) == ["a", "c", "e", "f"]
+    assert not scheduler.node2queue[gw1]
+
+
+def test_tests_of_crashed_worker_are_rescheduled():
+    history = {"a": [10.0], "b": [10.0], "c": [1.0], "d": [1.0], "e": [1.0], "f": [1.0]}
+    scheduler, (gw0, gw1) = start(history, list("abcdef"))
+
+    # Çalışan test (b) çöken test olarak raporlanır, d ve planlanan f gw0'a kalır
+    assert scheduler.remove_node(gw1) == "b"
+    for name in ("a", "c", "e"):
+        finish(scheduler, gw0, name)
+    assert sorted(sent(scheduler, gw0)) == ["a", "c", "d", "e", "f"]
+
+
+def test_different_collections_abort_scheduling():
+    scheduler = DurationScheduling(FakeConfig(2))
+    scheduler.config = None  # Fark raporu pytest hook'una gönderilmez
+    gw0, gw1 = FakeNode("gw0"), FakeNode("gw1")
+    for node in (gw0, gw1):
+        scheduler.add_node(node)
+    scheduler.add_node_collection(gw0, ["a", "b"])
+    scheduler.add_node_collection(gw1, ["a", "c"])
+    scheduler.schedule()
+    assert scheduler.collection is None and not gw0.sent and not gw1.sent
@@ -0,0 +1,63 @@
+import pytest
+
+from utils.sharding import DEFAULT_ESTIMATE, duration_estimates, get_shard, lpt_plan, shard_endpoints, split_shard
+
+
+class Item:
+    """pytest item yerine: split_shard yalnızca nodeid'ye bakar"""
+
+    def __init__(self, nodeid):
+        self.nodeid = nodeid
+
+
+def test_estimates_use_median_and_default_for_unknown_tests():
+    estimates = duration_estimates(["a", "b", "new"], {"a": [1.0, 3.0, 100.0], "b": [5.0]})
+    assert estimates == {"a": 3.0, "b": 5.0, "new": 4.0}
+    assert duration_estimates(["a"], {}) == {"a": DEFAULT_ESTIMATE}
+
+
+def test_lpt_plan_balances_longest_first():
+    plan = lpt_plan({"a": 7.0, "b": 5.0, "c": 4.0, "d": 3.0, "e": 1.0}, 2)
+    assert plan == [(10.0, ["a", "d"]), (10.0, ["b", "c", "e"])]
+
+
+def test_lpt_plan_with_equal_estimates_is_round_robin_by_node_id():
+    plan = lpt_plan(dict.fromkeys(["d", "a", "c", "b", "e"], 1.0), 2)
+    assert [nodeids for _, nodeids in plan] == [["a", "c", "e"], ["b", "d"]]
+
+
+def test_lpt_plan_leaves_extra_bins_empty():
+    assert lpt_plan({"a": 1.0}, 3) == [(1.0, ["a"]), (0.0, []), (0.0, [])]
+
+
+@pytest.mark.parametrize("estimates", [None, {"t0": 9.0, "t1": 1.0, "t2": 1.0, "t3": 4.0, "t4": 4.0, "t5": 2.0}])
+def test_shards_are_disjoint_and_cover_the_collection(estimates):
+    items = [Item(f"t{index}") for index in range(6)]
+    shards = [split_shard(items, index, 3, estimates) for index in range(3)]
+    selected = [[item.nodeid for item in chosen] for chosen, _ in shards]
+    assert sorted(sum(selected, [])) == [item.nodeid for item in items]
+    for chosen, deselected in shards:
+        assert len(chosen) + len(deselected) == len(items)
+        # Seçilenler toplama sırasını korur
+        assert chosen == [item for item in items if item in chosen]
+
+
+def test_single_shard_runs_everything():
+    items = [Item("a"), Item("b")]
+    assert split_shard(items, 0, 1) == (items, [])
+
+
+def test_shard_from_environment(monkeypatch):
+    monkeypatch.delenv('TEST_SHARD_INDEX', raising=False)
+    monkeypatch.setenv('TEST_SHARD_COUNT', '3')
+    monkeypatch.setenv('JOB_COMPLETION_INDEX', '4')
+    assert get_shard() == (1, 3)
+    monkeypatch.setenv('TEST_SHARD_INDEX', '2')
+    assert get_shard() == (2, 3)
+
+
+def test_shard_endpoints_are_not_shared():
+    endpoints = ["n0", "n1", "n2", "n3", "n4"]
+    assert [shard_endpoints(endpoints, index, 2) for index in range(2)] == [["n0", "n2", "n4"], ["n1", "n3"]]
+    assert shard_endpoints(["n0"], 1, 2) == ["n0"]
+    assert shard_endpoints(endpoints, 0, 1) == endpoints
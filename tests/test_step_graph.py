@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+
+from deploy import StepGraph
+
+
+def test_independent_steps_run_in_parallel_and_dependents_wait():
+    barrier = threading.Barrier(2, timeout=5)
+    order = []
+
+    def parallel(name):
+        def step():
+            # İki adım aynı anda çalışmıyorsa bariyer zaman aşımına düşer
+            barrier.wait()
+            order.append(name)
+            return True
+        return step
+
+    graph = StepGraph([
+        ("a", parallel("a"), []),
+        ("b", parallel("b"), []),
+        ("c", lambda: order.append("c") or True, ["a", "b"]),
+    ])
+    assert graph.run()
+    assert sorted(order[:2]) == ["a", "b"] and order[2] == "c"
+    assert set(graph.timings) == {"a", "b", "c"}
+
+
+def test_failed_step_cancels_running_steps_and_skips_the_rest():
+    cancel = threading.Event()
+    started = threading.Event()
+    ran = []
+
+    def slow():
+        started.set()
+        # Watch'lar gibi iptali görünce erken biter
+        return not cancel.wait(10)
+
+    def failing():
+        started.wait(5)
+        return False
+
+    graph = StepGraph([
+        ("slow", slow, []),
+        ("failing", failing, []),
+        ("after", lambda: ran.append("after") or True, ["failing"]),
+    ], cancel=cancel)
+    assert not graph.run()
+    assert graph.failed_step == "failing" and cancel.is_set()
+    # Süren adım beklendi, bağımlı adım hiç başlamadı
+    assert "slow" in graph.timings and not ran
+
+
+def test_exception_fails_the_step():
+    def broken():
+        raise RuntimeError("boom")
+
+    graph = StepGraph([("broken", broken, [])])
+    assert not graph.run()
+    assert graph.failed_step == "broken"
+
+
+def test_step_still_running_after_cancel_is_not_waited_forever():
+    release = threading.Event()
+    graph = StepGraph([
+        ("stuck", lambda: release.wait(10), []),
+        ("failing", lambda: False, []),
+    ], join_timeout=0.2)
+    assert not graph.run()
+    assert "stuck" not in graph.timings
+    release.set()
+
+
+def test_unknown_dependency_and_cycle_are_rejected():
+    with pytest.raises(ValueError, match="bilinmeyen"):
+        StepGraph([("a", lambda: True, ["missing"])])
+    with pytest.raises(ValueError, match="Döngüsel"):
+        StepGraph([("a", lambda: True, ["b"]), ("b", lambda: True, ["a"])]).run()
+
+
+def test_critical_path_follows_latest_finishing_dependencies():
+    graph = StepGraph([
+        ("namespace", lambda: True, []),
+        ("configmap", lambda: True, ["namespace"]),
+        ("image", lambda: True, []),
+        ("nodes", lambda: True, ["configmap", "image"]),
+        ("report", lambda: True, []),
+    ])
+    graph.timings = {"namespace": (0, 1), "configmap": (1, 2), "image": (0, 5), "nodes": (5, 9), "report": (0, 3)}
+    assert graph.critical_path() == ["image", "nodes"]
+    marked = [line.split()[0] for line in graph.timeline_lines()]
+    assert marked.count("*") == 2
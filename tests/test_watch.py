@@ -0,0 +1,117 @@
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from deploy import KubernetesDeployer
+
+FAKE_KUBECTL = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_kubectl.py')
+
+
+def pod(phase, ready=False):
+    return {
+        "kind": "Pod",
+        "metadata": {"name": "chrome-node-1", "namespace": "test-automation"},
+        "status": {"phase": phase, "conditions": [{"type": "Ready", "status": "True" if ready else "False"}]},
+    }
+
+
+def ready_phase(obj):
+    conditions = obj["status"].get("conditions") or []
+    if any(c["type"] == "Ready" and c["status"] == "True" for c in conditions):
+        return obj["status"]["phase"]
+    return None
+
+
+@pytest.fixture
+def deployer(tmp_path, monkeypatch):
+    """Deployer whose kubectl backend runs the fake; `scenario(sessions)` sets the watch sessions"""
+    script, state = tmp_path / 'scenario.json', tmp_path / 'calls'
+    monkeypatch.setenv('FAKE_KUBECTL_SCRIPT', str(script))
+    monkeypatch.setenv('FAKE_KUBECTL_STATE', str(state))
+    deployer = KubernetesDeployer(kubectl=f"{sys.executable} {FAKE_KUBECTL}")
+
+    def scenario(sessions):
+        script.write_text(json.dumps(sessions))
+
+    def calls():
+        return [json.loads(line) for line in state.read_text().splitlines()] if state.exists() else []
+
+    deployer.scenario, deployer.calls = scenario, calls
+    return deployer
+
+
+def test_returns_on_first_matching_event(deployer):
+    deployer.scenario([[
+        {"object": pod("Pending")},
+        {"object": pod("Running")},
+        {"object": pod("Running", ready=True)},
+        {"hang": True},
+    ]])
+    start = time.monotonic()
+    assert deployer.watch_until('Pod', ready_phase, name='chrome-node-1', timeout=20) == "Running"
+    # Olay gelir gelmez döner, watch'un kapanması beklenmez
+    assert time.monotonic() - start < 10
+    call, = deployer.calls()
+    assert call[:3] == ['get', 'pod', 'chrome-node-1'] and '--watch' in call
+
+
+def test_predicate_sees_every_added_and_modified_object(deployer):
+    deployer.scenario([[
+        {"object": pod("Pending")},
+        {"line": "not json"},
+        {"line": "}"},
+        {"object": pod("Running")},
+        {"object": pod("Running", ready=True)},
+    ]])
+    seen = []
+
+    def record(obj):
+        seen.append((obj["status"]["phase"], ready_phase(obj)))
+        return ready_phase(obj)
+
+    assert deployer.watch_until('Pod', record, selector='component=chrome-node', timeout=20) == "Running"
+    assert seen == [("Pending", None), ("Running", None), ("Running", "Running")]
+
+
+def test_reconnects_after_dropped_watch(deployer):
+    deployer.scenario([
+        [{"object": pod("Pending")}],  # Watch kopar
+        [{"object": pod("Running", ready=True)}, {"hang": True}],
+    ])
+    assert deployer.watch_until('Pod', ready_phase, name='chrome-node-1', timeout=20) == "Running"
+    assert len(deployer.calls()) == 2
+
+
+def test_object_cut_by_dropped_watch_is_discarded(deployer):
+    half = json.dumps(pod("Running", ready=True), indent=4).splitlines()[:5]
+    deployer.scenario([
+        [{"object": pod("Pending")}] + [{"line": line} for line in half],
+        [{"object": pod("Running", ready=True)}, {"hang": True}],
+    ])
+    seen = []
+
+    def record(obj):
+        seen.append(obj["status"]["phase"])
+        return ready_phase(obj)
+
+    assert deployer.watch_until('Pod', record, name='chrome-node-1', timeout=20) == "Running"
+    assert seen == ["Pending", "Running"]
+
+
+def test_timeout_returns_none(deployer):
+    deployer.scenario([[{"object": pod("Pending")}, {"hang": True}]])
+    start = time.monotonic()
+    assert deployer.watch_until('Pod', ready_phase, name='chrome-node-1', timeout=1) is None
+    assert time.monotonic() - start < 5
+
+
+def test_cancel_stops_a_blocked_watch(deployer):
+    deployer.scenario([[{"object": pod("Pending")}, {"hang": True}]])
+    threading.Timer(0.5, deployer.cancelled.set).start()
+    start = time.monotonic()
+    assert deployer.watch_until('Pod', ready_phase, name='chrome-node-1', timeout=20) is None
+    assert time.monotonic() - start < 5